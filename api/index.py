@@ -4,11 +4,25 @@ Simple HTTP handler without FastAPI for maximum compatibility
 """
 import json
 import os
+import re
+import sys
+import time
+import math
 import base64
-from datetime import datetime
+import csv
+import io
+import hashlib
+import secrets
+import tempfile
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
 from uuid import uuid4
 from http.server import BaseHTTPRequestHandler
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qs, quote, urlparse
 from anthropic import Anthropic
 
 # GitHub configuration for auto-creating issues
@@ -16,12 +30,76 @@ GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
 GITHUB_REPO = os.environ.get('GITHUB_REPO', 'Delta-Compute/bumblebee')
 
 # In-memory storage for demo
-feedback_items = []
-votes = {}
+feedback_items = []  # FeedbackRecord per item; an item's code is its index here
+user_codes = {}  # user_id -> small int, so vote keys are ints rather than "item:user" strings
+user_vote_totals = []  # votes held per user code; a code is released with its user's last vote
+free_user_codes = []  # released codes, handed out again before new ones
+votes = {}  # item code << 32 | user code -> hour (epoch hours) the vote was cast << 1 | 1 if down
 comments = {}
+pinned_comments = {}  # Product-owner comments by feedback_id, newest last
 user_credits = {}
-attachments = {}  # Store file attachments by feedback_id
-signups = []  # Email signups for downloads
+attachments = {}  # Attachment metadata lists by feedback_id, oldest first
+attachment_index = {}  # attachment id -> metadata, for downloads
+vote_buckets = {}  # feedback_id -> {epoch hour: net votes}, pruned past TRENDING_RETENTION_HOURS
+trending_cache = {}  # feedback_id -> (epoch hour, score), dropped on every vote
+completion_awarded = set()  # feedback_ids whose owner has been paid the completion credit
+rank_snapshots = []  # {"id", "taken_at", "items", "changed"} per ranking run; id is index + 1
+
+# Admission control for write endpoints: (tokens per second, burst) per user;
+# per-IP buckets get IP_LIMIT_MULTIPLIER times both
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMITS = {"submit": (5 / 60, 5), "vote": (60 / 60, 20), "attach": (10 / 60, 10)}
+IP_LIMIT_MULTIPLIER = 4
+# Proxies that append to X-Forwarded-For in front of this handler; Vercel's edge is one
+TRUSTED_PROXY_COUNT = int(os.environ.get('RATE_LIMIT_TRUSTED_PROXIES', '1'))
+MAX_BUCKET_KEYS = 100_000
+MAX_IN_FLIGHT_WRITES = 16
+
+# sort_by=trending: (window hours, weight); each window contributes its net votes per hour
+TRENDING_WINDOWS = ((1, 0.5), (24, 0.3), (168, 0.2))
+TRENDING_RETENTION_HOURS = 168
+
+COMMENT_PAGE_SIZE = 50
+COMMENT_SUMMARY_SIZE = 3
+MAX_BATCH_IDS = 200
+MAX_BULK_IDS = 500
+STATUSES = ("new", "under_review", "planned", "in_progress", "completed", "wont_do")
+# Completing an item pays its owner once: item_type -> (transaction type, credits).
+# Same settings and defaults as the backend's credits_developed and credits_bug_verified
+COMPLETION_CREDITS = {
+    "wishlist": ("developed", int(os.environ.get('CREDITS_DEVELOPED', 500))),
+    "bug": ("bug_verified", int(os.environ.get('CREDITS_BUG_VERIFIED', 25))),
+}
+VOTE_TYPES = ("up", "down")
+PINNED_COMMENT_LIMIT = 5
+
+# Attachment blobs live on local disk under their SHA-256, so identical uploads share one file.
+# Uploads are disabled unless ATTACHMENT_DIR names persistent storage; a serverless /tmp is wiped between instances
+ATTACHMENT_DIR = os.environ.get('ATTACHMENT_DIR')
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
+MAX_ATTACHMENTS_PER_ITEM = 20
+ATTACHMENT_CHUNK_SIZE = 64 * 1024
+ATTACHMENT_TYPES = ("text/plain", "application/json", "application/zip", "application/gzip",
+                    "application/octet-stream", "image/png", "image/jpeg", "image/gif", "image/webp")
+
+# Download signups: append-only NDJSON log, replayed into the in-memory indexes at startup.
+# Signup endpoints return 503 unless SIGNUP_LOG names persistent storage; a serverless /tmp loses them
+SIGNUP_LOG = os.environ.get('SIGNUP_LOG')
+# Export leaks email addresses, so it is disabled unless a token is configured
+SIGNUP_EXPORT_TOKEN = os.environ.get('SIGNUP_EXPORT_TOKEN')
+# Product-owner endpoints (bulk status) are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+SIGNUP_EXPORT_BATCH = 1000
+MAX_SIGNUP_PAGE = 10_000
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+SIGNUP_CSV_FIELDS = ("id", "email", "source", "timestamp")
+
+ITEM_FIELDS = ("id", "item_type", "title", "description", "user_id", "x_handle", "status", "vote_count",
+               "rank_score", "ai_feasibility_score", "ai_impact_score", "ai_clarity_score", "po_notes",
+               "credits_awarded", "created_at", "updated_at", "comment_count", "user_voted")
+# What a list card shows; leaves out description and po_notes
+SUMMARY_FIELDS = ("id", "item_type", "title", "status", "vote_count", "rank_score", "credits_awarded",
+                  "created_at", "comment_count", "user_voted")
 
 algorithm = {
     "id": str(uuid4()),
@@ -38,24 +116,264 @@ algorithm = {
 }
 
 
+def interned(value, default="unknown"):
+    """An enum-like value from client JSON as an interned string; None becomes default."""
+    if value is None:
+        value = default
+    return sys.intern(value if isinstance(value, str) else str(value))
+
+
+class FeedbackRecord:
+    """One feedback item, kept in __slots__ instead of a 22-key dict.
+
+    Enum-like strings (type, status, platform, app version) are interned so
+    items share one copy. The per-request comment_count and user_voted are
+    not stored; to_json() fills them in and renders the same dict, in the
+    same key order, that the API has always returned.
+    """
+
+    __slots__ = ("code", "id", "item_type", "title", "description", "user_id", "x_handle", "status",
+                 "vote_count", "rank_score", "ai_feasibility_score", "ai_impact_score", "ai_clarity_score",
+                 "po_notes", "credits_awarded", "created_at", "updated_at", "platform", "app_version",
+                 "steps_to_reproduce", "github_issue_url", "rank_position", "rank_changes")
+
+    def __init__(self, id, item_type, title, description, user_id, created_at, updated_at=None,
+                 x_handle=None, status="new", vote_count=0, rank_score=0.5, ai_feasibility_score=None,
+                 ai_impact_score=None, ai_clarity_score=None, po_notes=None, credits_awarded=0,
+                 platform="unknown", app_version="unknown", steps_to_reproduce="", github_issue_url=None):
+        self.code = None  # Set by store_item
+        self.id = id
+        self.item_type = interned(item_type)
+        self.title = title
+        self.description = description
+        self.user_id = user_id
+        self.x_handle = x_handle
+        self.status = interned(status, "new")
+        self.vote_count = vote_count
+        self.rank_score = rank_score
+        self.ai_feasibility_score = ai_feasibility_score
+        self.ai_impact_score = ai_impact_score
+        self.ai_clarity_score = ai_clarity_score
+        self.po_notes = po_notes
+        self.credits_awarded = credits_awarded
+        self.created_at = created_at
+        self.updated_at = updated_at or created_at
+        self.platform = interned(platform)
+        self.app_version = interned(app_version)
+        self.steps_to_reproduce = steps_to_reproduce
+        self.github_issue_url = github_issue_url
+        self.rank_position = None  # Position on its item_type board at the last ranking run, 1 = top
+        self.rank_changes = None  # (snapshot ids, positions) arrays, appended only when the position moved
+
+    def to_json(self, comment_count=0, user_voted=None):
+        return {
+            "id": self.id,
+            "item_type": self.item_type,
+            "title": self.title,
+            "description": self.description,
+            "user_id": self.user_id,
+            "x_handle": self.x_handle,
+            "status": self.status,
+            "vote_count": self.vote_count,
+            "rank_score": self.rank_score,
+            "ai_feasibility_score": self.ai_feasibility_score,
+            "ai_impact_score": self.ai_impact_score,
+            "ai_clarity_score": self.ai_clarity_score,
+            "po_notes": self.po_notes,
+            "credits_awarded": self.credits_awarded,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "comment_count": comment_count,
+            "user_voted": user_voted,
+            "platform": self.platform,
+            "app_version": self.app_version,
+            "steps_to_reproduce": self.steps_to_reproduce,
+            "github_issue_url": self.github_issue_url,
+        }
+
+
+def store_item(item):
+    item.code = len(feedback_items)
+    feedback_items.append(item)
+    return item
+
+
+def find_item(item_id):
+    for item in feedback_items:
+        if item.id == item_id:
+            return item
+    return None
+
+
+def items_json(items, user_id=None):
+    """Items as the API returns them, with comment counts and the user's votes."""
+    code = user_codes.get(user_id)
+    rendered = []
+    for item in items:
+        packed = votes.get(item.code << 32 | code) if code is not None else None
+        rendered.append(item.to_json(len(comments.get(item.id, ())), None if packed is None else VOTE_TYPES[packed & 1]))
+    return rendered
+
+
+def vote_key(item, user_id, create=False):
+    code = user_codes.get(user_id)
+    if code is None:
+        if not create:
+            return None
+        if free_user_codes:
+            code = free_user_codes.pop()
+        else:
+            code = len(user_vote_totals)
+            user_vote_totals.append(0)
+        user_codes[user_id] = code
+    return item.code << 32 | code
+
+
+def pack_vote(vote_type, hour):
+    return hour << 1 | (vote_type != "up")
+
+
+def set_vote(item, user_id, vote_type, hour):
+    key = vote_key(item, user_id, create=True)
+    if key not in votes:
+        user_vote_totals[key & 0xFFFFFFFF] += 1
+    votes[key] = pack_vote(vote_type, hour)
+
+
+def remove_vote(key, user_id):
+    """Drop a vote; the user's code is released when it was their last."""
+    del votes[key]
+    code = key & 0xFFFFFFFF
+    user_vote_totals[code] -= 1
+    if not user_vote_totals[code]:
+        del user_codes[user_id]
+        free_user_codes.append(code)
+
+
 def calculate_rank_score(item):
-    created = datetime.fromisoformat(item["created_at"].replace("Z", ""))
+    created = datetime.fromisoformat(item.created_at.replace("Z", ""))
     days_old = (datetime.utcnow() - created).days
     recency_factor = max(0, 1.0 - (days_old * 0.1 / 7))
 
-    score = item["vote_count"] * 1.0 + recency_factor * 0.5
+    score = item.vote_count * 1.0 + recency_factor * 0.5
 
     # Add AI scores if available
-    if item.get("ai_feasibility_score") is not None:
-        score += item["ai_feasibility_score"] * 0.3
-    if item.get("ai_impact_score") is not None:
-        score += item["ai_impact_score"] * 0.4
-    if item.get("ai_clarity_score") is not None:
-        score += item["ai_clarity_score"] * 0.2
+    if item.ai_feasibility_score is not None:
+        score += item.ai_feasibility_score * 0.3
+    if item.ai_impact_score is not None:
+        score += item.ai_impact_score * 0.4
+    if item.ai_clarity_score is not None:
+        score += item.ai_clarity_score * 0.2
 
     return score
 
 
+def current_hour():
+    return int(time.time() // 3600)
+
+
+def record_vote_velocity(item_id, delta, hour):
+    """Add a net-vote change to the bucket of the hour the vote was cast."""
+    now = current_hour()
+    if hour <= now - TRENDING_RETENTION_HOURS:
+        return
+    buckets = vote_buckets.setdefault(item_id, {})
+    if hour not in buckets:
+        for stale in [h for h in buckets if h <= now - TRENDING_RETENTION_HOURS]:
+            del buckets[stale]
+    buckets[hour] = buckets.get(hour, 0) + delta
+    trending_cache.pop(item_id, None)
+
+
+def trending_score(item_id, now):
+    """Weighted per-hour vote velocity over the hour-aligned trending windows.
+
+    Scores are cached per item until the next vote on it or the next hour.
+    """
+    cached = trending_cache.get(item_id)
+    if cached is not None and cached[0] == now:
+        return cached[1]
+    score = 0.0
+    for hour, net in vote_buckets.get(item_id, {}).items():
+        age = now - hour
+        for hours, weight in TRENDING_WINDOWS:
+            if age < hours:
+                score += net * weight / hours
+    trending_cache[item_id] = (now, score)
+    return score
+
+
+def utc_iso(value):
+    """An ISO timestamp as a naive UTC string, comparable with the stored ones."""
+    at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return at.isoformat()
+
+
+def record_rank_snapshot():
+    """Snapshot board positions after a ranking run, storing only the ones that moved."""
+    snapshot_id = len(rank_snapshots) + 1
+    changed = 0
+    for item_type in ("wishlist", "bug"):
+        board = sorted((i for i in feedback_items if i.item_type == item_type),
+                       key=lambda i: (-i.rank_score, i.id))
+        for position, item in enumerate(board, 1):
+            if item.rank_position != position:
+                item.rank_position = position
+                if item.rank_changes is None:
+                    item.rank_changes = (array("i"), array("i"))
+                item.rank_changes[0].append(snapshot_id)
+                item.rank_changes[1].append(position)
+                changed += 1
+    snapshot = {"id": snapshot_id, "taken_at": datetime.utcnow().isoformat(),
+                "items": len(feedback_items), "changed": changed}
+    rank_snapshots.append(snapshot)
+    return snapshot
+
+
+def snapshot_at(since):
+    """Id of the last snapshot taken at or before since (0 if none)."""
+    return bisect_right(rank_snapshots, since, key=lambda s: s["taken_at"])
+
+
+def position_series(item, since=None):
+    snapshot_ids, positions = item.rank_changes or ((), ())
+    start = 0
+    if since is not None:
+        # Carry in the position the item already held at since
+        start = max(bisect_right(snapshot_ids, snapshot_at(since)) - 1, 0)
+    return [
+        {"taken_at": rank_snapshots[snapshot_ids[n] - 1]["taken_at"], "position": positions[n]}
+        for n in range(start, len(snapshot_ids))
+    ]
+
+
+def top_movers(since, item_type=None, limit=20):
+    """Items whose position changed the most between since and the latest snapshot."""
+    base = snapshot_at(since)
+    movers = []
+    for item in feedback_items:
+        if item_type and item.item_type != item_type:
+            continue
+        snapshot_ids, positions = item.rank_changes or ((), ())
+        if not snapshot_ids or snapshot_ids[-1] <= base:
+            continue
+        held = bisect_right(snapshot_ids, base)
+        if not held or positions[held - 1] == positions[-1]:
+            continue
+        movers.append({
+            "item_id": item.id,
+            "title": item.title,
+            "item_type": item.item_type,
+            "previous_position": positions[held - 1],
+            "position": positions[-1],
+            "change": positions[held - 1] - positions[-1],
+        })
+    movers.sort(key=lambda mover: (-abs(mover["change"]), mover["position"]))
+    return movers[:limit]
+
+
 def score_feedback_item(title, description, item_type):
     """Score a feedback item using Claude API."""
     api_key = os.environ.get('ANTHROPIC_API_KEY')
@@ -122,9 +440,402 @@ def create_github_issue(title, body, labels=None):
         return None, str(e)
 
 
-def json_response(handler, data, status=200):
+def encode_cursor(created_at, comment_id):
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{created_at}|{comment_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, or None if malformed."""
+    try:
+        created_at, comment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return created_at, comment_id
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def parse_limit(params, default=None, maximum=100):
+    """The ?limit= page size, or default when absent; ValueError unless it is in 1..maximum."""
+    value = params.get("limit", [None])[0]
+    if value is None:
+        return default
+    limit = int(value)
+    if not 1 <= limit <= maximum:
+        raise ValueError(f"limit must be between 1 and {maximum}")
+    return limit
+
+
+def comment_page(item_id, view="thread", cursor=None, limit=None):
+    """Return a bounded page of an item's comments, oldest first."""
+    thread = comments.get(item_id, [])
+
+    if view == "summary":
+        latest = thread[-(limit or COMMENT_SUMMARY_SIZE):]
+        return {"items": latest, "pinned": [], "next_cursor": None, "total": len(thread)}
+
+    limit = limit or COMMENT_PAGE_SIZE
+    start = 0
+    if cursor:
+        # Threads are appended in (created_at, id) order, so the cursor is a bisect
+        start = bisect_right(thread, cursor, key=lambda c: (c["created_at"], c["id"]))
+    page = thread[start:start + limit]
+
+    next_cursor = None
+    if start + limit < len(thread):
+        next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["id"])
+
+    pinned = []
+    if not cursor:
+        pinned = pinned_comments.get(item_id, [])[-PINNED_COMMENT_LIMIT:][::-1]
+
+    return {"items": page, "pinned": pinned, "next_cursor": next_cursor, "total": None}
+
+
+class AttachmentTooLarge(Exception):
+    pass
+
+
+def attachment_path(digest):
+    """Blob location for a SHA-256 hex digest, fanned out by its first two characters."""
+    return os.path.join(ATTACHMENT_DIR, digest[:2], digest)
+
+
+def read_chunked(stream):
+    """Yield the decoded pieces of a Transfer-Encoding: chunked request body."""
+    while True:
+        size_line = stream.readline(1024)
+        size = int(size_line.split(b";")[0].strip() or b"0", 16)
+        if size == 0:
+            # Skip trailers up to the terminating blank line
+            while stream.readline(1024) not in (b"\r\n", b"\n", b""):
+                pass
+            return
+        remaining = size
+        while remaining:
+            piece = stream.read(min(remaining, ATTACHMENT_CHUNK_SIZE))
+            if not piece:
+                raise ValueError("truncated chunk")
+            remaining -= len(piece)
+            yield piece
+        stream.readline(1024)
+
+
+def read_fixed(stream, length):
+    """Yield a Content-Length request body in bounded pieces."""
+    remaining = length
+    while remaining:
+        piece = stream.read(min(remaining, ATTACHMENT_CHUNK_SIZE))
+        if not piece:
+            raise ValueError("truncated body")
+        remaining -= len(piece)
+        yield piece
+
+
+def store_attachment(pieces):
+    """Stream pieces to a temp file while hashing; return (digest, size).
+
+    The temp file is renamed into place only if no blob with the same hash
+    exists yet, so duplicates cost one hash pass and no extra disk.
+    """
+    os.makedirs(ATTACHMENT_DIR, exist_ok=True)
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=ATTACHMENT_DIR, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for piece in pieces:
+                size += len(piece)
+                if size > MAX_ATTACHMENT_BYTES:
+                    raise AttachmentTooLarge()
+                sha.update(piece)
+                f.write(piece)
+        digest = sha.hexdigest()
+        path = attachment_path(digest)
+        if os.path.exists(path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return digest, size
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def clean_filename(filename):
+    name = os.path.basename((filename or "").replace("\\", "/"))
+    name = "".join(ch for ch in name if ch.isprintable() and ch not in '"')
+    return name[:200] or "attachment"
+
+
+def content_disposition(filename):
+    """attachment header with an ASCII filename and the original as RFC 5987 filename*.
+
+    http.server encodes headers as latin-1, so the raw name cannot be sent as-is.
+    """
+    fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode()
+    fallback = "".join(ch for ch in fallback if ch.isprintable() and ch not in '"\\')
+    if not fallback or fallback.startswith("."):
+        fallback = "attachment" + fallback
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def parse_range(header, size):
+    """Parse a single `bytes=` range into (start, end) inclusive.
+
+    Returns None to serve the whole file (no or multi-range header) and
+    raises ValueError if the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+    else:
+        if not last:
+            raise ValueError(header)
+        start = max(0, size - int(last))
+        end = size - 1
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def normalize_email(email):
+    return email.strip().lower() if isinstance(email, str) else ""
+
+
+def csv_safe(value):
+    """Neutralise values a spreadsheet would evaluate as a formula."""
+    value = str(value)
+    return "'" + value if value[:1] in ("=", "+", "-", "@", "\t", "\r") else value
+
+
+class SignupStore:
+    """Deduplicated signups backed by an append-only NDJSON log.
+
+    Memory holds only a 16-byte hash of each normalized email mapped to its
+    record's byte offset in the log, plus per-source counts kept up to date
+    on every insert; the records themselves are read back from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = {}  # blake2b(normalized email) -> byte offset of the record
+        self.source_counts = {}
+        self.size = 0
+        self.lock = threading.Lock()
+        self.replay()
+
+    @staticmethod
+    def key(email):
+        return hashlib.blake2b(email.encode(), digest_size=16).digest()
+
+    def replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final write; it is overwritten by the next append
+                record = json.loads(line)
+                self.offsets.setdefault(self.key(record["email"]), offset)
+                self.source_counts[record["source"]] = self.source_counts.get(record["source"], 0) + 1
+                offset += len(line)
+        self.size = offset
+
+    def read_at(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def add(self, email, source, timestamp):
+        """Store a signup; return (record, created). Duplicates return the original record."""
+        key = self.key(email)
+        with self.lock:
+            offset = self.offsets.get(key)
+            if offset is not None:
+                return self.read_at(offset), False
+
+            record = {"id": str(uuid4()), "email": email, "source": source, "timestamp": timestamp}
+            line = (json.dumps(record) + "\n").encode()
+            with open(self.path, "r+b" if os.path.exists(self.path) else "wb") as f:
+                f.seek(self.size)
+                f.write(line)
+                f.truncate()
+            self.offsets[key] = self.size
+            self.size += len(line)
+            self.source_counts[source] = self.source_counts.get(source, 0) + 1
+            return record, True
+
+    def stats(self):
+        with self.lock:
+            return {"total": len(self.offsets), "by_source": dict(self.source_counts)}
+
+    def is_record_start(self, offset):
+        """Whether offset is where a record starts or the log ends, the only cursors iter_batches hands out.
+
+        Records are single json.dumps lines, so one starts exactly after a newline.
+        """
+        if not 0 <= offset <= self.size:
+            return False
+        if offset in (0, self.size):
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+    def iter_batches(self, cursor=0, limit=None, batch_size=SIGNUP_EXPORT_BATCH):
+        """Yield (records, next_cursor) batches from a byte-offset cursor.
+
+        Only the log as it was when the export started is read, so concurrent
+        signups never show up as partial lines. next_cursor is None at the end.
+        """
+        end = self.size
+        position = min(cursor, end)
+        if position >= end or not os.path.exists(self.path):
+            return
+        remaining = limit
+        with open(self.path, "rb") as f:
+            f.seek(position)
+            batch = []
+            while position < end and remaining != 0:
+                line = f.readline()
+                position += len(line)
+                batch.append(json.loads(line))
+                if remaining is not None:
+                    remaining -= 1
+                if len(batch) >= batch_size:
+                    yield batch, position if position < end else None
+                    batch = []
+            if batch:
+                yield batch, position if position < end else None
+
+
+signup_store = SignupStore(SIGNUP_LOG) if SIGNUP_LOG else None
+SIGNUPS_DISABLED = {"detail": "Signups are disabled: SIGNUP_LOG is not configured"}
+
+
+class TokenBuckets:
+    """Thread-safe in-memory token buckets, bounded by LRU eviction."""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def acquire(self, key, rate, burst):
+        """Take one token; return 0 if admitted, else seconds until one is available."""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                tokens = burst
+                if len(self.buckets) >= self.max_keys:
+                    self.buckets.popitem(last=False)
+            else:
+                tokens, updated = bucket
+                tokens = min(burst, tokens + (now - updated) * rate)
+                self.buckets.move_to_end(key)
+
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now)
+                return 0.0
+            self.buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+
+rate_limiter = TokenBuckets(MAX_BUCKET_KEYS)
+write_slots = threading.BoundedSemaphore(MAX_IN_FLIGHT_WRITES)
+
+
+def rate_limit_name(path):
+    if path == '/api/feedback':
+        return "submit"
+    if path.startswith('/api/feedback/') and path.endswith('/vote'):
+        return "vote"
+    if path.startswith('/api/feedback/') and path.endswith('/attachments'):
+        return "attach"
+    return None
+
+
+def check_rate_limit(name, kind, key):
+    """Return seconds to wait if key is over its bucket for this endpoint, else 0."""
+    rate, burst = RATE_LIMITS[name]
+    if kind == "ip":
+        rate, burst = rate * IP_LIMIT_MULTIPLIER, burst * IP_LIMIT_MULTIPLIER
+    return rate_limiter.acquire(f"{name}:{kind}:{key}", rate, burst)
+
+
+def too_many_requests(handler, wait):
+    return json_response(handler, {"detail": "Too many requests"}, 429, {"Retry-After": str(max(1, math.ceil(wait)))})
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_METRIC_ROUTES = 100
+ROUTE_ID_PATTERN = re.compile(r"/[0-9a-fA-F-]{36}(?=/|$)")
+
+request_counts = {}  # (method, route, status) -> count
+latency_histograms = {}  # (method, route) -> bucket counts + [sum, count]
+metrics_lock = threading.Lock()  # The server may run handlers on several threads
+
+
+def record_request(method, path, status, duration):
+    """Record one request against its route template."""
+    route = ROUTE_ID_PATTERN.sub("/{id}", path)
+    key = (method, route)
+    with metrics_lock:
+        if key not in latency_histograms:
+            if len(latency_histograms) >= MAX_METRIC_ROUTES:
+                key = (method, "other")
+                route = "other"
+            latency_histograms.setdefault(key, [0] * (len(LATENCY_BUCKETS) + 1) + [0.0, 0])
+        histogram = latency_histograms[key]
+        histogram[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        histogram[-2] += duration
+        histogram[-1] += 1
+        request_counts[(method, route, status)] = request_counts.get((method, route, status), 0) + 1
+
+
+def render_metrics():
+    """Render request metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP appfeedback_requests_total HTTP requests by route and status.",
+        "# TYPE appfeedback_requests_total counter",
+    ]
+    with metrics_lock:
+        counts = sorted(request_counts.items())
+        histograms = [(key, list(histogram)) for key, histogram in sorted(latency_histograms.items())]
+    for (method, route, status), count in counts:
+        lines.append(f'appfeedback_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+    name = "appfeedback_request_duration_seconds"
+    lines.append(f"# HELP {name} HTTP request latency.")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in histograms:
+        labels = f'method="{method}",route="{route}"'
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram[-1]}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram[-2]}")
+        lines.append(f"{name}_count{{{labels}}} {histogram[-1]}")
+
+    lines.append("# TYPE appfeedback_items gauge")
+    lines.append(f"appfeedback_items {len(feedback_items)}")
+    return "\n".join(lines) + "\n"
+
+
+def json_response(handler, data, status=200, headers=None):
     handler.send_response(status)
     handler.send_header('Content-Type', 'application/json')
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
     handler.send_header('Access-Control-Allow-Origin', '*')
     handler.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
     handler.send_header('Access-Control-Allow-Headers', 'Content-Type')
@@ -133,6 +844,19 @@ def json_response(handler, data, status=200):
 
 
 class handler(BaseHTTPRequestHandler):
+    def handle_one_request(self):
+        started = time.perf_counter()
+        self._status = None
+        super().handle_one_request()
+        if self._status is not None:
+            # A malformed or oversized request line is rejected before path and command are parsed
+            record_request(getattr(self, "command", None) or "-", urlparse(getattr(self, "path", "")).path,
+                           self._status, time.perf_counter() - started)
+
+    def send_response(self, code, message=None):
+        self._status = int(code)
+        super().send_response(code, message)
+
     def do_OPTIONS(self):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -149,11 +873,21 @@ class handler(BaseHTTPRequestHandler):
         if path == '/api/health':
             return json_response(self, {"status": "healthy", "service": "appfeedback"})
 
+        # Metrics
+        if path == '/api/metrics':
+            body = render_metrics().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
         # Stats
         if path == '/api/stats':
-            wishlist = [i for i in feedback_items if i["item_type"] == "wishlist"]
-            bugs = [i for i in feedback_items if i["item_type"] == "bug"]
-            completed = [i for i in feedback_items if i["status"] == "completed"]
+            wishlist = [i for i in feedback_items if i.item_type == "wishlist"]
+            bugs = [i for i in feedback_items if i.item_type == "bug"]
+            completed = [i for i in feedback_items if i.status == "completed"]
             total_credits = sum(u.get("credits_earned_total", 0) for u in user_credits.values())
             return json_response(self, {
                 "total_items": len(feedback_items),
@@ -172,36 +906,84 @@ class handler(BaseHTTPRequestHandler):
 
             items = feedback_items.copy()
             if item_type:
-                items = [i for i in items if i["item_type"] == item_type]
-
-            for item in items:
-                item["comment_count"] = len(comments.get(item["id"], []))
-                item["user_voted"] = votes.get(f"{item['id']}:{user_id}")
+                items = [i for i in items if i.item_type == item_type]
 
             if sort_by == "rank":
-                items.sort(key=lambda x: x["rank_score"], reverse=True)
+                items.sort(key=lambda x: x.rank_score, reverse=True)
             elif sort_by == "votes":
-                items.sort(key=lambda x: x["vote_count"], reverse=True)
+                items.sort(key=lambda x: x.vote_count, reverse=True)
+            elif sort_by == "trending":
+                now = current_hour()
+                items.sort(key=lambda x: (trending_score(x.id, now), x.created_at), reverse=True)
             else:
-                items.sort(key=lambda x: x["created_at"], reverse=True)
-
-            return json_response(self, items)
+                items.sort(key=lambda x: x.created_at, reverse=True)
+            items = items_json(items, user_id)
+
+            fields = params.get("fields", [None])[0]
+            if fields:
+                requested = {name.strip() for name in fields.split(",") if name.strip()}
+                unknown = requested.difference(ITEM_FIELDS)
+                if unknown:
+                    return json_response(self, {"detail": f"Unknown fields: {', '.join(sorted(unknown))}"}, 400)
+                selected = [name for name in ITEM_FIELDS if name in requested]
+            elif params.get("view", ["full"])[0] == "summary":
+                selected = SUMMARY_FIELDS
+            else:
+                return json_response(self, items)
+            return json_response(self, [{name: item[name] for name in selected} for item in items])
+
+        # List attachments
+        if path.startswith('/api/feedback/') and path.endswith('/attachments'):
+            item_id = path.split('/api/feedback/')[1].split('/attachments')[0]
+            return json_response(self, attachments.get(item_id, []))
+
+        # Download attachment
+        if path.startswith('/api/attachments/'):
+            return self.send_attachment(path.split('/api/attachments/')[1])
+
+        # Get several feedback items in the requested order
+        if path == '/api/feedback/batch':
+            ids = [value.strip() for value in params.get("ids", [""])[0].split(",") if value.strip()]
+            ids = list(dict.fromkeys(ids))
+            if not ids or len(ids) > MAX_BATCH_IDS:
+                return json_response(self, {"detail": f"Pass between 1 and {MAX_BATCH_IDS} ids"}, 400)
+            user_id = params.get("user_id", [None])[0]
+            wanted = set(ids)
+            found = {item.id: item for item in feedback_items if item.id in wanted}
+            return json_response(self, items_json([found[item_id] for item_id in ids if item_id in found], user_id))
 
         # Get single feedback item
         if path.startswith('/api/feedback/') and '/comments' not in path and '/vote' not in path:
             item_id = path.split('/api/feedback/')[1]
-            user_id = params.get("user_id", [None])[0]
-            for item in feedback_items:
-                if item["id"] == item_id:
-                    item["comment_count"] = len(comments.get(item_id, []))
-                    item["user_voted"] = votes.get(f"{item_id}:{user_id}")
-                    return json_response(self, item)
-            return json_response(self, {"detail": "Not found"}, 404)
+            item = find_item(item_id)
+            if item is None:
+                return json_response(self, {"detail": "Not found"}, 404)
+            return json_response(self, items_json([item], params.get("user_id", [None])[0])[0])
 
         # Get comments
         if '/comments' in path:
             item_id = path.split('/api/feedback/')[1].split('/comments')[0]
-            return json_response(self, comments.get(item_id, []))
+            view = params.get("view", ["thread"])[0]
+            cursor = params.get("cursor", [None])[0]
+            try:
+                limit = parse_limit(params)
+            except ValueError:
+                return json_response(self, {"detail": "limit must be an integer from 1 to 100"}, 400)
+            if cursor:
+                cursor = decode_cursor(cursor)
+                if cursor is None:
+                    return json_response(self, {"detail": "Invalid cursor"}, 400)
+            return json_response(self, comment_page(item_id, view, cursor, limit))
+
+        # Signup counts per source
+        if path == '/api/signups/stats':
+            if signup_store is None:
+                return json_response(self, SIGNUPS_DISABLED, 503)
+            return json_response(self, signup_store.stats())
+
+        # Signup export
+        if path == '/api/signups/export':
+            return self.export_signups(params)
 
         # Credits balance
         if path == '/api/credits/balance':
@@ -220,26 +1002,239 @@ class handler(BaseHTTPRequestHandler):
         if path == '/api/ranking/algorithm':
             return json_response(self, algorithm)
 
+        # Rank movement
+        if path.startswith('/api/ranking/history/'):
+            item_id = path.split('/')[-1]
+            since = params.get("since", [None])[0]
+            item = find_item(item_id)
+            try:
+                points = position_series(item, utc_iso(since) if since else None) if item else []
+            except ValueError:
+                return json_response(self, {"detail": "since must be an ISO timestamp"}, 400)
+            return json_response(self, {"item_id": item_id, "points": points})
+
+        if path == '/api/ranking/movers':
+            item_type = params.get("item_type", [None])[0]
+            try:
+                limit = parse_limit(params, 20)
+            except ValueError:
+                return json_response(self, {"detail": "limit must be an integer from 1 to 100"}, 400)
+            try:
+                since = utc_iso(params["since"][0])
+            except (KeyError, ValueError):
+                return json_response(self, {"detail": "since must be an ISO timestamp"}, 400)
+            return json_response(self, top_movers(since, item_type, limit))
+
+        if path == '/api/ranking/snapshots':
+            try:
+                limit = parse_limit(params, 20)
+            except ValueError:
+                return json_response(self, {"detail": "limit must be an integer from 1 to 100"}, 400)
+            return json_response(self, rank_snapshots[::-1][:limit])
+
         # Ranked results
         if path == '/api/ranking/results':
             item_type = params.get("item_type", [None])[0]
             limit = int(params.get("limit", [20])[0])
             items = feedback_items.copy()
             if item_type:
-                items = [i for i in items if i["item_type"] == item_type]
-            items.sort(key=lambda x: x["rank_score"], reverse=True)
-            return json_response(self, items[:limit])
+                items = [i for i in items if i.item_type == item_type]
+            items.sort(key=lambda x: x.rank_score, reverse=True)
+            return json_response(self, [item.to_json() for item in items[:limit]])
 
         return json_response(self, {"detail": "Not found"}, 404)
 
+    def send_attachment(self, attachment_id):
+        meta = attachment_index.get(attachment_id)
+        if meta is None or not os.path.exists(attachment_path(meta["sha256"])):
+            return json_response(self, {"detail": "Not found"}, 404)
+
+        size = meta["size"]
+        etag = f'"{meta["sha256"]}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        try:
+            byte_range = parse_range(self.headers.get('Range'), size)
+        except ValueError:
+            return json_response(self, {"detail": "Range not satisfiable"}, 416, {"Content-Range": f"bytes */{size}"})
+        start, end = byte_range or (0, size - 1)
+
+        self.send_response(206 if byte_range else 200)
+        self.send_header('Content-Type', meta["content_type"])
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Content-Disposition', content_disposition(meta["filename"]))
+        self.send_header('X-Content-Type-Options', 'nosniff')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'private, max-age=31536000, immutable')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if byte_range:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if size:
+            with open(attachment_path(meta["sha256"]), 'rb') as f:
+                # socket.sendfile uses os.sendfile where available: no copy through userspace
+                self.connection.sendfile(f, start, end - start + 1)
+
+    def export_signups(self, params):
+        if not SIGNUP_EXPORT_TOKEN or not secrets.compare_digest(
+                self.headers.get('Authorization', '').encode(), f"Bearer {SIGNUP_EXPORT_TOKEN}".encode()):
+            return json_response(self, {"detail": "Not authorized"}, 401)
+        if signup_store is None:
+            return json_response(self, SIGNUPS_DISABLED, 503)
+        export_format = params.get("format", ["ndjson"])[0]
+        if export_format not in ("csv", "ndjson"):
+            return json_response(self, {"detail": "format must be csv or ndjson"}, 400)
+        try:
+            cursor = int(params.get("cursor", [0])[0])
+            limit = params.get("limit", [None])[0]
+            limit = min(int(limit), MAX_SIGNUP_PAGE) if limit else None
+        except ValueError:
+            return json_response(self, {"detail": "Invalid cursor or limit"}, 400)
+        if not signup_store.is_record_start(cursor):
+            return json_response(self, {"detail": "Invalid cursor"}, 400)
+
+        batches = signup_store.iter_batches(cursor, limit)
+        headers = {}
+        if limit is not None:
+            # A bounded page is read first so its next cursor can go in a header
+            page, next_cursor = [], None
+            for batch, next_cursor in batches:
+                page.extend(batch)
+            batches = [(page, next_cursor)] if page else []
+            headers['X-Next-Cursor'] = str(next_cursor) if next_cursor is not None else ''
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv' if export_format == "csv" else 'application/x-ndjson')
+        self.send_header('Content-Disposition', f'attachment; filename="signups.{export_format}"')
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True  # no Content-Length; the body ends when the connection does
+
+        if export_format == "csv":
+            self.wfile.write((",".join(SIGNUP_CSV_FIELDS) + "\r\n").encode())
+        for batch, _ in batches:
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for record in batch:
+                    writer.writerow([csv_safe(record.get(field, "")) for field in SIGNUP_CSV_FIELDS])
+                self.wfile.write(buffer.getvalue().encode())
+            else:
+                self.wfile.write("".join(json.dumps(record) + "\n" for record in batch).encode())
+
+    def upload_attachment(self, path, params):
+        item_id = path.split('/api/feedback/')[1].split('/attachments')[0]
+        user_id = params.get("user_id", [None])[0]
+        content_type = (self.headers.get('Content-Type') or 'application/octet-stream').split(';')[0].strip().lower()
+        chunked = 'chunked' in (self.headers.get('Transfer-Encoding') or '').lower()
+        length = int(self.headers.get('Content-Length') or 0)
+
+        # Everything that can be rejected up front is, before a byte of the body is read
+        error = None
+        if not ATTACHMENT_DIR:
+            error = (503, "Attachments are disabled: ATTACHMENT_DIR is not configured")
+        elif not user_id:
+            error = (400, "user_id is required")
+        elif find_item(item_id) is None:
+            error = (404, "Not found")
+        elif content_type not in ATTACHMENT_TYPES:
+            error = (415, f"Unsupported attachment type {content_type}")
+        elif not chunked and length > MAX_ATTACHMENT_BYTES:
+            error = (413, "Attachment too large")
+        elif len(attachments.get(item_id, [])) >= MAX_ATTACHMENTS_PER_ITEM:
+            error = (409, "Too many attachments on this item")
+        elif not chunked and not length:
+            error = (411, "Content-Length or chunked Transfer-Encoding required")
+        if error:
+            self.close_connection = True
+            return json_response(self, {"detail": error[1]}, error[0])
+
+        if RATE_LIMIT_ENABLED:
+            wait = check_rate_limit("attach", "user", user_id)
+            if wait:
+                self.close_connection = True
+                return too_many_requests(self, wait)
+
+        pieces = read_chunked(self.rfile) if chunked else read_fixed(self.rfile, length)
+        try:
+            digest, size = store_attachment(pieces)
+        except AttachmentTooLarge:
+            self.close_connection = True
+            return json_response(self, {"detail": "Attachment too large"}, 413)
+        except ValueError:
+            self.close_connection = True
+            return json_response(self, {"detail": "Malformed upload"}, 400)
+
+        # Re-uploading the same bytes to the same item returns the existing record
+        for meta in attachments.get(item_id, []):
+            if meta["sha256"] == digest:
+                return json_response(self, meta)
+
+        meta = {
+            "id": str(uuid4()),
+            "item_id": item_id,
+            "user_id": user_id,
+            "filename": clean_filename(params.get("filename", [None])[0]),
+            "content_type": content_type,
+            "size": size,
+            "sha256": digest,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        attachments.setdefault(item_id, []).append(meta)
+        attachment_index[meta["id"]] = meta
+        return json_response(self, meta, 201)
+
+    def client_ip(self):
+        """The peer, or the hop the nearest trusted proxy saw; leftmost X-Forwarded-For entries are client-supplied."""
+        if not TRUSTED_PROXY_COUNT:
+            return self.client_address[0]
+        forwarded = [address.strip() for value in self.headers.get_all('X-Forwarded-For', []) for address in value.split(',')]
+        if len(forwarded) >= TRUSTED_PROXY_COUNT:
+            return forwarded[-TRUSTED_PROXY_COUNT]
+        return self.client_address[0]
+
     def do_POST(self):
+        if not RATE_LIMIT_ENABLED:
+            return self.handle_post()
+
+        # Shed load before any model, GitHub or storage work starts
+        if not write_slots.acquire(blocking=False):
+            return json_response(self, {"detail": "Server busy, retry shortly"}, 503, {"Retry-After": "1"})
+        try:
+            return self.handle_post()
+        finally:
+            write_slots.release()
+
+    def handle_post(self):
         parsed = urlparse(self.path)
         path = parsed.path
 
+        limit_name = rate_limit_name(path) if RATE_LIMIT_ENABLED else None
+        if limit_name:
+            wait = check_rate_limit(limit_name, "ip", self.client_ip())
+            if wait:
+                return too_many_requests(self, wait)
+
+        # Attachments stream straight to disk instead of being read as JSON
+        if path.startswith('/api/feedback/') and path.endswith('/attachments'):
+            return self.upload_attachment(path, parse_qs(parsed.query))
+
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length)
         data = json.loads(body) if body else {}
 
+        if limit_name and isinstance(data.get("user_id"), str):
+            wait = check_rate_limit(limit_name, "user", data["user_id"])
+            if wait:
+                return too_many_requests(self, wait)
+
         # Create feedback
         if path == '/api/feedback':
             item_id = str(uuid4())
@@ -251,37 +1246,25 @@ class handler(BaseHTTPRequestHandler):
             app_version = data.get("app_version", "unknown")
             steps_to_reproduce = data.get("steps_to_reproduce", "")
 
-            item = {
-                "id": item_id,
-                "item_type": data["item_type"],
-                "title": data["title"],
-                "description": data["description"],
-                "user_id": data["user_id"],
-                "x_handle": data.get("x_handle"),
-                "status": "new",
-                "vote_count": 0,
-                "rank_score": 0.5,
-                "ai_feasibility_score": None,
-                "ai_impact_score": None,
-                "ai_clarity_score": None,
-                "po_notes": None,
-                "credits_awarded": 0,
-                "created_at": now,
-                "updated_at": now,
-                "comment_count": 0,
-                "user_voted": None,
-                "platform": platform,
-                "app_version": app_version,
-                "steps_to_reproduce": steps_to_reproduce,
-                "github_issue_url": None
-            }
+            item = FeedbackRecord(
+                id=item_id,
+                item_type=data["item_type"],
+                title=data["title"],
+                description=data["description"],
+                user_id=data["user_id"],
+                x_handle=data.get("x_handle"),
+                created_at=now,
+                platform=platform,
+                app_version=app_version,
+                steps_to_reproduce=steps_to_reproduce,
+            )
 
             # For bug reports, create GitHub issue
             if is_bug and GITHUB_TOKEN:
                 issue_body = f"""## Bug Report from Feedback Site
 
-**Platform:** {platform}
-**App Version:** {app_version}
+**Platform:** {item.platform}
+**App Version:** {item.app_version}
 **Submitted by:** {data.get('x_handle') or data['user_id'][:12]}
 
 ### Description
@@ -306,16 +1289,16 @@ class handler(BaseHTTPRequestHandler):
                     labels
                 )
                 if github_url:
-                    item["github_issue_url"] = github_url
+                    item.github_issue_url = github_url
 
             # Score with Claude AI
             scores = score_feedback_item(data["title"], data["description"], data["item_type"])
-            item["ai_feasibility_score"] = scores.get("feasibility")
-            item["ai_impact_score"] = scores.get("impact")
-            item["ai_clarity_score"] = scores.get("clarity")
-            item["rank_score"] = calculate_rank_score(item)
+            item.ai_feasibility_score = scores.get("feasibility")
+            item.ai_impact_score = scores.get("impact")
+            item.ai_clarity_score = scores.get("clarity")
+            item.rank_score = calculate_rank_score(item)
 
-            feedback_items.append(item)
+            store_item(item)
 
             # Award credits (bugs get bonus for helping debug)
             user_id = data["user_id"]
@@ -338,36 +1321,87 @@ class handler(BaseHTTPRequestHandler):
             if data.get("x_handle"):
                 user_credits[user_id]["x_handle"] = data.get("x_handle")
 
-            return json_response(self, item, 201)
+            return json_response(self, item.to_json(), 201)
+
+        # Bulk status transition (admin only); completion credits are paid once per item
+        if path == '/api/feedback/bulk/status':
+            if not ADMIN_TOKEN or not secrets.compare_digest(
+                    self.headers.get('Authorization', '').encode(), f"Bearer {ADMIN_TOKEN}".encode()):
+                return json_response(self, {"detail": "Not authorized"}, 401)
+            status = data.get("status")
+            item_ids = list(dict.fromkeys(data.get("item_ids") or []))
+            if status not in STATUSES or not item_ids or len(item_ids) > MAX_BULK_IDS:
+                return json_response(self, {"detail": f"Pass a valid status and 1 to {MAX_BULK_IDS} item_ids"}, 400)
+            wanted = set(item_ids)
+            now = datetime.utcnow().isoformat()
+            changed = 0
+            awards = {}
+            for item in feedback_items:
+                if item.id not in wanted:
+                    continue
+                if item.status != status:
+                    item.status = interned(status)
+                    item.updated_at = now
+                    changed += 1
+                if status != "completed" or item.id in completion_awarded:
+                    continue
+                completion_awarded.add(item.id)
+                transaction_type, amount = COMPLETION_CREDITS.get(item.item_type, COMPLETION_CREDITS["bug"])
+                item.credits_awarded += amount
+                owner = user_credits.setdefault(item.user_id, {
+                    "id": str(uuid4()),
+                    "user_id": item.user_id,
+                    "x_handle": None,
+                    "credits_balance": 0,
+                    "credits_earned_total": 0,
+                    "items_submitted": 0,
+                    "items_developed": 0,
+                    "created_at": now
+                })
+                owner["credits_balance"] += amount
+                owner["credits_earned_total"] += amount
+                if transaction_type == "developed":
+                    owner["items_developed"] += 1
+                award = awards.setdefault(transaction_type, {"items": 0, "credits": 0})
+                award["items"] += 1
+                award["credits"] += amount
+            return json_response(self, {"status": status, "requested": len(item_ids),
+                                        "changed": changed, "awards": awards})
 
         # Vote
         if '/vote' in path:
             item_id = path.split('/api/feedback/')[1].split('/vote')[0]
             user_id = data["user_id"]
             vote_type = data.get("vote_type", "up")
-            vote_key = f"{item_id}:{user_id}"
-
-            for item in feedback_items:
-                if item["id"] == item_id:
-                    existing_vote = votes.get(vote_key)
-                    if existing_vote:
-                        if existing_vote == vote_type:
-                            del votes[vote_key]
-                            item["vote_count"] += -1 if vote_type == "up" else 1
-                            user_voted = None
-                        else:
-                            votes[vote_key] = vote_type
-                            item["vote_count"] += 2 if vote_type == "up" else -2
-                            user_voted = vote_type
-                    else:
-                        votes[vote_key] = vote_type
-                        item["vote_count"] += 1 if vote_type == "up" else -1
-                        user_voted = vote_type
-
-                    item["rank_score"] = calculate_rank_score(item)
-                    return json_response(self, {"vote_count": item["vote_count"], "user_voted": user_voted})
+            if vote_type not in VOTE_TYPES:
+                return json_response(self, {"detail": "vote_type must be 'up' or 'down'"}, 400)
+
+            item = find_item(item_id)
+            if item is None:
+                return json_response(self, {"detail": "Not found"}, 404)
+            key = vote_key(item, user_id)
+            packed = votes.get(key) if key is not None else None
+            previous_count = item.vote_count
+            if packed is not None:
+                # Removals and flips adjust the hour the vote was originally cast
+                cast_hour = packed >> 1
+                if VOTE_TYPES[packed & 1] == vote_type:
+                    remove_vote(key, user_id)
+                    item.vote_count += -1 if vote_type == "up" else 1
+                    user_voted = None
+                else:
+                    votes[key] = pack_vote(vote_type, cast_hour)
+                    item.vote_count += 2 if vote_type == "up" else -2
+                    user_voted = vote_type
+            else:
+                cast_hour = current_hour()
+                set_vote(item, user_id, vote_type, cast_hour)
+                item.vote_count += 1 if vote_type == "up" else -1
+                user_voted = vote_type
+            record_vote_velocity(item_id, item.vote_count - previous_count, cast_hour)
 
-            return json_response(self, {"detail": "Not found"}, 404)
+            item.rank_score = calculate_rank_score(item)
+            return json_response(self, {"vote_count": item.vote_count, "user_voted": user_voted})
 
         # Add comment
         if '/comments' in path:
@@ -384,23 +1418,30 @@ class handler(BaseHTTPRequestHandler):
             if item_id not in comments:
                 comments[item_id] = []
             comments[item_id].append(comment)
+            if comment["is_product_owner"]:
+                pinned_comments.setdefault(item_id, []).append(comment)
             return json_response(self, comment, 201)
 
         # Run ranking
         if path == '/api/ranking/run':
             for item in feedback_items:
-                item["rank_score"] = calculate_rank_score(item)
-            return json_response(self, {"message": f"Re-ranked {len(feedback_items)} items"})
+                item.rank_score = calculate_rank_score(item)
+            snapshot = record_rank_snapshot()
+            return json_response(self, {"message": f"Re-ranked {len(feedback_items)} items",
+                                        "rank_snapshot": snapshot["id"], "positions_changed": snapshot["changed"]})
 
         # Email signups for downloads
         if path == '/api/signups':
-            signup = {
-                "id": str(uuid4()),
-                "email": data.get("email"),
-                "source": data.get("source", "unknown"),
-                "timestamp": data.get("timestamp", datetime.utcnow().isoformat())
-            }
-            signups.append(signup)
-            return json_response(self, signup, 201)
+            if signup_store is None:
+                return json_response(self, SIGNUPS_DISABLED, 503)
+            email = normalize_email(data.get("email"))
+            if not EMAIL_PATTERN.match(email) or len(email) > 254:
+                return json_response(self, {"detail": "Invalid email"}, 400)
+            signup, created = signup_store.add(
+                email,
+                str(data.get("source") or "unknown")[:50],
+                data.get("timestamp", datetime.utcnow().isoformat()),
+            )
+            return json_response(self, signup, 201 if created else 200)
 
         return json_response(self, {"detail": "Not found"}, 404)
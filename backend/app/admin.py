@@ -0,0 +1,19 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """Dependency for product-owner endpoints: requires `Authorization: Bearer <ADMIN_TOKEN>`.
+
+    With no token configured every admin endpoint is refused.
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not secrets.compare_digest((authorization or "").encode(), f"Bearer {settings.admin_token}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -5,14 +5,53 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     database_url: str = os.getenv("DATABASE_URL", "postgresql://localhost/appfeedback")
+    # Optional comma-separated read replicas for read-only routes
+    database_replica_urls: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    replica_max_lag_seconds: float = 5.0
+    replica_check_interval_seconds: float = 2.0
+    replica_retry_seconds: float = 30.0
+    # A replica that has not accepted a connection by then is treated as down
+    replica_connect_timeout_seconds: float = 2.0
+    replica_sticky_seconds: float = 10.0
     anthropic_api_key: str = os.getenv("ANTHROPIC_API_KEY", "")
     environment: str = os.getenv("ENVIRONMENT", "development")
+    debug_queries: bool = os.getenv("DEBUG_QUERIES", "false").lower() == "true"
+    # Bearer token for product-owner endpoints; they are disabled while it is empty
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
+
+    # Startup warmup and shutdown drain
+    warmup_enabled: bool = True
+    warmup_connections: int = 5
+    shutdown_drain_seconds: float = 10.0
+
+    # Boards served from the same tables; requests pick one with ?variant= or X-Variant
+    tenants: str = os.getenv("TENANTS", "default,bumblebee")
+    default_tenant: str = "default"
 
     # Credits configuration
     credits_submission: int = 10
     credits_top_ranked: int = 50
     credits_developed: int = 500
     credits_bug_verified: int = 25
+    top_ranked_size: int = 10
+
+    # Admission control for write endpoints
+    rate_limit_enabled: bool = True
+    rate_limit_submit_per_minute: int = 5
+    rate_limit_submit_burst: int = 5
+    rate_limit_vote_per_minute: int = 60
+    rate_limit_vote_burst: int = 20
+    rate_limit_ip_multiplier: int = 4
+    rate_limit_max_keys: int = 100_000
+    # Proxies in front of the app that append to X-Forwarded-For; 0 keys IP buckets on the peer address
+    rate_limit_trusted_proxies: int = 0
+    rate_limit_redis_url: str = os.getenv("RATE_LIMIT_REDIS_URL", "")
+    max_in_flight_writes: int = 64
+
+    # Per-user vote membership cache for user_voted
+    vote_cache_max_users: int = 10_000
+    vote_cache_max_votes_per_user: int = 5_000
+    vote_cache_ttl_seconds: float = 60.0
 
     class Config:
         env_file = ".env"
@@ -1,19 +1,39 @@
+import asyncio
+import time
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
+from app.metrics import metrics, instrument_engine
+from app.replicas import ReplicaPool, wrote_recently
 
 settings = get_settings()
 
-# Convert postgres:// to postgresql+asyncpg://
-database_url = settings.database_url
-if database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-elif database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+def async_database_url(url: str) -> str:
+    """Convert postgres:// and postgresql:// URLs to postgresql+asyncpg://."""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+database_url = async_database_url(settings.database_url)
 
 engine = create_async_engine(database_url, echo=False)
+instrument_engine(engine)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+replica_pool = ReplicaPool(
+    [async_database_url(url.strip()) for url in settings.database_replica_urls.split(",") if url.strip()],
+    max_lag=settings.replica_max_lag_seconds,
+    retry_after=settings.replica_retry_seconds,
+    echo=False,
+    connect_args={"timeout": settings.replica_connect_timeout_seconds},
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -22,6 +42,56 @@ class Base(DeclarativeBase):
 async def get_db():
     async with async_session() as session:
         try:
+            # Check out the connection up front so pool waits are measured
+            started = time.perf_counter()
+            await session.connection()
+            metrics.observe_pool_wait(time.perf_counter() - started)
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_autocommit_db():
+    """Session whose statements commit as they finish, for routes that write in one statement.
+
+    Row locks (such as the day's rollup rows every submission updates) are
+    released when the statement ends rather than a COMMIT round trip later.
+    """
+    async with async_session() as session:
+        try:
+            started = time.perf_counter()
+            await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            metrics.observe_pool_wait(time.perf_counter() - started)
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request):
+    """Session for read-only routes: a healthy replica unless the client wrote recently.
+
+    Falls back to the primary when no replica is available or the chosen one
+    refuses or times out the connection (which also takes it out of rotation).
+    """
+    replica = None if wrote_recently(request.cookies) else replica_pool.pick()
+    started = time.perf_counter()
+    session = None
+    try:
+        if replica is not None:
+            session = replica.sessionmaker()
+            try:
+                await session.connection()
+            except (OSError, DBAPIError, asyncio.TimeoutError):
+                replica_pool.mark_down(replica)
+                await session.close()
+                session = None
+            else:
+                session.info["replica"] = replica.name
+        if session is None:
+            session = async_session()
+            await session.connection()
+        metrics.observe_pool_wait(time.perf_counter() - started)
+        yield session
+    finally:
+        if session is not None:
+            await session.close()
@@ -0,0 +1,77 @@
+"""
+Ledger reconciliation: check user_credits balances against SUM(credit_transactions.amount).
+
+    python -m app.jobs.reconcile_ledger
+    python -m app.jobs.reconcile_ledger --repair --checkpoint /tmp/ledger.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dataclasses import asdict
+
+from app.database import async_session, engine
+from app.services.ledger import RECONCILE_CHUNK_SIZE, reconcile_chunk
+
+
+def load_checkpoint(path: str) -> dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"last_key": None, "checked": 0, "drifted": 0, "repaired": 0}
+
+
+def save_checkpoint(path: str, state: dict):
+    # Write-then-rename so an interrupted run never leaves a truncated checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+async def run(args) -> int:
+    state = load_checkpoint(args.checkpoint)
+    if state["last_key"] is not None:
+        print(f"Resuming after {state['last_key']!r}", file=sys.stderr)
+
+    while True:
+        async with async_session() as db:
+            after = tuple(state["last_key"]) if state["last_key"] else None
+            chunk = await reconcile_chunk(db, after, args.chunk_size, args.repair)
+            await db.commit()
+        if not chunk.checked:
+            break
+
+        for drift in chunk.drifts:
+            print(json.dumps(asdict(drift)))
+        state["last_key"] = list(chunk.last_key)
+        state["checked"] += chunk.checked
+        state["drifted"] += len(chunk.drifts)
+        state["repaired"] += chunk.repaired
+        if args.checkpoint:
+            save_checkpoint(args.checkpoint, state)
+        if args.pause:
+            await asyncio.sleep(args.pause)
+
+    await engine.dispose()
+    print(
+        f"Checked {state['checked']} users, {state['drifted']} drifted, {state['repaired']} repaired",
+        file=sys.stderr,
+    )
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    return 1 if state["drifted"] > state["repaired"] else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repair", action="store_true", help="Rewrite drifted balances from the ledger")
+    parser.add_argument("--chunk-size", type=int, default=RECONCILE_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", help="File recording progress; an existing one resumes the run")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks")
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
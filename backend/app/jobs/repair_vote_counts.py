@@ -0,0 +1,113 @@
+"""
+Vote count repair: check feedback_items.vote_count against up-minus-down feedback_votes rows.
+
+    python -m app.jobs.repair_vote_counts --dry-run
+    python -m app.jobs.repair_vote_counts --checkpoint /tmp/votes.json --metrics-file /var/lib/node_exporter/votes.prom
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from uuid import UUID
+
+from sqlalchemy.exc import DBAPIError
+
+from app.database import async_session, engine
+from app.jobs.reconcile_ledger import save_checkpoint
+from app.services.vote_drift import VOTE_REPAIR_CHUNK_SIZE, repair_vote_chunk
+
+
+def load_checkpoint(path: str) -> dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"last_id": None, "checked": 0, "drifted": 0, "repaired": 0, "abs_delta": 0, "max_abs_delta": 0, "lock_timeouts": 0}
+
+
+def write_metrics(path: str, state: dict, dry_run: bool):
+    """Write the run's drift totals in the Prometheus textfile-collector format."""
+    lines = []
+    for name, help_text, value in (
+        ("appfeedback_vote_drift_items_checked", "Items compared in the last vote count repair run.", state["checked"]),
+        ("appfeedback_vote_drift_items", "Items whose vote_count disagreed with feedback_votes.", state["drifted"]),
+        ("appfeedback_vote_drift_items_repaired", "Drifted items rewritten by the last run.", state["repaired"]),
+        ("appfeedback_vote_drift_abs_delta", "Sum of |expected - stored| vote_count over drifted items.", state["abs_delta"]),
+        ("appfeedback_vote_drift_max_abs_delta", "Largest single-item vote_count drift.", state["max_abs_delta"]),
+        ("appfeedback_vote_drift_lock_timeouts", "Chunks skipped because a row lock was not granted in time.", state["lock_timeouts"]),
+        ("appfeedback_vote_drift_dry_run", "1 if the last run only reported drift.", int(dry_run)),
+        ("appfeedback_vote_drift_last_run_timestamp_seconds", "Completion time of the last run.", int(time.time())),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+async def run(args) -> int:
+    state = load_checkpoint(args.checkpoint)
+    if state["last_id"] is not None:
+        print(f"Resuming after {state['last_id']}", file=sys.stderr)
+
+    while True:
+        after = UUID(state["last_id"]) if state["last_id"] else None
+        async with async_session() as db:
+            try:
+                chunk = await repair_vote_chunk(db, after, args.chunk_size, not args.dry_run, args.lock_timeout)
+                await db.commit()
+            except DBAPIError as exc:
+                # Only the guarded UPDATE takes row locks; leave this chunk's drift for the next run
+                if "lock timeout" not in str(exc.orig):
+                    raise
+                await db.rollback()
+                chunk = await repair_vote_chunk(db, after, args.chunk_size, repair=False)
+                await db.rollback()
+                state["lock_timeouts"] += 1
+                print(f"Lock timeout repairing after {state['last_id']}; chunk left as is", file=sys.stderr)
+        if not chunk.checked:
+            break
+
+        for drift in chunk.drifts:
+            print(json.dumps({**asdict(drift), "delta": drift.delta}))
+            state["abs_delta"] += abs(drift.delta)
+            state["max_abs_delta"] = max(state["max_abs_delta"], abs(drift.delta))
+        state["last_id"] = str(chunk.last_id)
+        state["checked"] += chunk.checked
+        state["drifted"] += len(chunk.drifts)
+        state["repaired"] += chunk.repaired
+        if args.checkpoint:
+            save_checkpoint(args.checkpoint, state)
+        if args.pause:
+            await asyncio.sleep(args.pause)
+
+    await engine.dispose()
+    print(
+        f"Checked {state['checked']} items, {state['drifted']} drifted "
+        f"(total |delta| {state['abs_delta']}, max {state['max_abs_delta']}), {state['repaired']} repaired",
+        file=sys.stderr,
+    )
+    if args.metrics_file:
+        write_metrics(args.metrics_file, state, args.dry_run)
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    return 1 if state["drifted"] > state["repaired"] else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without rewriting any rows")
+    parser.add_argument("--chunk-size", type=int, default=VOTE_REPAIR_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", help="File recording progress; an existing one resumes the run")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks")
+    parser.add_argument("--lock-timeout", type=int, default=2_000, help="Milliseconds to wait for a row lock before skipping a chunk")
+    parser.add_argument("--metrics-file", help="Write drift gauges here for the node_exporter textfile collector")
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Offline shadow ranking: score the whole corpus with a candidate algorithm and
+compare it with the active one, without writing anything.
+
+    python -m app.jobs.shadow_ranking --version v1.1.0
+    python -m app.jobs.shadow_ranking --weight votes=0.8 --weight impact=0.6 --item-type bug
+"""
+import argparse
+import asyncio
+import json
+import sys
+from uuid import UUID
+
+from app.config import get_settings
+from app.database import async_session, engine
+from app.services.shadow_ranking import WEIGHT_FIELDS, resolve_candidate_weights, shadow_rank
+
+settings = get_settings()
+
+
+def parse_weight(value: str):
+    name, _, weight = value.partition("=")
+    field = name if name.startswith("weight_") else f"weight_{name}"
+    if field not in WEIGHT_FIELDS or not weight:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(WEIGHT_FIELDS)} as NAME=VALUE")
+    return field, float(weight)
+
+
+async def run(args) -> int:
+    async with async_session() as db:
+        weights = await resolve_candidate_weights(db, args.algorithm_id, args.version, dict(args.weight))
+        if weights is None:
+            print("Algorithm not found", file=sys.stderr)
+            return 1
+        report = await shadow_rank(db, weights, args.tenant, args.item_type, args.movers)
+    await engine.dispose()
+    print(json.dumps(report, indent=2, default=str))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--algorithm-id", type=UUID, help="Stored ranking_algorithms.id to evaluate")
+    parser.add_argument("--version", help="Stored ranking_algorithms.version to evaluate")
+    parser.add_argument("--weight", type=parse_weight, action="append", default=[],
+                        help="Override a weight, e.g. votes=0.8 (repeatable)")
+    parser.add_argument("--item-type", choices=("wishlist", "bug"))
+    parser.add_argument("--tenant", default=settings.default_tenant, help="Board to evaluate")
+    parser.add_argument("--movers", type=int, default=20)
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
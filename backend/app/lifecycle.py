@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.metrics import metrics
+
+# A request this quick after startup means the process is warm
+FAST_REQUEST_SECONDS = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_pool(engine: AsyncEngine, connections: int):
+    """Open up to connections pooled connections at once so the first burst finds them ready."""
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+class RequestTracker:
+    """ASGI middleware counting in-flight requests for shutdown drain.
+
+    Also records how long after process start the first fast request finished,
+    exported with the warmup time as gauges.
+    """
+
+    def __init__(self, app, state: "LifecycleState"):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        state = self.state
+        state.in_flight += 1
+        state.idle.clear()
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            state.in_flight -= 1
+            if not state.in_flight:
+                state.idle.set()
+            finished = time.monotonic()
+            if state.first_fast_request is None and finished - started < FAST_REQUEST_SECONDS:
+                state.first_fast_request = finished - state.process_started
+                logger.info("First fast request %.3fs after process start", state.first_fast_request)
+
+
+class LifecycleState:
+    """Startup timings and the in-flight count shared by the lifespan and RequestTracker."""
+
+    def __init__(self):
+        self.process_started = time.monotonic()
+        self.warmup_seconds: Optional[float] = None
+        self.first_fast_request: Optional[float] = None
+        self.in_flight = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+        metrics.register_gauge(
+            "appfeedback_warmup_seconds", "Time spent warming pools and caches at startup.",
+            lambda: self.warmup_seconds or 0,
+        )
+        metrics.register_gauge(
+            "appfeedback_time_to_first_fast_request_seconds",
+            f"Process start to the first request served in under {FAST_REQUEST_SECONDS}s (0 until one is).",
+            lambda: self.first_fast_request or 0,
+        )
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait for in-flight requests to finish; False if some were still running at timeout."""
+        if self.in_flight:
+            logger.info("Draining %d in-flight requests", self.in_flight)
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning("%d requests still in flight after %.0fs drain", self.in_flight, timeout)
+            return False
+
+
+lifecycle = LifecycleState()
@@ -1,17 +1,86 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Optional
+import asyncio
+import logging
 import os
+import time
 
 from app.routers import feedback_router, credits_router, ranking_router
+from app.routers.credits import get_leaderboard
+from app.routers.ranking import get_current_algorithm
+from app.lifecycle import lifecycle, warm_pool, RequestTracker
+from app.metrics import metrics, MetricsMiddleware
+from app.ratelimit import AdmissionControlMiddleware
+from app.replicas import ReadYourWritesMiddleware
+from app.static import StaticIndex, InvalidStaticPath
+from app.config import get_settings
+from app.database import engine, async_session, get_read_db, replica_pool
+from app.tenancy import get_tenant, TENANTS
+from app.models.feedback import FeedbackItem
+from app.models.credits import UserCredits
+from app.services.rollups import timeseries, METRICS, MAX_RANGE_DAYS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def warm_up():
+    """Fill the connection pools and run the hottest read paths once per board.
+
+    This opens the connections, compiles the statements and pulls their pages
+    into Postgres' buffer cache before the first real request arrives.
+    """
+    await asyncio.gather(
+        warm_pool(engine, settings.warmup_connections),
+        *(warm_pool(replica.engine, settings.warmup_connections) for replica in replica_pool.replicas),
+        return_exceptions=True,
+    )
+    async with async_session() as db:
+        try:
+            await get_current_algorithm(db)
+        except HTTPException:
+            pass
+        for tenant in sorted(TENANTS):
+            await get_stats(tenant, db)
+            await get_leaderboard(20, tenant, db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    replica_pool.start(settings.replica_check_interval_seconds)
+    if settings.warmup_enabled:
+        try:
+            await warm_up()
+        except Exception as exc:
+            # A cold start is slower, not fatal; requests will connect on demand
+            logger.warning("Startup warmup failed: %s", exc)
+    lifecycle.warmup_seconds = time.perf_counter() - started
+    logger.info("Warmed up in %.3fs", lifecycle.warmup_seconds)
+
+    yield
+
+    await lifecycle.drain(settings.shutdown_drain_seconds)
+    await replica_pool.stop()
+    await engine.dispose()
+
 
 app = FastAPI(
     title="AppFeedback API",
     description="Open Source Feature/Bug Fix Rewards System for B2Bee",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Shed abusive write traffic before it reaches the database
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +89,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware, debug=settings.debug_queries)
+if replica_pool.replicas:
+    # Clients that just wrote read from the primary until replicas have caught up
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.replica_sticky_seconds)
+# Outermost, so shutdown waits for every in-flight request
+app.add_middleware(RequestTracker, state=lifecycle)
 
 # Include routers
 app.include_router(feedback_router)
@@ -27,48 +102,48 @@ app.include_router(credits_router)
 app.include_router(ranking_router)
 
 
-@app.get("/api/health")
+@app.get("/api/health", openapi_extra={"x-query-budget": 0})
 async def health_check():
     return {"status": "healthy", "service": "appfeedback"}
 
 
-@app.get("/api/stats")
-async def get_stats():
-    """Get overall platform statistics."""
-    from sqlalchemy import select, func
-    from app.database import async_session
-    from app.models.feedback import FeedbackItem
-    from app.models.credits import UserCredits
+@app.get("/api/metrics", response_class=PlainTextResponse, openapi_extra={"x-query-budget": 0})
+async def get_metrics():
+    """Expose process metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
-    async with async_session() as db:
-        # Total items
-        items_result = await db.execute(select(func.count(FeedbackItem.id)))
-        total_items = items_result.scalar() or 0
-
-        # By type
-        wishlist_result = await db.execute(
-            select(func.count(FeedbackItem.id)).where(FeedbackItem.item_type == "wishlist")
-        )
-        wishlist_count = wishlist_result.scalar() or 0
-
-        bug_result = await db.execute(
-            select(func.count(FeedbackItem.id)).where(FeedbackItem.item_type == "bug")
-        )
-        bug_count = bug_result.scalar() or 0
-
-        # Completed items
-        completed_result = await db.execute(
-            select(func.count(FeedbackItem.id)).where(FeedbackItem.status == "completed")
-        )
-        completed_count = completed_result.scalar() or 0
-
-        # Total contributors
-        contributors_result = await db.execute(select(func.count(UserCredits.id)))
-        contributors_count = contributors_result.scalar() or 0
-
-        # Total credits awarded
-        credits_result = await db.execute(select(func.sum(UserCredits.credits_earned_total)))
-        total_credits = credits_result.scalar() or 0
+
+@app.get("/api/stats", openapi_extra={"x-query-budget": 6})
+async def get_stats(tenant: str = Depends(get_tenant), db: AsyncSession = Depends(get_read_db)):
+    """Get overall platform statistics for a board."""
+    # Total items
+    items_result = await db.execute(select(func.count(FeedbackItem.id)).where(FeedbackItem.tenant == tenant))
+    total_items = items_result.scalar() or 0
+
+    # By type
+    wishlist_result = await db.execute(
+        select(func.count(FeedbackItem.id)).where(FeedbackItem.tenant == tenant, FeedbackItem.item_type == "wishlist")
+    )
+    wishlist_count = wishlist_result.scalar() or 0
+
+    bug_result = await db.execute(
+        select(func.count(FeedbackItem.id)).where(FeedbackItem.tenant == tenant, FeedbackItem.item_type == "bug")
+    )
+    bug_count = bug_result.scalar() or 0
+
+    # Completed items
+    completed_result = await db.execute(
+        select(func.count(FeedbackItem.id)).where(FeedbackItem.tenant == tenant, FeedbackItem.status == "completed")
+    )
+    completed_count = completed_result.scalar() or 0
+
+    # Total contributors
+    contributors_result = await db.execute(select(func.count(UserCredits.id)).where(UserCredits.tenant == tenant))
+    contributors_count = contributors_result.scalar() or 0
+
+    # Total credits awarded
+    credits_result = await db.execute(select(func.sum(UserCredits.credits_earned_total)).where(UserCredits.tenant == tenant))
+    total_credits = credits_result.scalar() or 0
 
     return {
         "total_items": total_items,
@@ -80,18 +155,47 @@ async def get_stats():
     }
 
 
-# Serve static files if dashboard is built
+@app.get("/api/stats/timeseries", openapi_extra={"x-query-budget": 1})
+async def get_stats_timeseries(
+    start: date,
+    end: Optional[date] = None,
+    series: Optional[str] = Query(None, alias="metrics", description="Comma-separated metric names"),
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Activity and credit trends from daily rollups; quiet buckets report zeros."""
+    end = end or date.today()
+    if end < start or (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range must be 0-{MAX_RANGE_DAYS} days")
+    names = [name.strip() for name in series.split(",")] if series else list(METRICS)
+    unknown = [name for name in names if name not in METRICS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metrics: {', '.join(unknown)}")
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "bucket": bucket,
+        "series": await timeseries(db, tenant, start, end, names, bucket),
+    }
+
+
+# Serve the built dashboard from an in-memory index (see app/static.py)
 dashboard_path = os.path.join(os.path.dirname(__file__), "..", "..", "dashboard", "dist")
 if os.path.exists(dashboard_path):
-    app.mount("/assets", StaticFiles(directory=os.path.join(dashboard_path, "assets")), name="assets")
-
-    @app.get("/")
-    async def serve_dashboard():
-        return FileResponse(os.path.join(dashboard_path, "index.html"))
-
-    @app.get("/{path:path}")
-    async def serve_spa(path: str):
-        file_path = os.path.join(dashboard_path, path)
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-        return FileResponse(os.path.join(dashboard_path, "index.html"))
+    dashboard = StaticIndex(dashboard_path)
+
+    @app.get("/", include_in_schema=False, openapi_extra={"x-query-budget": 0})
+    async def serve_dashboard(request: Request):
+        return dashboard.response(request, dashboard.lookup("index.html"))
+
+    @app.get("/{path:path}", include_in_schema=False, openapi_extra={"x-query-budget": 0})
+    async def serve_spa(path: str, request: Request):
+        try:
+            asset = dashboard.lookup(path)
+        except InvalidStaticPath:
+            raise HTTPException(status_code=400, detail="Invalid path")
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        return dashboard.response(request, asset)
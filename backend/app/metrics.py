@@ -0,0 +1,252 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+
+# A statement shape seen this many times in one request is reported as a likely N+1
+REPEATED_STATEMENT_THRESHOLD = 3
+IN_LIST_PATTERN = re.compile(r"IN \([^()]*\)")
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list:
+        sep = "," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        label_block = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{label_block} {self.total}")
+        lines.append(f"{name}_count{label_block} {self.count}")
+        return lines
+
+
+class RequestStats:
+    """Per-request database counters, shared through a ContextVar."""
+
+    __slots__ = ("queries", "db_time", "statements")
+
+    def __init__(self, track_statements: bool = False):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+
+    def repeated_statements(self) -> List[Tuple[str, int]]:
+        """Statement shapes issued often enough in this request to look like an N+1."""
+        if not self.statements:
+            return []
+        return [(shape, count) for shape, count in self.statements.items() if count >= REPEATED_STATEMENT_THRESHOLD]
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class MetricsRegistry:
+    """Process-local request, database, pool and cache metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.queries: Dict[Tuple[str, str], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.pool_wait = Histogram(LATENCY_BUCKETS)
+        self.cache: Dict[Tuple[str, str], int] = {}
+        self.budget_exceeded: Dict[Tuple[str, str], int] = {}
+        self.gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self.engine = None
+
+    def observe_request(self, method: str, route: str, status: int, duration: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self.db_time[key] = Histogram(LATENCY_BUCKETS)
+            self.latency[key].observe(duration)
+            self.queries[key].observe(stats.queries)
+            self.db_time[key].observe(stats.db_time)
+
+    def observe_budget_exceeded(self, method: str, route: str):
+        with self._lock:
+            self.budget_exceeded[(method, route)] = self.budget_exceeded.get((method, route), 0) + 1
+
+    def observe_pool_wait(self, duration: float):
+        with self._lock:
+            self.pool_wait.observe(duration)
+
+    def register_gauge(self, name: str, help_text: str, read: Callable[[], float]):
+        """Report read() as a gauge on every scrape."""
+        self.gauges[name] = (help_text, read)
+
+    def record_cache(self, name: str, hit: bool):
+        key = (name, "hit" if hit else "miss")
+        with self._lock:
+            self.cache[key] = self.cache.get(key, 0) + 1
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = [
+            "# HELP appfeedback_requests_total HTTP requests by route and status.",
+            "# TYPE appfeedback_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'appfeedback_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+            for name, help_text, series in (
+                ("appfeedback_request_duration_seconds", "HTTP request latency.", self.latency),
+                ("appfeedback_request_queries", "SQL statements issued per request.", self.queries),
+                ("appfeedback_request_db_seconds", "Time spent in SQL per request.", self.db_time),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histogram in sorted(series.items()):
+                    lines.extend(histogram.render(name, f'method="{method}",route="{route}"'))
+
+            lines.append("# HELP appfeedback_query_budget_exceeded_total Requests over their route's query budget.")
+            lines.append("# TYPE appfeedback_query_budget_exceeded_total counter")
+            for (method, route), count in sorted(self.budget_exceeded.items()):
+                lines.append(f'appfeedback_query_budget_exceeded_total{{method="{method}",route="{route}"}} {count}')
+
+            lines.append("# HELP appfeedback_pool_checkout_wait_seconds Time to acquire a pooled connection.")
+            lines.append("# TYPE appfeedback_pool_checkout_wait_seconds histogram")
+            lines.extend(self.pool_wait.render("appfeedback_pool_checkout_wait_seconds", ""))
+
+            lines.append("# HELP appfeedback_cache_requests_total Cache lookups by cache and result.")
+            lines.append("# TYPE appfeedback_cache_requests_total counter")
+            for (name, result), count in sorted(self.cache.items()):
+                lines.append(f'appfeedback_cache_requests_total{{cache="{name}",result="{result}"}} {count}')
+
+        pool = self.engine.sync_engine.pool if self.engine is not None else None
+        if pool is not None and hasattr(pool, "checkedout"):
+            for name, value in (
+                ("appfeedback_pool_size", pool.size()),
+                ("appfeedback_pool_checked_out", pool.checkedout()),
+                ("appfeedback_pool_overflow", pool.overflow()),
+            ):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+
+        for name, (help_text, read) in sorted(self.gauges.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {read()}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def instrument_engine(engine, report_pool: bool = True):
+    """Attach SQLAlchemy cursor hooks that feed the current request's stats.
+
+    report_pool makes this the engine whose pool gauges are exported.
+    """
+    if report_pool:
+        metrics.engine = engine
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += time.perf_counter() - context._query_started
+            if stats.statements is not None:
+                shape = IN_LIST_PATTERN.sub("IN (...)", statement)
+                stats.statements[shape] = stats.statements.get(shape, 0) + 1
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and DB usage per route template.
+
+    Routes may pin their statement budget with openapi_extra={"x-query-budget": N}.
+    With debug on, responses carry X-Query-Count and repeated statement shapes
+    are logged as likely N+1s.
+    """
+
+    def __init__(self, app, debug: bool = False):
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(track_statements=self.debug)
+        token = current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.debug:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-query-count", str(stats.queries).encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            current_request.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            metrics.observe_request(method, route_path, status, duration, stats)
+
+            budget = (getattr(route, "openapi_extra", None) or {}).get("x-query-budget")
+            if budget is not None and stats.queries > budget:
+                metrics.observe_budget_exceeded(method, route_path)
+                if self.debug:
+                    logger.warning("%s %s issued %d queries (budget %d)", method, route_path, stats.queries, budget)
+            for shape, count in stats.repeated_statements():
+                logger.warning("%s %s repeated a statement %d times: %s", method, route_path, count, shape[:200])
+
+
+def assert_query_budget(response, budget: int):
+    """Test helper: fail if a debug-mode response issued more than budget statements."""
+    count = int(response.headers["x-query-count"])
+    if count > budget:
+        raise QueryBudgetExceeded(f"{count} queries issued, budget is {budget}")
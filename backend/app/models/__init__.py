@@ -1,6 +1,9 @@
 from app.models.feedback import FeedbackItem, FeedbackVote, FeedbackComment
 from app.models.credits import UserCredits, CreditTransaction
 from app.models.algorithm import RankingAlgorithm
+from app.models.rollups import DailyRollup
+from app.models.trending import VoteVelocityBucket
+from app.models.rank_history import RankSnapshot, RankChange
 
 __all__ = [
     "FeedbackItem",
@@ -8,5 +11,9 @@ __all__ = [
     "FeedbackComment",
     "UserCredits",
     "CreditTransaction",
-    "RankingAlgorithm"
+    "RankingAlgorithm",
+    "DailyRollup",
+    "VoteVelocityBucket",
+    "RankSnapshot",
+    "RankChange"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime, CheckConstraint
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -9,7 +9,8 @@ class UserCredits(Base):
     __tablename__ = "user_credits"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(String(100), unique=True, nullable=False)
+    tenant = Column(String(40), nullable=False, default="default", server_default="default")
+    user_id = Column(String(100), nullable=False)
     x_handle = Column(String(50))
     credits_balance = Column(Integer, default=0)
     credits_earned_total = Column(Integer, default=0)
@@ -18,11 +19,18 @@ class UserCredits(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # A user's balance is per board
+        Index("uq_user_credits_tenant_user", "tenant", "user_id", unique=True),
+        Index("idx_user_credits_tenant_earned", "tenant", credits_earned_total.desc()),
+    )
+
 
 class CreditTransaction(Base):
     __tablename__ = "credit_transactions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant = Column(String(40), nullable=False, default="default", server_default="default")
     user_id = Column(String(100), nullable=False)
     item_id = Column(UUID(as_uuid=True), ForeignKey("feedback_items.id", ondelete="SET NULL"))
     amount = Column(Integer, nullable=False)
@@ -32,4 +40,18 @@ class CreditTransaction(Base):
 
     __table_args__ = (
         CheckConstraint("transaction_type IN ('submission', 'top_ranked', 'developed', 'bonus', 'bug_verified')", name="check_transaction_type"),
+        Index(
+            "uq_credit_transactions_top_ranked_item",
+            "item_id",
+            unique=True,
+            postgresql_where=text("transaction_type = 'top_ranked'"),
+        ),
+        # Completing an item pays its owner once, however often the transition is replayed
+        Index(
+            "uq_credit_transactions_completed_item",
+            "item_id",
+            unique=True,
+            postgresql_where=text("transaction_type IN ('developed', 'bug_verified')"),
+        ),
+        Index("idx_credit_transactions_tenant_user", "tenant", "user_id", created_at.desc()),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, DateTime, CheckConstraint
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, ForeignKey, DateTime, CheckConstraint, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,6 +10,7 @@ class FeedbackItem(Base):
     __tablename__ = "feedback_items"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant = Column(String(40), nullable=False, default="default", server_default="default")
     item_type = Column(String(20), nullable=False)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=False)
@@ -18,6 +19,7 @@ class FeedbackItem(Base):
     status = Column(String(30), default="new")
     vote_count = Column(Integer, default=0)
     rank_score = Column(Float, default=0)
+    rank_position = Column(Integer)  # Position on its board at the last re-rank, 1 = top
     ai_feasibility_score = Column(Float)
     ai_impact_score = Column(Float)
     ai_clarity_score = Column(Float)
@@ -32,6 +34,13 @@ class FeedbackItem(Base):
     __table_args__ = (
         CheckConstraint("item_type IN ('wishlist', 'bug')", name="check_item_type"),
         CheckConstraint("status IN ('new', 'under_review', 'planned', 'in_progress', 'completed', 'wont_do')", name="check_status"),
+        Index("idx_feedback_items_tenant_type_rank", "tenant", "item_type", rank_score.desc(), "id"),
+        Index("idx_feedback_items_tenant_rank", "tenant", rank_score.desc()),
+        Index("idx_feedback_items_tenant_created", "tenant", created_at.desc()),
+        Index("idx_feedback_items_tenant_type_votes", "tenant", "item_type", vote_count.desc(), "id"),
+        Index("idx_feedback_items_tenant_votes", "tenant", vote_count.desc()),
+        Index("idx_feedback_items_tenant_type_created", "tenant", "item_type", created_at.desc()),
+        Index("idx_feedback_items_tenant_status_rank", "tenant", "status", rank_score.desc()),
     )
 
 
@@ -39,6 +48,7 @@ class FeedbackVote(Base):
     __tablename__ = "feedback_votes"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant = Column(String(40), nullable=False, default="default", server_default="default")
     item_id = Column(UUID(as_uuid=True), ForeignKey("feedback_items.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(String(100), nullable=False)
     vote_type = Column(String(10), default="up")
@@ -48,6 +58,9 @@ class FeedbackVote(Base):
 
     __table_args__ = (
         CheckConstraint("vote_type IN ('up', 'down')", name="check_vote_type"),
+        # One vote per user per item; also serves every per-item vote lookup and count
+        UniqueConstraint("item_id", "user_id", name="feedback_votes_item_id_user_id_key"),
+        Index("idx_feedback_votes_tenant_user", "tenant", "user_id", "item_id"),
     )
 
 
@@ -55,6 +68,7 @@ class FeedbackComment(Base):
     __tablename__ = "feedback_comments"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant = Column(String(40), nullable=False, default="default", server_default="default")
     item_id = Column(UUID(as_uuid=True), ForeignKey("feedback_items.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(String(100), nullable=False)
     x_handle = Column(String(50))
@@ -63,3 +77,13 @@ class FeedbackComment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     item = relationship("FeedbackItem", back_populates="comments")
+
+    __table_args__ = (
+        Index("idx_feedback_comments_item_created", "item_id", "created_at", "id"),
+        Index(
+            "idx_feedback_comments_item_po",
+            "item_id",
+            created_at.desc(),
+            postgresql_where=is_product_owner,
+        ),
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RankSnapshot(Base):
+    __tablename__ = "rank_snapshots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant = Column(String(40), nullable=False, default="default", server_default="default")
+    taken_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    items = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("idx_rank_snapshots_tenant_taken", "tenant", "taken_at"),
+    )
+
+
+class RankChange(Base):
+    """An item's board position as of a snapshot; only written when it moved."""
+
+    __tablename__ = "rank_changes"
+
+    item_id = Column(UUID(as_uuid=True), ForeignKey("feedback_items.id", ondelete="CASCADE"), primary_key=True)
+    snapshot_id = Column(Integer, ForeignKey("rank_snapshots.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Items that moved in a snapshot, read without heap visits
+        Index("idx_rank_changes_snapshot", "snapshot_id", "item_id", "position"),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Date, BigInteger
+from app.database import Base
+
+
+class DailyRollup(Base):
+    __tablename__ = "daily_rollups"
+
+    tenant = Column(String(40), primary_key=True, default="default")
+    day = Column(Date, primary_key=True)
+    metric = Column(String(40), primary_key=True)
+    dimension = Column(String(40), primary_key=True, default="")
+    value = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class VoteVelocityBucket(Base):
+    __tablename__ = "vote_velocity_buckets"
+
+    item_id = Column(UUID(as_uuid=True), ForeignKey("feedback_items.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    tenant = Column(String(40), nullable=False, default="default", server_default="default")
+    net = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Covers the trending aggregate: one range scan per board, no heap visits
+        Index("idx_vote_velocity_tenant_bucket", "tenant", "bucket_start", "item_id", "net"),
+    )
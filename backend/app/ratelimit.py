@@ -0,0 +1,221 @@
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# (method, path pattern, limit name) for endpoints that are token-bucket limited
+LIMITED_ROUTES = (
+    ("POST", re.compile(r"^/api/feedback/?$"), "submit"),
+    ("POST", re.compile(r"^/api/feedback/[^/]+/vote/?$"), "vote"),
+)
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_INSPECTED_BODY = 64 * 1024
+
+
+class TokenBucketLimiter:
+    """In-memory token buckets keyed by string, bounded by LRU eviction.
+
+    An evicted key simply comes back with a full bucket, so the memory cap
+    trades a little leniency for distinct-key floods for a hard size limit.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; return 0 if admitted, else seconds until one is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = burst
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            tokens, updated = bucket
+            tokens = min(burst, tokens + (now - updated) * rate)
+            self._buckets.move_to_end(key)
+
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / rate
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RedisTokenBucketLimiter:
+    """Token buckets shared between workers through Redis (requires `redis`)."""
+
+    SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 't') or ARGV[2])
+    local updated = tonumber(redis.call('HGET', KEYS[1], 'u') or ARGV[3])
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    tokens = math.min(burst, tokens + (now - updated) * rate)
+    local wait = 0
+    if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+    redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        wait = await self._script(keys=[f"ratelimit:{key}"], args=[rate, burst, time.time()])
+        return float(wait)
+
+
+def _limits(name: str) -> Tuple[Tuple[float, int], Tuple[float, int]]:
+    """Return ((user rate/s, burst), (ip rate/s, burst)) for a limited route."""
+    if name == "submit":
+        return (
+            (settings.rate_limit_submit_per_minute / 60, settings.rate_limit_submit_burst),
+            (settings.rate_limit_submit_per_minute * settings.rate_limit_ip_multiplier / 60,
+             settings.rate_limit_submit_burst * settings.rate_limit_ip_multiplier),
+        )
+    return (
+        (settings.rate_limit_vote_per_minute / 60, settings.rate_limit_vote_burst),
+        (settings.rate_limit_vote_per_minute * settings.rate_limit_ip_multiplier / 60,
+         settings.rate_limit_vote_burst * settings.rate_limit_ip_multiplier),
+    )
+
+
+def _client_ip(scope) -> str:
+    """Address the IP bucket is keyed on: the peer, or the hop the nearest trusted proxy saw.
+
+    Clients can put anything in X-Forwarded-For, so only the entries appended
+    by the rate_limit_trusted_proxies proxies in front of us are believed.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    hops = settings.rate_limit_trusted_proxies
+    if not hops:
+        return peer
+    forwarded = [
+        address.strip().decode("latin-1")
+        for name, value in scope.get("headers", ())
+        if name == b"x-forwarded-for"
+        for address in value.split(b",")
+    ]
+    return forwarded[-hops] if len(forwarded) >= hops else peer
+
+
+async def _reject(send, status: int, retry_after: float, detail: str):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    """Sheds write load before routing: 503 past the global in-flight cap,
+    429 when the per-IP or per-user bucket for a submit/vote route is empty.
+
+    user_id comes from the request body, so the user bucket only adds a
+    per-identity limit; the IP bucket is the one a client cannot dodge.
+    """
+
+    def __init__(self, app, limiter=None, max_in_flight: Optional[int] = None):
+        self.app = app
+        self.limiter = limiter or _default_limiter()
+        self.max_in_flight = max_in_flight or settings.max_in_flight_writes
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not settings.rate_limit_enabled:
+            return await self.app(scope, receive, send)
+
+        if self.in_flight >= self.max_in_flight:
+            return await _reject(send, 503, 1, "Server busy, retry shortly")
+
+        self.in_flight += 1
+        try:
+            await self._admit(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def _admit(self, scope, receive, send):
+        limit_name = next(
+            (name for method, pattern, name in LIMITED_ROUTES
+             if scope["method"] == method and pattern.match(scope["path"])),
+            None,
+        )
+        if limit_name:
+            user_limit, ip_limit = _limits(limit_name)
+            wait = await self.limiter.acquire(f"{limit_name}:ip:{_client_ip(scope)}", *ip_limit)
+            if wait:
+                return await _reject(send, 429, wait, "Too many requests")
+
+            body, receive = await _peek_body(receive)
+            user_id = _user_id(body)
+            if user_id:
+                wait = await self.limiter.acquire(f"{limit_name}:user:{user_id}", *user_limit)
+                if wait:
+                    return await _reject(send, 429, wait, "Too many requests")
+
+        await self.app(scope, receive, send)
+
+
+async def _peek_body(receive):
+    """Read the request body up to MAX_INSPECTED_BODY bytes.
+
+    Returns the body (None if it is longer) and a receive callable that
+    replays the messages read so far, then passes the rest of the stream on.
+    """
+    messages = []
+    size = 0
+    more_body = True
+    while more_body and size <= MAX_INSPECTED_BODY:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        size += len(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    body = None
+    if not more_body and size <= MAX_INSPECTED_BODY:
+        body = b"".join(message.get("body", b"") for message in messages)
+
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return body, replay
+
+
+def _user_id(body: Optional[bytes]) -> Optional[str]:
+    if not body:
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    user_id = data.get("user_id") if isinstance(data, dict) else None
+    return user_id if isinstance(user_id, str) else None
+
+
+def _default_limiter():
+    if settings.rate_limit_redis_url:
+        return RedisTokenBucketLimiter(settings.rate_limit_redis_url)
+    return TokenBucketLimiter(settings.rate_limit_max_keys)
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+from itertools import count
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.metrics import metrics, instrument_engine
+
+# Clients that wrote within the sticky window read from the primary (read-your-writes)
+STICKY_COOKIE = "af_primary_until"
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# 0 when the standby has replayed everything it received, else seconds since the last replayed commit;
+# NULL (treated as 0) on a server that is not in recovery
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    """One read engine and its last observed health."""
+
+    def __init__(self, url: str, engine: AsyncEngine):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        self.lag: Optional[float] = None
+        self.down_until = 0.0
+
+    def available(self, max_lag: float) -> bool:
+        return time.monotonic() >= self.down_until and self.lag is not None and self.lag <= max_lag
+
+
+class ReplicaPool:
+    """Round-robin read replicas with background health and lag checks.
+
+    A replica only serves reads once a check has seen it within max_lag of the
+    primary; a failed check or connection takes it out for retry_after seconds.
+    With no replicas configured, pick() always returns None and reads stay on
+    the primary.
+    """
+
+    def __init__(self, urls: List[str], max_lag: float, retry_after: float, **engine_kwargs):
+        self.replicas = []
+        for url in urls:
+            engine = create_async_engine(url, **engine_kwargs)
+            instrument_engine(engine, report_pool=False)
+            self.replicas.append(Replica(url, engine))
+        self.max_lag = max_lag
+        self.retry_after = retry_after
+        self._next = count()
+        self._task: Optional[asyncio.Task] = None
+
+    def pick(self) -> Optional[Replica]:
+        """Next available replica in round-robin order, or None to use the primary."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._next) % len(self.replicas)]
+            if replica.available(self.max_lag):
+                return replica
+        return None
+
+    def mark_down(self, replica: Replica):
+        replica.down_until = time.monotonic() + self.retry_after
+        logger.warning("Read replica %s marked down for %.0fs", replica.name, self.retry_after)
+
+    async def check(self):
+        """Refresh every replica's replication lag; unreachable ones are marked down."""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    lag = (await conn.execute(LAG_QUERY)).scalar()
+                replica.lag = float(lag or 0)
+                if replica.lag > self.max_lag:
+                    logger.warning("Read replica %s is %.1fs behind", replica.name, replica.lag)
+            except Exception as exc:
+                replica.lag = None
+                if time.monotonic() >= replica.down_until:
+                    logger.warning("Read replica %s check failed: %s", replica.name, exc)
+                    self.mark_down(replica)
+
+    async def _run(self, interval: float):
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float):
+        """Begin periodic checks on the running event loop (no-op without replicas)."""
+        if self.replicas and self._task is None:
+            metrics.register_gauge(
+                "appfeedback_replicas_available", "Read replicas currently serving reads.",
+                lambda: sum(replica.available(self.max_lag) for replica in self.replicas),
+            )
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+def wrote_recently(cookies: dict) -> bool:
+    """Whether the client's sticky cookie still pins its reads to the primary."""
+    try:
+        return float(cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware that pins a client to the primary for a while after a successful write."""
+
+    def __init__(self, app, sticky_seconds: float):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                cookie = f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.sticky_seconds) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
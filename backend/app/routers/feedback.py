@@ -1,68 +1,95 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, case, delete
+from sqlalchemy import select, func, case, delete, literal, tuple_, union_all
 from sqlalchemy.orm import selectinload
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime, timedelta
+import base64
 
-from app.database import get_db
+from app.database import get_db, get_read_db, get_autocommit_db
+from app.tenancy import get_tenant
+from app.admin import require_admin
 from app.models.feedback import FeedbackItem, FeedbackVote, FeedbackComment
-from app.models.credits import UserCredits, CreditTransaction
 from app.schemas.feedback import (
     FeedbackItemCreate,
     FeedbackItemUpdate,
     FeedbackItemResponse,
+    FeedbackBulkStatusUpdate,
+    FeedbackBulkStatusResult,
     FeedbackVoteCreate,
     FeedbackCommentCreate,
     FeedbackCommentResponse,
+    FeedbackCommentPage,
 )
-from app.config import get_settings
+from app.services.top_ranked import top_ranked_tracker, award_top_ranked
+from app.services.vote_cache import vote_cache
+from app.services.rollups import record_activity, VOTES, COMMENTS, STATUS_TRANSITIONS
+from app.services.submissions import submit_item
+from app.services.trending import record_vote_velocity, trending_scores
+from app.services.completions import transition_status
 
 router = APIRouter(prefix="/api/feedback", tags=["feedback"])
-settings = get_settings()
 
+COMMENT_PAGE_SIZE = 50
+COMMENT_SUMMARY_SIZE = 3
+MAX_BATCH_IDS = 200
+PINNED_COMMENT_LIMIT = 5
 
-@router.post("", response_model=FeedbackItemResponse)
-async def create_feedback_item(item: FeedbackItemCreate, db: AsyncSession = Depends(get_db)):
-    """Submit a new wishlist item or bug report."""
-    db_item = FeedbackItem(
-        item_type=item.item_type,
-        title=item.title,
-        description=item.description,
-        user_id=item.user_id,
-        x_handle=item.x_handle,
-    )
-    db.add(db_item)
-    await db.commit()
-    await db.refresh(db_item)
+ITEM_FIELDS = tuple(FeedbackItemResponse.model_fields)
+# Computed per request rather than read from feedback_items
+DERIVED_FIELDS = frozenset({"comment_count", "user_voted"})
+# What a list card shows; leaves out the description and po_notes Text columns
+SUMMARY_FIELDS = ("id", "item_type", "title", "status", "vote_count", "rank_score", "credits_awarded",
+                  "created_at", "comment_count", "user_voted")
 
-    # Award credits for submission
-    await _award_credits(db, item.user_id, db_item.id, settings.credits_submission, "submission", f"Submitted: {item.title[:50]}")
 
-    # Update user stats
-    await _update_user_stats(db, item.user_id, item.x_handle, items_submitted_delta=1)
+@router.post("", response_model=FeedbackItemResponse, openapi_extra={"x-query-budget": 1})
+async def create_feedback_item(
+    item: FeedbackItemCreate,
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_autocommit_db),
+):
+    """Submit a new wishlist item or bug report."""
+    # Item, submission credit, user stats and rollups in one statement and one commit
+    row = await submit_item(db, tenant, item)
 
-    return FeedbackItemResponse(
-        **{c.name: getattr(db_item, c.name) for c in db_item.__table__.columns},
-        comment_count=0,
-        user_voted=None
-    )
+    return FeedbackItemResponse(**row, comment_count=0, user_voted=None)
 
 
-@router.get("", response_model=List[FeedbackItemResponse])
+@router.get("", response_model=List[FeedbackItemResponse], openapi_extra={"x-query-budget": 4})
 async def list_feedback_items(
-    item_type: Optional[str] = Query(None, regex="^(wishlist|bug)$"),
+    item_type: Optional[str] = Query(None, pattern="^(wishlist|bug)$"),
     status: Optional[str] = None,
-    sort_by: str = Query("rank", regex="^(rank|votes|recent)$"),
+    sort_by: str = Query("rank", pattern="^(rank|votes|recent|trending)$"),
     user_id: Optional[str] = None,
     limit: int = Query(50, le=100),
     offset: int = 0,
-    db: AsyncSession = Depends(get_db),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List feedback items with filtering and sorting."""
-    query = select(FeedbackItem)
-
+    """List feedback items with filtering and sorting.
+
+    `fields=` or `view=summary` selects only the requested columns in SQL and
+    returns just those keys. `sort_by=trending` orders by vote velocity over the
+    last hour, day and week.
+    """
+    selected = _selected_fields(fields, view)
+    if selected is None:
+        query = select(FeedbackItem)
+    else:
+        # id is always loaded to key comment counts and votes, even if not returned
+        query = select(*(
+            FeedbackItem.__table__.c[name]
+            for name in ITEM_FIELDS
+            if name == "id" or (name in selected and name not in DERIVED_FIELDS)
+        ))
+
+    query = query.where(FeedbackItem.tenant == tenant)
     if item_type:
         query = query.where(FeedbackItem.item_type == item_type)
     if status:
@@ -72,33 +99,81 @@ async def list_feedback_items(
         query = query.order_by(FeedbackItem.rank_score.desc())
     elif sort_by == "votes":
         query = query.order_by(FeedbackItem.vote_count.desc())
+    elif sort_by == "trending":
+        trending = trending_scores(tenant)
+        query = query.outerjoin(trending, trending.c.item_id == FeedbackItem.id).order_by(
+            func.coalesce(trending.c.trending_score, 0).desc(),
+            FeedbackItem.created_at.desc(),
+        )
     else:
         query = query.order_by(FeedbackItem.created_at.desc())
 
     query = query.limit(limit).offset(offset)
     result = await db.execute(query)
-    items = result.scalars().all()
+    items = result.scalars().all() if selected is None else result.all()
+    item_ids = [item.id for item in items]
 
     # Get comment counts
     comment_counts = {}
-    if items:
-        item_ids = [item.id for item in items]
-        count_query = select(
-            FeedbackComment.item_id,
-            func.count(FeedbackComment.id).label("count")
-        ).where(FeedbackComment.item_id.in_(item_ids)).group_by(FeedbackComment.item_id)
-        count_result = await db.execute(count_query)
-        comment_counts = {row.item_id: row.count for row in count_result}
+    if items and (selected is None or "comment_count" in selected):
+        comment_counts = await _comment_counts(db, tenant, item_ids)
 
     # Get user votes if user_id provided
     user_votes = {}
-    if user_id and items:
-        vote_query = select(FeedbackVote).where(
-            FeedbackVote.item_id.in_(item_ids),
-            FeedbackVote.user_id == user_id
+    if user_id and items and (selected is None or "user_voted" in selected):
+        user_votes = await _user_votes(db, tenant, user_id, item_ids)
+
+    if selected is not None:
+        derived = {"comment_count": comment_counts, "user_voted": user_votes}
+        return JSONResponse(jsonable_encoder([
+            {
+                name: derived[name].get(item.id, 0 if name == "comment_count" else None)
+                if name in DERIVED_FIELDS else getattr(item, name)
+                for name in selected
+            }
+            for item in items
+        ]))
+
+    return [
+        FeedbackItemResponse(
+            **{c.name: getattr(item, c.name) for c in item.__table__.columns},
+            comment_count=comment_counts.get(item.id, 0),
+            user_voted=user_votes.get(item.id)
         )
-        vote_result = await db.execute(vote_query)
-        user_votes = {vote.item_id: vote.vote_type for vote in vote_result.scalars()}
+        for item in items
+    ]
+
+
+@router.get("/batch", response_model=List[FeedbackItemResponse], openapi_extra={"x-query-budget": 4})
+async def get_feedback_items_batch(
+    ids: str = Query(..., description=f"Comma-separated item ids, at most {MAX_BATCH_IDS}"),
+    user_id: Optional[str] = None,
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get several items by ID in the requested order.
+
+    Comment counts and the caller's votes are fetched for the whole batch at
+    once; ids that don't exist on this board are left out.
+    """
+    try:
+        item_ids = list(dict.fromkeys(UUID(value.strip()) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated UUIDs")
+    if not item_ids or len(item_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"Pass between 1 and {MAX_BATCH_IDS} ids")
+
+    result = await db.execute(
+        select(FeedbackItem).where(FeedbackItem.tenant == tenant, FeedbackItem.id.in_(item_ids))
+    )
+    found = {item.id: item for item in result.scalars()}
+    items = [found[item_id] for item_id in item_ids if item_id in found]
+    if not items:
+        return []
+
+    found_ids = [item.id for item in items]
+    comment_counts = await _comment_counts(db, tenant, found_ids)
+    user_votes = await _user_votes(db, tenant, user_id, found_ids) if user_id else {}
 
     return [
         FeedbackItemResponse(
@@ -110,15 +185,16 @@ async def list_feedback_items(
     ]
 
 
-@router.get("/{item_id}", response_model=FeedbackItemResponse)
+@router.get("/{item_id}", response_model=FeedbackItemResponse, openapi_extra={"x-query-budget": 4})
 async def get_feedback_item(
     item_id: UUID,
     user_id: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single feedback item by ID."""
     result = await db.execute(
-        select(FeedbackItem).where(FeedbackItem.id == item_id)
+        select(FeedbackItem).where(FeedbackItem.id == item_id, FeedbackItem.tenant == tenant)
     )
     item = result.scalar_one_or_none()
     if not item:
@@ -126,22 +202,30 @@ async def get_feedback_item(
 
     # Get comment count
     count_result = await db.execute(
-        select(func.count(FeedbackComment.id)).where(FeedbackComment.item_id == item_id)
+        select(func.count(FeedbackComment.id)).where(
+            FeedbackComment.tenant == tenant,
+            FeedbackComment.item_id == item_id,
+        )
     )
     comment_count = count_result.scalar() or 0
 
     # Get user vote
     user_voted = None
     if user_id:
-        vote_result = await db.execute(
-            select(FeedbackVote).where(
-                FeedbackVote.item_id == item_id,
-                FeedbackVote.user_id == user_id
+        user_votes = await vote_cache.get(db, tenant, user_id)
+        if user_votes is not None:
+            user_voted = user_votes.get(item_id)
+        else:
+            vote_result = await db.execute(
+                select(FeedbackVote).where(
+                    FeedbackVote.tenant == tenant,
+                    FeedbackVote.item_id == item_id,
+                    FeedbackVote.user_id == user_id
+                )
             )
-        )
-        vote = vote_result.scalar_one_or_none()
-        if vote:
-            user_voted = vote.vote_type
+            vote = vote_result.scalar_one_or_none()
+            if vote:
+                user_voted = vote.vote_type
 
     return FeedbackItemResponse(
         **{c.name: getattr(item, c.name) for c in item.__table__.columns},
@@ -150,16 +234,17 @@ async def get_feedback_item(
     )
 
 
-@router.put("/{item_id}", response_model=FeedbackItemResponse)
+@router.put("/{item_id}", response_model=FeedbackItemResponse, openapi_extra={"x-query-budget": 4})
 async def update_feedback_item(
     item_id: UUID,
     update: FeedbackItemUpdate,
     user_id: str = Query(...),
+    tenant: str = Depends(get_tenant),
     db: AsyncSession = Depends(get_db),
 ):
     """Update a feedback item (owner or admin only)."""
     result = await db.execute(
-        select(FeedbackItem).where(FeedbackItem.id == item_id)
+        select(FeedbackItem).where(FeedbackItem.id == item_id, FeedbackItem.tenant == tenant)
     )
     item = result.scalar_one_or_none()
     if not item:
@@ -170,6 +255,8 @@ async def update_feedback_item(
         raise HTTPException(status_code=403, detail="Not authorized")
 
     update_data = update.model_dump(exclude_unset=True)
+    if update_data.get("status") and update_data["status"] != item.status:
+        record_activity(db, tenant, STATUS_TRANSITIONS, update_data["status"])
     for key, value in update_data.items():
         setattr(item, key, value)
 
@@ -183,15 +270,43 @@ async def update_feedback_item(
     )
 
 
-@router.delete("/{item_id}")
+@router.post(
+    "/bulk/status",
+    response_model=FeedbackBulkStatusResult,
+    dependencies=[Depends(require_admin)],
+    openapi_extra={"x-query-budget": 3},
+)
+async def bulk_update_status(
+    update: FeedbackBulkStatusUpdate,
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_db),
+):
+    """Move many items to a status at once (admin only).
+
+    Completing items credits their owners (developed for wishlist items,
+    bug_verified for bugs) once per item, so replaying a release is a no-op.
+    """
+    item_ids = list(dict.fromkeys(update.item_ids))
+    result = await transition_status(db, tenant, item_ids, update.status)
+    await db.commit()
+    return {
+        "status": update.status,
+        "requested": len(item_ids),
+        "changed": len(result["changed"]),
+        "awards": result["awards"],
+    }
+
+
+@router.delete("/{item_id}", openapi_extra={"x-query-budget": 2})
 async def delete_feedback_item(
     item_id: UUID,
     user_id: str = Query(...),
+    tenant: str = Depends(get_tenant),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a feedback item (owner only)."""
     result = await db.execute(
-        select(FeedbackItem).where(FeedbackItem.id == item_id)
+        select(FeedbackItem).where(FeedbackItem.id == item_id, FeedbackItem.tenant == tenant)
     )
     item = result.scalar_one_or_none()
     if not item:
@@ -202,20 +317,22 @@ async def delete_feedback_item(
 
     await db.execute(delete(FeedbackItem).where(FeedbackItem.id == item_id))
     await db.commit()
+    top_ranked_tracker.invalidate(tenant, item.item_type)
 
     return {"message": "Item deleted"}
 
 
-@router.post("/{item_id}/vote")
+@router.post("/{item_id}/vote", openapi_extra={"x-query-budget": 11})
 async def vote_on_item(
     item_id: UUID,
     vote: FeedbackVoteCreate,
+    tenant: str = Depends(get_tenant),
     db: AsyncSession = Depends(get_db),
 ):
     """Vote on a feedback item (toggle vote if already voted)."""
     # Check item exists
     item_result = await db.execute(
-        select(FeedbackItem).where(FeedbackItem.id == item_id)
+        select(FeedbackItem).where(FeedbackItem.id == item_id, FeedbackItem.tenant == tenant)
     )
     item = item_result.scalar_one_or_none()
     if not item:
@@ -224,6 +341,7 @@ async def vote_on_item(
     # Check existing vote
     existing_vote_result = await db.execute(
         select(FeedbackVote).where(
+            FeedbackVote.tenant == tenant,
             FeedbackVote.item_id == item_id,
             FeedbackVote.user_id == vote.user_id
         )
@@ -237,56 +355,129 @@ async def vote_on_item(
                 delete(FeedbackVote).where(FeedbackVote.id == existing_vote.id)
             )
             vote_delta = -1 if vote.vote_type == "up" else 1
+            user_voted = None
         else:
             # Change vote direction
             existing_vote.vote_type = vote.vote_type
             vote_delta = 2 if vote.vote_type == "up" else -2
+            user_voted = vote.vote_type
     else:
         # New vote
         new_vote = FeedbackVote(
+            tenant=tenant,
             item_id=item_id,
             user_id=vote.user_id,
             vote_type=vote.vote_type
         )
         db.add(new_vote)
         vote_delta = 1 if vote.vote_type == "up" else -1
+        user_voted = vote.vote_type
 
     item.vote_count += vote_delta
     await _recalculate_rank_score(item)
-    await db.commit()
+    record_activity(db, tenant, VOTES, user_voted or "removed")
+    record_vote_velocity(db, tenant, item_id, vote_delta, existing_vote.created_at if existing_vote else None)
+
+    # Award the top-ranked bonus if this vote moved something into the top set
+    entered = await top_ranked_tracker.observe(db, item)
+    await award_top_ranked(db, entered)
+    try:
+        await db.commit()
+    except Exception:
+        top_ranked_tracker.invalidate(tenant, item.item_type)
+        raise
 
-    return {"vote_count": item.vote_count, "user_voted": vote.vote_type if not existing_vote or existing_vote.vote_type != vote.vote_type else None}
+    vote_cache.record_vote(tenant, vote.user_id, item_id, user_voted)
 
+    return {"vote_count": item.vote_count, "user_voted": user_voted}
 
-@router.get("/{item_id}/comments", response_model=List[FeedbackCommentResponse])
+
+@router.get("/{item_id}/comments", response_model=FeedbackCommentPage, openapi_extra={"x-query-budget": 1})
 async def get_comments(
     item_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    view: str = Query("thread", pattern="^(thread|summary)$"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get all comments for a feedback item."""
+    """Get a page of comments for a feedback item, oldest first."""
+    if view == "summary":
+        # Latest N plus the thread total, for list cards
+        total = (
+            select(func.count(FeedbackComment.id))
+            .where(FeedbackComment.item_id == item_id, FeedbackComment.tenant == tenant)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(FeedbackComment, total.label("total"))
+            .where(FeedbackComment.item_id == item_id, FeedbackComment.tenant == tenant)
+            .order_by(FeedbackComment.created_at.desc(), FeedbackComment.id.desc())
+            .limit(limit or COMMENT_SUMMARY_SIZE)
+        )
+        rows = result.all()
+        return FeedbackCommentPage(
+            items=[row.FeedbackComment for row in reversed(rows)],
+            total=rows[0].total if rows else 0,
+        )
+
+    limit = limit or COMMENT_PAGE_SIZE
+    columns = FeedbackComment.__table__.c
+    page = select(columns, literal(False).label("pinned")).where(columns.item_id == item_id, columns.tenant == tenant)
+    if cursor:
+        page = page.where(tuple_(columns.created_at, columns.id) > _decode_cursor(cursor))
+    page = page.order_by(columns.created_at, columns.id).limit(limit + 1)
+    rows = page.subquery()
+
+    if not cursor:
+        # Product-owner comments come from a partial index in the same round trip
+        pinned = (
+            select(columns, literal(True).label("pinned"))
+            .where(columns.item_id == item_id, columns.tenant == tenant, columns.is_product_owner)
+            .order_by(columns.created_at.desc())
+            .limit(PINNED_COMMENT_LIMIT)
+        )
+        rows = union_all(select(rows), select(pinned.subquery())).subquery()
+
+    # A union (or subquery) has no row order of its own: pinned newest first, then the page oldest first
     result = await db.execute(
-        select(FeedbackComment)
-        .where(FeedbackComment.item_id == item_id)
-        .order_by(FeedbackComment.created_at.asc())
+        select(rows).order_by(
+            rows.c.pinned.desc(),
+            case((rows.c.pinned, rows.c.created_at)).desc(),
+            rows.c.created_at,
+            rows.c.id,
+        )
     )
-    return result.scalars().all()
+    items, pinned_items = [], []
+    for row in result.mappings():
+        comment = FeedbackCommentResponse.model_validate(row)
+        (pinned_items if row["pinned"] else items).append(comment)
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode_cursor(items[-1].created_at, items[-1].id)
+
+    return FeedbackCommentPage(items=items, pinned=pinned_items, next_cursor=next_cursor)
 
 
-@router.post("/{item_id}/comments", response_model=FeedbackCommentResponse)
+@router.post("/{item_id}/comments", response_model=FeedbackCommentResponse, openapi_extra={"x-query-budget": 4})
 async def add_comment(
     item_id: UUID,
     comment: FeedbackCommentCreate,
+    tenant: str = Depends(get_tenant),
     db: AsyncSession = Depends(get_db),
 ):
     """Add a comment to a feedback item."""
     # Check item exists
     item_result = await db.execute(
-        select(FeedbackItem).where(FeedbackItem.id == item_id)
+        select(FeedbackItem).where(FeedbackItem.id == item_id, FeedbackItem.tenant == tenant)
     )
     if not item_result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Item not found")
 
     db_comment = FeedbackComment(
+        tenant=tenant,
         item_id=item_id,
         user_id=comment.user_id,
         x_handle=comment.x_handle,
@@ -294,72 +485,65 @@ async def add_comment(
         is_product_owner=comment.is_product_owner
     )
     db.add(db_comment)
+    record_activity(db, tenant, COMMENTS, "product_owner" if comment.is_product_owner else "user")
     await db.commit()
     await db.refresh(db_comment)
 
     return db_comment
 
 
-async def _award_credits(
-    db: AsyncSession,
-    user_id: str,
-    item_id: UUID,
-    amount: int,
-    transaction_type: str,
-    description: str
-):
-    """Award credits to a user."""
-    transaction = CreditTransaction(
-        user_id=user_id,
-        item_id=item_id,
-        amount=amount,
-        transaction_type=transaction_type,
-        description=description
-    )
-    db.add(transaction)
-
-    # Update user balance
-    user_result = await db.execute(
-        select(UserCredits).where(UserCredits.user_id == user_id)
-    )
-    user_credits = user_result.scalar_one_or_none()
-    if user_credits:
-        user_credits.credits_balance += amount
-        user_credits.credits_earned_total += amount
-    else:
-        user_credits = UserCredits(
-            user_id=user_id,
-            credits_balance=amount,
-            credits_earned_total=amount
-        )
-        db.add(user_credits)
-
-
-async def _update_user_stats(
-    db: AsyncSession,
-    user_id: str,
-    x_handle: Optional[str],
-    items_submitted_delta: int = 0,
-    items_developed_delta: int = 0
-):
-    """Update user statistics."""
-    user_result = await db.execute(
-        select(UserCredits).where(UserCredits.user_id == user_id)
+async def _comment_counts(db: AsyncSession, tenant: str, item_ids: List[UUID]) -> dict:
+    """Comment count per item id, in one grouped query."""
+    result = await db.execute(
+        select(FeedbackComment.item_id, func.count(FeedbackComment.id).label("count"))
+        .where(FeedbackComment.tenant == tenant, FeedbackComment.item_id.in_(item_ids))
+        .group_by(FeedbackComment.item_id)
     )
-    user_credits = user_result.scalar_one_or_none()
-    if user_credits:
-        user_credits.items_submitted += items_submitted_delta
-        user_credits.items_developed += items_developed_delta
-        if x_handle:
-            user_credits.x_handle = x_handle
-    else:
-        user_credits = UserCredits(
-            user_id=user_id,
-            x_handle=x_handle,
-            items_submitted=items_submitted_delta,
-            items_developed=items_developed_delta
+    return {row.item_id: row.count for row in result}
+
+
+async def _user_votes(db: AsyncSession, tenant: str, user_id: str, item_ids: List[UUID]) -> dict:
+    """The user's vote per item id, from the vote cache or one query for just these items."""
+    user_votes = await vote_cache.get(db, tenant, user_id)
+    if user_votes is None:
+        # Too many votes to cache; look up just these items
+        result = await db.execute(
+            select(FeedbackVote.item_id, FeedbackVote.vote_type).where(
+                FeedbackVote.tenant == tenant,
+                FeedbackVote.item_id.in_(item_ids),
+                FeedbackVote.user_id == user_id,
+            )
         )
-        db.add(user_credits)
+        user_votes = {row.item_id: row.vote_type for row in result}
+    return user_votes
+
+
+def _selected_fields(fields: Optional[str], view: str) -> Optional[tuple]:
+    """Resolve `fields`/`view` to response field names in schema order, or None for every field."""
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested.difference(ITEM_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(name for name in ITEM_FIELDS if name in requested)
+    if view == "summary":
+        return SUMMARY_FIELDS
+    return None
+
+
+def _encode_cursor(created_at: datetime, comment_id: UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{comment_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        created_at, comment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(comment_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 async def _recalculate_rank_score(item: FeedbackItem):
@@ -1,26 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.tenancy import get_tenant
+from app.admin import require_admin
 from app.models.feedback import FeedbackItem
 from app.models.algorithm import RankingAlgorithm
+from app.models.rank_history import RankSnapshot
 from app.schemas.feedback import FeedbackItemResponse
-from app.schemas.ranking import RankingAlgorithmResponse
+from app.schemas.ranking import (
+    RankingAlgorithmResponse, ShadowRankingReport, RankPositionSeries, RankMover, RankSnapshotResponse,
+)
+from app.services.top_ranked import top_ranked_tracker, award_top_ranked
+from app.services.shadow_ranking import resolve_candidate_weights, shadow_rank
+from app.services.trending import prune_vote_buckets
+from app.services.rank_history import record_rank_snapshot, position_series, top_movers
 
 router = APIRouter(prefix="/api/ranking", tags=["ranking"])
 
 
-@router.get("/results", response_model=List[FeedbackItemResponse])
+@router.get("/results", response_model=List[FeedbackItemResponse], openapi_extra={"x-query-budget": 1})
 async def get_ranked_results(
     item_type: str = None,
     limit: int = 20,
-    db: AsyncSession = Depends(get_db),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get items ranked by the current algorithm."""
-    query = select(FeedbackItem).order_by(FeedbackItem.rank_score.desc())
+    query = select(FeedbackItem).where(FeedbackItem.tenant == tenant).order_by(FeedbackItem.rank_score.desc())
 
     if item_type:
         query = query.where(FeedbackItem.item_type == item_type)
@@ -39,10 +50,10 @@ async def get_ranked_results(
     ]
 
 
-@router.post("/run")
-async def run_ranking(db: AsyncSession = Depends(get_db)):
-    """Trigger a re-ranking of all items."""
-    result = await db.execute(select(FeedbackItem))
+@router.post("/run", openapi_extra={"x-query-budget": 13})
+async def run_ranking(tenant: str = Depends(get_tenant), db: AsyncSession = Depends(get_db)):
+    """Trigger a re-ranking of all items on a board."""
+    result = await db.execute(select(FeedbackItem).where(FeedbackItem.tenant == tenant))
     items = result.scalars().all()
 
     for item in items:
@@ -60,13 +71,65 @@ async def run_ranking(db: AsyncSession = Depends(get_db)):
 
         item.rank_score = vote_score + (recency_factor * 0.5) + ai_score
 
+    snapshot_id, positions_changed = await record_rank_snapshot(db, tenant, items)
+    await db.flush()
+    entered = await top_ranked_tracker.refresh(db, tenant)
+    awarded = await award_top_ranked(db, entered)
+    # Periodic re-ranking doubles as housekeeping for the trending buckets
+    await prune_vote_buckets(db)
     await db.commit()
 
-    return {"message": f"Re-ranked {len(items)} items", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "message": f"Re-ranked {len(items)} items",
+        "top_ranked_awarded": awarded,
+        "rank_snapshot": snapshot_id,
+        "positions_changed": positions_changed,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/history/{item_id}", response_model=RankPositionSeries, openapi_extra={"x-query-budget": 1})
+async def get_rank_history(
+    item_id: UUID,
+    since: Optional[datetime] = None,
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get an item's board position at each re-rank where it moved (positions hold between points)."""
+    points = await position_series(db, tenant, item_id, since)
+    return {"item_id": item_id, "points": [{"taken_at": taken_at, "position": position} for taken_at, position in points]}
+
+
+@router.get("/movers", response_model=List[RankMover], openapi_extra={"x-query-budget": 1})
+async def get_rank_movers(
+    since: datetime,
+    item_type: Optional[str] = Query(None, pattern="^(wishlist|bug)$"),
+    limit: int = Query(20, ge=1, le=100),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get the items that climbed or fell the most since a time, as of the latest re-rank."""
+    return await top_movers(db, tenant, since, item_type, limit)
+
+
+@router.get("/snapshots", response_model=List[RankSnapshotResponse], openapi_extra={"x-query-budget": 1})
+async def get_rank_snapshots(
+    limit: int = Query(20, ge=1, le=100),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get recent re-rank snapshots with how many positions each one wrote."""
+    result = await db.execute(
+        select(RankSnapshot)
+        .where(RankSnapshot.tenant == tenant)
+        .order_by(RankSnapshot.taken_at.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
 
 
-@router.get("/algorithm", response_model=RankingAlgorithmResponse)
-async def get_current_algorithm(db: AsyncSession = Depends(get_db)):
+@router.get("/algorithm", response_model=RankingAlgorithmResponse, openapi_extra={"x-query-budget": 1})
+async def get_current_algorithm(db: AsyncSession = Depends(get_read_db)):
     """Get the current active ranking algorithm (open source)."""
     result = await db.execute(
         select(RankingAlgorithm).where(RankingAlgorithm.is_active == True)
@@ -77,10 +140,10 @@ async def get_current_algorithm(db: AsyncSession = Depends(get_db)):
     return algorithm
 
 
-@router.get("/algorithm/history", response_model=List[RankingAlgorithmResponse])
+@router.get("/algorithm/history", response_model=List[RankingAlgorithmResponse], openapi_extra={"x-query-budget": 1})
 async def get_algorithm_history(
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get history of ranking algorithms."""
     result = await db.execute(
@@ -89,3 +152,38 @@ async def get_algorithm_history(
         .limit(limit)
     )
     return result.scalars().all()
+
+
+@router.get(
+    "/shadow",
+    response_model=ShadowRankingReport,
+    dependencies=[Depends(require_admin)],
+    openapi_extra={"x-query-budget": 4},
+)
+async def get_shadow_ranking(
+    algorithm_id: Optional[UUID] = None,
+    version: Optional[str] = None,
+    item_type: Optional[str] = Query(None, pattern="^(wishlist|bug)$"),
+    weight_votes: Optional[float] = None,
+    weight_recency: Optional[float] = None,
+    weight_feasibility: Optional[float] = None,
+    weight_impact: Optional[float] = None,
+    weight_clarity: Optional[float] = None,
+    movers: int = Query(20, ge=0, le=100),
+    tenant: str = Depends(get_tenant),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Preview how a stored or proposed algorithm would reorder the board (read-only, admin only).
+
+    Scores the whole board on every call, so it is kept behind the admin token.
+    """
+    weights = await resolve_candidate_weights(db, algorithm_id, version, {
+        "weight_votes": weight_votes,
+        "weight_recency": weight_recency,
+        "weight_feasibility": weight_feasibility,
+        "weight_impact": weight_impact,
+        "weight_clarity": weight_clarity,
+    })
+    if weights is None:
+        raise HTTPException(status_code=404, detail="Algorithm not found")
+    return await shadow_rank(db, weights, tenant, item_type, movers)
@@ -5,9 +5,10 @@ from app.schemas.feedback import (
     FeedbackVoteCreate,
     FeedbackCommentCreate,
     FeedbackCommentResponse,
+    FeedbackCommentPage,
 )
 from app.schemas.credits import UserCreditsResponse, CreditTransactionResponse
-from app.schemas.ranking import RankingAlgorithmResponse
+from app.schemas.ranking import RankingAlgorithmResponse, ShadowRankingReport
 
 __all__ = [
     "FeedbackItemCreate",
@@ -16,7 +17,9 @@ __all__ = [
     "FeedbackVoteCreate",
     "FeedbackCommentCreate",
     "FeedbackCommentResponse",
+    "FeedbackCommentPage",
     "UserCreditsResponse",
     "CreditTransactionResponse",
     "RankingAlgorithmResponse",
+    "ShadowRankingReport",
 ]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Optional, Literal, List, Dict
 from datetime import datetime
 from uuid import UUID
 
@@ -19,6 +19,23 @@ class FeedbackItemUpdate(BaseModel):
     po_notes: Optional[str] = None
 
 
+class FeedbackBulkStatusUpdate(BaseModel):
+    item_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    status: Literal["new", "under_review", "planned", "in_progress", "completed", "wont_do"]
+
+
+class CompletionAward(BaseModel):
+    items: int
+    credits: int
+
+
+class FeedbackBulkStatusResult(BaseModel):
+    status: str
+    requested: int
+    changed: int
+    awards: Dict[str, CompletionAward]
+
+
 class FeedbackItemResponse(BaseModel):
     id: UUID
     item_type: str
@@ -66,3 +83,10 @@ class FeedbackCommentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class FeedbackCommentPage(BaseModel):
+    items: List[FeedbackCommentResponse]
+    pinned: List[FeedbackCommentResponse] = []
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List, Dict
 from datetime import datetime
 from uuid import UUID
 
@@ -19,3 +19,51 @@ class RankingAlgorithmResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ShadowRankingMover(BaseModel):
+    item_id: UUID
+    title: Optional[str]
+    active_position: int
+    candidate_position: int
+    change: int
+
+
+class ShadowRankingReport(BaseModel):
+    active_version: Optional[str]
+    candidate_weights: Dict[str, float]
+    item_type: Optional[str]
+    tenant: str
+    items: int
+    kendall_tau: float
+    top_k_overlap: Dict[str, float]
+    movers: List[ShadowRankingMover]
+
+
+class RankPositionPoint(BaseModel):
+    taken_at: datetime
+    position: int
+
+
+class RankPositionSeries(BaseModel):
+    item_id: UUID
+    points: List[RankPositionPoint]
+
+
+class RankMover(BaseModel):
+    item_id: UUID
+    title: Optional[str]
+    item_type: str
+    previous_position: int
+    position: int
+    change: int
+
+
+class RankSnapshotResponse(BaseModel):
+    id: int
+    taken_at: datetime
+    items: int
+    changed: int
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,11 @@
+from app.services.top_ranked import TopRankedTracker, top_ranked_tracker, award_top_ranked
+from app.services.vote_cache import UserVoteCache, vote_cache
+from app.services.rollups import record_activity, timeseries
+from app.services.ledger import reconcile_chunk
+from app.services.submissions import submit_item
+from app.services.vote_drift import repair_vote_chunk
+from app.services.completions import transition_status
+
+__all__ = ["TopRankedTracker", "top_ranked_tracker", "award_top_ranked", "UserVoteCache", "vote_cache",
+           "record_activity", "timeseries", "reconcile_chunk", "submit_item",
+           "repair_vote_chunk", "transition_status"]
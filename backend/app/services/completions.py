@@ -0,0 +1,124 @@
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import select, update, literal, func, case, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.feedback import FeedbackItem
+from app.models.credits import UserCredits, CreditTransaction
+from app.services.rollups import record_activity, CREDITS_AWARDED, STATUS_TRANSITIONS
+from app.config import get_settings
+
+settings = get_settings()
+
+# Shipping a wishlist item pays the developed bonus; fixing a bug pays the bug_verified one
+COMPLETED = "completed"
+AWARD_TYPES = {"wishlist": "developed", "bug": "bug_verified"}
+# Predicate of the partial unique index that makes completion awards once per item
+AWARDED_ONCE = "transaction_type IN ('developed', 'bug_verified')"
+
+
+def completion_awards_statement(tenant: str, item_ids: List[UUID]):
+    """One statement crediting the owners of completed items that have not been credited yet.
+
+    The ledger insert reads the items, skips ones already awarded via the
+    partial unique index on credit_transactions(item_id) for developed and
+    bug_verified rows, and RETURNs what it wrote. Sibling CTEs add the new
+    awards to credits_awarded and upsert each owner's balance once, summed
+    per user; items_developed counts only developed (wishlist) awards.
+    Returns (transaction_type, items, credits) per award type.
+    """
+    amount = case(
+        (FeedbackItem.item_type == "wishlist", settings.credits_developed),
+        else_=settings.credits_bug_verified,
+    )
+    awarded = (
+        pg_insert(CreditTransaction)
+        .from_select(
+            ["id", "tenant", "user_id", "item_id", "amount", "transaction_type", "description"],
+            select(
+                func.gen_random_uuid(),
+                FeedbackItem.tenant,
+                FeedbackItem.user_id,
+                FeedbackItem.id,
+                amount,
+                case((FeedbackItem.item_type == "wishlist", AWARD_TYPES["wishlist"]), else_=AWARD_TYPES["bug"]),
+                literal("Completed: ") + func.left(FeedbackItem.title, 50),
+            ).where(
+                FeedbackItem.tenant == tenant,
+                FeedbackItem.id.in_(item_ids),
+                FeedbackItem.status == COMPLETED,
+            ),
+        )
+        .on_conflict_do_nothing(
+            index_elements=[CreditTransaction.item_id],
+            index_where=text(AWARDED_ONCE),
+        )
+        .returning(CreditTransaction.user_id, CreditTransaction.item_id, CreditTransaction.amount,
+                   CreditTransaction.transaction_type)
+        .cte("awarded")
+    )
+
+    items = (
+        update(FeedbackItem)
+        .where(FeedbackItem.id == awarded.c.item_id)
+        .values(credits_awarded=FeedbackItem.credits_awarded + awarded.c.amount)
+        .cte("awarded_items")
+    )
+
+    credits = pg_insert(UserCredits).from_select(
+        ["id", "tenant", "user_id", "credits_balance", "credits_earned_total", "items_developed"],
+        select(
+            func.gen_random_uuid(),
+            literal(tenant),
+            awarded.c.user_id,
+            func.sum(awarded.c.amount),
+            func.sum(awarded.c.amount),
+            func.count().filter(awarded.c.transaction_type == AWARD_TYPES["wishlist"]),
+        ).group_by(awarded.c.user_id),
+    )
+    credits = credits.on_conflict_do_update(
+        index_elements=[UserCredits.tenant, UserCredits.user_id],
+        set_={
+            "credits_balance": UserCredits.credits_balance + credits.excluded.credits_balance,
+            "credits_earned_total": UserCredits.credits_earned_total + credits.excluded.credits_earned_total,
+            "items_developed": UserCredits.items_developed + credits.excluded.items_developed,
+        },
+    ).cte("awarded_credits")
+
+    return (
+        select(awarded.c.transaction_type, func.count().label("items"), func.sum(awarded.c.amount).label("credits"))
+        .group_by(awarded.c.transaction_type)
+        .add_cte(items, credits)
+    )
+
+
+async def transition_status(db: AsyncSession, tenant: str, item_ids: List[UUID], status: str) -> Dict:
+    """Move items to status in one UPDATE and, for completed, award their owners once.
+
+    Replays are harmless: items already in the status are not rewritten and
+    items already credited are skipped by the ledger's unique index, so a
+    retried request changes and awards nothing. The caller commits.
+    """
+    result = await db.execute(
+        update(FeedbackItem)
+        .where(
+            FeedbackItem.tenant == tenant,
+            FeedbackItem.id.in_(item_ids),
+            FeedbackItem.status.is_distinct_from(status),
+        )
+        .values(status=status, updated_at=func.now())
+        .returning(FeedbackItem.id)
+        .execution_options(synchronize_session=False)
+    )
+    changed = [row.id for row in result]
+    if changed:
+        record_activity(db, tenant, STATUS_TRANSITIONS, status, len(changed))
+
+    awards = {}
+    if status == COMPLETED:
+        for row in await db.execute(completion_awards_statement(tenant, item_ids)):
+            awards[row.transaction_type] = {"items": row.items, "credits": row.credits}
+            record_activity(db, tenant, CREDITS_AWARDED, row.transaction_type, row.credits)
+    return {"changed": changed, "awards": awards}
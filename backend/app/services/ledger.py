@@ -0,0 +1,113 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, update, func, case, and_, bindparam, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.credits import UserCredits, CreditTransaction
+
+RECONCILE_CHUNK_SIZE = 1_000
+
+
+@dataclass
+class LedgerDrift:
+    """A user whose denormalized totals disagree with their transactions."""
+
+    tenant: str
+    user_id: str
+    credits_balance: int
+    expected_balance: int
+    credits_earned_total: int
+    expected_earned_total: int
+
+
+@dataclass
+class ChunkResult:
+    checked: int
+    last_key: Optional[Tuple[str, str]]
+    drifts: List[LedgerDrift] = field(default_factory=list)
+    repaired: int = 0
+
+
+async def reconcile_chunk(db: AsyncSession, after: Optional[Tuple[str, str]] = None,
+                          chunk_size: int = RECONCILE_CHUNK_SIZE, repair: bool = False) -> ChunkResult:
+    """Compare the next (tenant, user_id) keyset chunk with its ledger sums in one grouped query.
+
+    Repairs are guarded by the values that were read, so a balance that moved
+    concurrently is skipped and picked up by the next run instead of overwritten.
+    The caller commits after each chunk to keep row locks short.
+    """
+    users = select(
+        UserCredits.tenant,
+        UserCredits.user_id,
+        UserCredits.credits_balance,
+        UserCredits.credits_earned_total,
+    ).order_by(UserCredits.tenant, UserCredits.user_id).limit(chunk_size)
+    if after is not None:
+        users = users.where(tuple_(UserCredits.tenant, UserCredits.user_id) > tuple_(*after))
+    users = users.subquery()
+
+    result = await db.execute(
+        select(
+            users.c.tenant,
+            users.c.user_id,
+            users.c.credits_balance,
+            users.c.credits_earned_total,
+            func.coalesce(func.sum(CreditTransaction.amount), 0).label("expected_balance"),
+            func.coalesce(
+                func.sum(case((CreditTransaction.amount > 0, CreditTransaction.amount), else_=0)), 0
+            ).label("expected_earned_total"),
+        )
+        .select_from(users)
+        .outerjoin(CreditTransaction, and_(
+            CreditTransaction.tenant == users.c.tenant,
+            CreditTransaction.user_id == users.c.user_id,
+        ))
+        .group_by(users.c.tenant, users.c.user_id, users.c.credits_balance, users.c.credits_earned_total)
+        .order_by(users.c.tenant, users.c.user_id)
+    )
+    rows = result.all()
+
+    chunk = ChunkResult(checked=len(rows), last_key=(rows[-1].tenant, rows[-1].user_id) if rows else None)
+    for row in rows:
+        balance = row.credits_balance or 0
+        earned = row.credits_earned_total or 0
+        if balance != row.expected_balance or earned != row.expected_earned_total:
+            chunk.drifts.append(LedgerDrift(
+                tenant=row.tenant,
+                user_id=row.user_id,
+                credits_balance=balance,
+                expected_balance=int(row.expected_balance),
+                credits_earned_total=earned,
+                expected_earned_total=int(row.expected_earned_total),
+            ))
+
+    if repair and chunk.drifts:
+        table = UserCredits.__table__
+        statement = (
+            update(table)
+            .where(and_(
+                table.c.tenant == bindparam("b_tenant"),
+                table.c.user_id == bindparam("b_user_id"),
+                func.coalesce(table.c.credits_balance, 0) == bindparam("b_balance"),
+                func.coalesce(table.c.credits_earned_total, 0) == bindparam("b_earned"),
+            ))
+            .values(
+                credits_balance=bindparam("b_expected_balance"),
+                credits_earned_total=bindparam("b_expected_earned"),
+            )
+        )
+        repair_result = await db.execute(statement, [
+            {
+                "b_tenant": drift.tenant,
+                "b_user_id": drift.user_id,
+                "b_balance": drift.credits_balance,
+                "b_earned": drift.credits_earned_total,
+                "b_expected_balance": drift.expected_balance,
+                "b_expected_earned": drift.expected_earned_total,
+            }
+            for drift in chunk.drifts
+        ])
+        chunk.repaired = repair_result.rowcount if repair_result.rowcount >= 0 else len(chunk.drifts)
+
+    return chunk
@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select, insert, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.feedback import FeedbackItem
+from app.models.rank_history import RankSnapshot, RankChange
+
+
+def board_positions(items: Sequence[FeedbackItem]) -> Dict[UUID, int]:
+    """Position of each item on its item_type board (1 = top), ties broken by id like top_ranked."""
+    positions = {}
+    for item_type in {item.item_type for item in items}:
+        board = sorted((item for item in items if item.item_type == item_type),
+                       key=lambda item: (-(item.rank_score or 0), item.id))
+        positions.update((item.id, position) for position, item in enumerate(board, 1))
+    return positions
+
+
+async def record_rank_snapshot(db: AsyncSession, tenant: str, items: Sequence[FeedbackItem]) -> tuple:
+    """Record a snapshot after a re-rank, writing positions only for items that moved.
+
+    Each item's current position lives on feedback_items.rank_position, so the
+    previous snapshot never has to be read back. Returns (snapshot id, positions
+    written); costs two statements plus the rank_position updates.
+    """
+    positions = board_positions(items)
+    moved = [item for item in items if item.rank_position != positions[item.id]]
+    for item in moved:
+        item.rank_position = positions[item.id]
+
+    result = await db.execute(
+        insert(RankSnapshot).values(tenant=tenant, items=len(items), changed=len(moved)).returning(RankSnapshot.id)
+    )
+    snapshot_id = result.scalar_one()
+    if moved:
+        await db.execute(insert(RankChange), [
+            {"item_id": item.id, "snapshot_id": snapshot_id, "position": item.rank_position} for item in moved
+        ])
+    return snapshot_id, len(moved)
+
+
+async def position_series(db: AsyncSession, tenant: str, item_id: UUID,
+                          since: Optional[datetime] = None) -> List[tuple]:
+    """(taken_at, position) at each snapshot where the item moved, oldest first.
+
+    A position holds until the next point, so charts should draw steps.
+    """
+    query = (
+        select(RankSnapshot.taken_at, RankChange.position)
+        .join(RankSnapshot, RankSnapshot.id == RankChange.snapshot_id)
+        .where(RankChange.item_id == item_id, RankSnapshot.tenant == tenant)
+        .order_by(RankChange.snapshot_id)
+    )
+    if since is not None:
+        # Carry in the position the item already held at since
+        held = (
+            select(func.max(RankChange.snapshot_id))
+            .join(RankSnapshot, RankSnapshot.id == RankChange.snapshot_id)
+            .where(RankChange.item_id == item_id, RankSnapshot.taken_at <= since)
+            .scalar_subquery()
+        )
+        query = query.where((RankSnapshot.taken_at > since) | (RankChange.snapshot_id == held))
+    result = await db.execute(query)
+    return [(row.taken_at, row.position) for row in result]
+
+
+async def top_movers(db: AsyncSession, tenant: str, since: datetime,
+                     item_type: Optional[str] = None, limit: int = 20) -> List[dict]:
+    """Items whose position changed the most between since and the latest snapshot.
+
+    Only items that moved after since are looked at: their current position is
+    on feedback_items and their position at since is their last change at or
+    before it. Items first ranked after since have no previous position and are
+    left out.
+    """
+    base = (
+        select(func.max(RankSnapshot.id))
+        .where(RankSnapshot.tenant == tenant, RankSnapshot.taken_at <= since)
+        .scalar_subquery()
+    )
+    moved_ids = select(RankChange.item_id).where(
+        RankChange.snapshot_id.in_(
+            select(RankSnapshot.id).where(RankSnapshot.tenant == tenant, RankSnapshot.taken_at > since)
+        )
+    )
+    last_change = (
+        select(RankChange.item_id, func.max(RankChange.snapshot_id).label("snapshot_id"))
+        .where(RankChange.item_id.in_(moved_ids), RankChange.snapshot_id <= base)
+        .group_by(RankChange.item_id)
+        .subquery()
+    )
+    query = (
+        select(FeedbackItem.id, FeedbackItem.title, FeedbackItem.item_type, FeedbackItem.rank_position,
+               RankChange.position.label("previous_position"))
+        .join(last_change, last_change.c.item_id == FeedbackItem.id)
+        .join(RankChange, and_(RankChange.item_id == last_change.c.item_id,
+                               RankChange.snapshot_id == last_change.c.snapshot_id))
+        .where(FeedbackItem.tenant == tenant)
+    )
+    if item_type:
+        query = query.where(FeedbackItem.item_type == item_type)
+
+    movers = [
+        {
+            "item_id": row.id,
+            "title": row.title,
+            "item_type": row.item_type,
+            "previous_position": row.previous_position,
+            "position": row.rank_position,
+            "change": row.previous_position - row.rank_position,
+        }
+        for row in await db.execute(query)
+        if row.previous_position != row.rank_position
+    ]
+    movers.sort(key=lambda mover: (-abs(mover["change"]), mover["position"]))
+    return movers[:limit]
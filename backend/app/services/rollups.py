@@ -0,0 +1,110 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.rollups import DailyRollup
+
+SUBMISSIONS = "submissions"
+VOTES = "votes"
+COMMENTS = "comments"
+CREDITS_AWARDED = "credits_awarded"
+STATUS_TRANSITIONS = "status_transitions"
+METRICS = (SUBMISSIONS, VOTES, COMMENTS, CREDITS_AWARDED, STATUS_TRANSITIONS)
+# Dimensions each metric is recorded with; every bucket lists them all, 0 when nothing happened
+DIMENSIONS = {
+    SUBMISSIONS: ("wishlist", "bug"),
+    VOTES: ("up", "down", "removed"),
+    COMMENTS: ("user", "product_owner"),
+    CREDITS_AWARDED: ("submission", "top_ranked", "developed", "bug_verified"),
+    STATUS_TRANSITIONS: ("new", "under_review", "planned", "in_progress", "completed", "wont_do"),
+}
+
+MAX_RANGE_DAYS = 366 * 5
+PENDING_KEY = "pending_rollups"
+
+
+def record_activity(db: AsyncSession, tenant: str, metric: str, dimension: str = "", amount: int = 1):
+    """Queue a rollup increment; it is written in the same transaction on commit."""
+    pending: Dict[tuple, int] = db.sync_session.info.setdefault(PENDING_KEY, {})
+    key = (tenant, metric, dimension or "")
+    pending[key] = pending.get(key, 0) + amount
+
+
+def rollup_upsert(increments: Dict[tuple, int]):
+    """Upsert adding {(tenant, metric, dimension): amount} to today's rows."""
+    today = datetime.utcnow().date()
+    upsert = pg_insert(DailyRollup).values([
+        {"tenant": tenant, "day": today, "metric": metric, "dimension": dimension or "", "value": amount}
+        for (tenant, metric, dimension), amount in increments.items()
+    ])
+    return upsert.on_conflict_do_update(
+        index_elements=[DailyRollup.tenant, DailyRollup.day, DailyRollup.metric, DailyRollup.dimension],
+        set_={"value": DailyRollup.value + upsert.excluded.value},
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_rollups(session: Session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    session.execute(rollup_upsert(pending))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rollups(session: Session):
+    session.info.pop(PENDING_KEY, None)
+
+
+def _bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _bucket_starts(start: date, end: date, bucket: str) -> List[date]:
+    starts = []
+    current = _bucket_start(start, bucket)
+    while current <= end:
+        starts.append(current)
+        if bucket == "week":
+            current += timedelta(days=7)
+        elif bucket == "month":
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=1)
+    return starts
+
+
+async def timeseries(db: AsyncSession, tenant: str, start: date, end: date, metrics: Optional[List[str]] = None,
+                     bucket: str = "day") -> List[dict]:
+    """Return one entry per bucket with {metric: {dimension: value}} read from daily rows.
+
+    Every bucket carries each metric's DIMENSIONS, zero-filled, so days
+    without activity read as zeros rather than empty objects.
+    """
+    metrics = metrics or list(METRICS)
+    result = await db.execute(
+        select(DailyRollup.day, DailyRollup.metric, DailyRollup.dimension, DailyRollup.value)
+        .where(
+            DailyRollup.tenant == tenant,
+            DailyRollup.day.between(start, end),
+            DailyRollup.metric.in_(metrics),
+        )
+    )
+
+    series = {
+        period: {"period": period.isoformat(), **{metric: dict.fromkeys(DIMENSIONS[metric], 0) for metric in metrics}}
+        for period in _bucket_starts(start, end, bucket)
+    }
+    for row in result:
+        values = series[_bucket_start(row.day, bucket)][row.metric]
+        dimension = row.dimension or "total"
+        values[dimension] = values.get(dimension, 0) + row.value
+    return list(series.values())
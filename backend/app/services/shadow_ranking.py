@@ -0,0 +1,211 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.algorithm import RankingAlgorithm
+from app.models.feedback import FeedbackItem
+
+WEIGHT_FIELDS = ("weight_votes", "weight_recency", "weight_feasibility", "weight_impact", "weight_clarity")
+# Weights of the built-in formula used by run_ranking when no algorithm is active
+DEFAULT_WEIGHTS = {
+    "weight_votes": 1.0,
+    "weight_recency": 0.5,
+    "weight_feasibility": 0.3,
+    "weight_impact": 0.4,
+    "weight_clarity": 0.2,
+}
+TOP_K = (10, 50, 100)
+LOAD_CHUNK_SIZE = 50_000
+
+
+@dataclass
+class Corpus:
+    """Column arrays for every item that can be scored."""
+
+    ids: np.ndarray
+    votes: np.ndarray
+    days_old: np.ndarray
+    feasibility: np.ndarray
+    impact: np.ndarray
+    clarity: np.ndarray
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def algorithm_weights(algorithm: Optional[RankingAlgorithm]) -> Dict[str, float]:
+    if algorithm is None:
+        return dict(DEFAULT_WEIGHTS)
+    return {field: getattr(algorithm, field) if getattr(algorithm, field) is not None else DEFAULT_WEIGHTS[field]
+            for field in WEIGHT_FIELDS}
+
+
+async def load_corpus(db: AsyncSession, tenant: str, item_type: Optional[str] = None) -> Corpus:
+    """Stream the scoring columns into numpy arrays in fixed-size chunks.
+
+    Postgres fills in the defaults and the age in days, so each chunk converts
+    to a (5, n) float array in one call instead of a Python loop per row.
+    """
+    query = select(
+        FeedbackItem.id,
+        func.coalesce(FeedbackItem.vote_count, 0),
+        func.coalesce(func.date_part("day", func.now() - FeedbackItem.created_at), 0),
+        func.coalesce(FeedbackItem.ai_feasibility_score, 0.0),
+        func.coalesce(FeedbackItem.ai_impact_score, 0.0),
+        func.coalesce(FeedbackItem.ai_clarity_score, 0.0),
+    ).where(FeedbackItem.tenant == tenant)
+    if item_type:
+        query = query.where(FeedbackItem.item_type == item_type)
+
+    id_chunks, value_chunks = [], []
+    result = await db.stream(query.execution_options(yield_per=LOAD_CHUNK_SIZE))
+    async for rows in result.partitions():
+        ids, *values = zip(*rows)
+        id_chunks.append(np.array(ids, dtype=object))
+        value_chunks.append(np.array(values, dtype=np.float64))
+
+    if not id_chunks:
+        return Corpus(np.empty(0, dtype=object), *np.empty((5, 0)))
+    return Corpus(np.concatenate(id_chunks), *np.concatenate(value_chunks, axis=1))
+
+
+def score_corpus(corpus: Corpus, weights: Dict[str, float]) -> np.ndarray:
+    """Vectorised equivalent of the per-item rank formula."""
+    recency = np.maximum(0.0, 1.0 - corpus.days_old * 0.1 / 7)
+    return (
+        corpus.votes * weights["weight_votes"]
+        + recency * weights["weight_recency"]
+        + corpus.feasibility * weights["weight_feasibility"]
+        + corpus.impact * weights["weight_impact"]
+        + corpus.clarity * weights["weight_clarity"]
+    )
+
+
+def rank_positions(scores: np.ndarray) -> np.ndarray:
+    """Board position of each item (0 = top), ties broken by corpus order."""
+    order = np.lexsort((np.arange(len(scores)), -scores))
+    positions = np.empty(len(scores), dtype=np.int64)
+    positions[order] = np.arange(len(scores))
+    return positions
+
+
+def count_inversions(sequence: np.ndarray) -> int:
+    """Count inversions of a permutation of 0..n-1 with a bottom-up vectorised merge sort."""
+    n = len(sequence)
+    values = sequence.astype(np.int64)
+    inversions = 0
+    width = 1
+    index = np.arange(n)
+    while width < n:
+        # Pair up neighbouring sorted blocks; offsetting by pair id lets one
+        # global searchsorted/sort handle every pair at once
+        pair = index // (2 * width)
+        is_right = (index // width) % 2 == 1
+        keyed = pair * n + values
+        left_keys = keyed[~is_right]
+        right_keys = keyed[is_right]
+        # Left elements greater than each right element, within the same pair
+        left_end = np.searchsorted(left_keys, (pair[is_right] + 1) * n, side="left")
+        inversions += int((left_end - np.searchsorted(left_keys, right_keys, side="right")).sum())
+        values = np.sort(keyed) - pair * n
+        width *= 2
+    return inversions
+
+
+def kendall_tau(positions_a: np.ndarray, positions_b: np.ndarray) -> float:
+    """Kendall tau between two tie-free rankings of the same items."""
+    n = len(positions_a)
+    if n < 2:
+        return 1.0
+    sequence = positions_b[np.argsort(positions_a)]
+    discordant = count_inversions(sequence)
+    return 1.0 - 4.0 * discordant / (n * (n - 1))
+
+
+def evaluate(corpus: Corpus, active_weights: Dict[str, float], candidate_weights: Dict[str, float],
+             movers: int = 20) -> dict:
+    """Compare candidate and active orderings of the whole corpus in one batch pass."""
+    active_positions = rank_positions(score_corpus(corpus, active_weights))
+    candidate_positions = rank_positions(score_corpus(corpus, candidate_weights))
+
+    overlap = {}
+    for k in TOP_K:
+        if len(corpus) == 0:
+            overlap[str(k)] = 1.0
+            continue
+        size = min(k, len(corpus))
+        top_active = active_positions < size
+        top_candidate = candidate_positions < size
+        overlap[str(k)] = round(float((top_active & top_candidate).sum()) / size, 4)
+
+    shift = active_positions - candidate_positions
+    if len(corpus):
+        biggest = np.argsort(-np.abs(shift), kind="stable")[:movers]
+    else:
+        biggest = []
+    return {
+        "items": len(corpus),
+        "kendall_tau": round(kendall_tau(active_positions, candidate_positions), 6),
+        "top_k_overlap": overlap,
+        "movers": [
+            {
+                "item_id": corpus.ids[i],
+                "active_position": int(active_positions[i]) + 1,
+                "candidate_position": int(candidate_positions[i]) + 1,
+                "change": int(shift[i]),
+            }
+            for i in biggest
+            if shift[i] != 0
+        ],
+    }
+
+
+async def resolve_candidate_weights(db: AsyncSession, algorithm_id=None, version: Optional[str] = None,
+                                    overrides: Optional[Dict[str, float]] = None) -> Optional[Dict[str, float]]:
+    """Weights of a stored algorithm (or the active one) with proposed overrides applied.
+
+    Returns None if a requested stored algorithm does not exist.
+    """
+    query = select(RankingAlgorithm)
+    if algorithm_id:
+        query = query.where(RankingAlgorithm.id == algorithm_id)
+    elif version:
+        query = query.where(RankingAlgorithm.version == version).order_by(RankingAlgorithm.created_at.desc())
+    else:
+        query = query.where(RankingAlgorithm.is_active == True)
+    result = await db.execute(query.limit(1))
+    algorithm = result.scalars().first()
+    if algorithm is None and (algorithm_id or version):
+        return None
+
+    weights = algorithm_weights(algorithm)
+    weights.update({field: value for field, value in (overrides or {}).items() if value is not None})
+    return weights
+
+
+async def shadow_rank(db: AsyncSession, candidate_weights: Dict[str, float], tenant: str,
+                      item_type: Optional[str] = None, movers: int = 20) -> dict:
+    """Evaluate candidate weights against the active algorithm without touching rank_score."""
+    result = await db.execute(select(RankingAlgorithm).where(RankingAlgorithm.is_active == True))
+    active = result.scalars().first()
+    corpus = await load_corpus(db, tenant, item_type)
+    report = evaluate(corpus, algorithm_weights(active), candidate_weights, movers)
+
+    titles = {}
+    mover_ids = [mover["item_id"] for mover in report["movers"]]
+    if mover_ids:
+        title_result = await db.execute(
+            select(FeedbackItem.id, FeedbackItem.title).where(FeedbackItem.id.in_(mover_ids))
+        )
+        titles = {row.id: row.title for row in title_result}
+    for mover in report["movers"]:
+        mover["title"] = titles.get(mover["item_id"])
+
+    report["active_version"] = active.version if active else None
+    report["candidate_weights"] = candidate_weights
+    report["item_type"] = item_type
+    report["tenant"] = tenant
+    return report
@@ -0,0 +1,99 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import text, bindparam, Integer, String, Date
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import RowMapping
+
+from app.models.feedback import FeedbackItem
+from app.schemas.feedback import FeedbackItemCreate
+from app.services.rollups import SUBMISSIONS, CREDITS_AWARDED
+from app.config import get_settings
+
+settings = get_settings()
+
+ITEM_COLUMNS = ", ".join(FeedbackItem.__table__.c.keys())
+
+# SQLAlchemy gives ON CONFLICT statements no cache key, so one built with Core
+# is compiled again on every submission; as text it is compiled once. The
+# ON CONFLICT targets are uq_user_credits_tenant_user and daily_rollups' primary key.
+SUBMISSION = text(f"""
+WITH new_item AS (
+    INSERT INTO feedback_items (id, tenant, item_type, title, description, user_id, x_handle,
+                                status, vote_count, rank_score, credits_awarded)
+    VALUES (:item_id, :tenant, :item_type, :title, :description, :user_id, :x_handle, 'new', 0, 0, 0)
+    RETURNING {ITEM_COLUMNS}
+), submission_credit AS (
+    INSERT INTO credit_transactions (id, tenant, user_id, item_id, amount, transaction_type, description)
+    SELECT :transaction_id, tenant, user_id, id, :amount, 'submission', :transaction_description FROM new_item
+), submitter_credits AS (
+    INSERT INTO user_credits (id, tenant, user_id, x_handle, credits_balance, credits_earned_total,
+                              items_submitted, items_developed)
+    VALUES (:credits_id, :tenant, :user_id, :x_handle, :amount, :amount, 1, 0)
+    ON CONFLICT (tenant, user_id) DO UPDATE SET
+        credits_balance = user_credits.credits_balance + EXCLUDED.credits_balance,
+        credits_earned_total = user_credits.credits_earned_total + EXCLUDED.credits_earned_total,
+        items_submitted = user_credits.items_submitted + 1,
+        x_handle = COALESCE(EXCLUDED.x_handle, user_credits.x_handle)
+), submission_rollups AS (
+    INSERT INTO daily_rollups (tenant, day, metric, dimension, value)
+    VALUES (:tenant, :day, :submissions_metric, :item_type, 1),
+           (:tenant, :day, :credits_metric, 'submission', :amount)
+    ON CONFLICT (tenant, day, metric, dimension) DO UPDATE SET value = daily_rollups.value + EXCLUDED.value
+)
+SELECT {ITEM_COLUMNS} FROM new_item
+""").bindparams(
+    bindparam("item_id", type_=UUID(as_uuid=True)),
+    bindparam("transaction_id", type_=UUID(as_uuid=True)),
+    bindparam("credits_id", type_=UUID(as_uuid=True)),
+    bindparam("tenant", type_=String),
+    bindparam("item_type", type_=String),
+    bindparam("title", type_=String),
+    bindparam("description", type_=String),
+    bindparam("user_id", type_=String),
+    bindparam("x_handle", type_=String),
+    bindparam("amount", type_=Integer),
+    bindparam("transaction_description", type_=String),
+    bindparam("day", type_=Date),
+    bindparam("submissions_metric", type_=String),
+    bindparam("credits_metric", type_=String),
+).columns(*FeedbackItem.__table__.c)
+
+
+def submission_params(tenant: str, item: FeedbackItemCreate) -> dict:
+    """Parameters for SUBMISSION.
+
+    The item insert RETURNs the new row; sibling data-modifying CTEs write
+    the submission credit, upsert the submitter's balance and stats, and
+    bump the daily rollups. Postgres runs all of them in the same snapshot,
+    so the whole unit of work is a single round trip.
+    """
+    return {
+        "item_id": uuid.uuid4(),
+        "transaction_id": uuid.uuid4(),
+        "credits_id": uuid.uuid4(),
+        "tenant": tenant,
+        "item_type": item.item_type,
+        "title": item.title,
+        "description": item.description,
+        "user_id": item.user_id,
+        "x_handle": item.x_handle,
+        "amount": settings.credits_submission,
+        "transaction_description": f"Submitted: {item.title[:50]}",
+        "day": datetime.utcnow().date(),
+        "submissions_metric": SUBMISSIONS,
+        "credits_metric": CREDITS_AWARDED,
+    }
+
+
+async def submit_item(db: AsyncSession, tenant: str, item: FeedbackItemCreate) -> RowMapping:
+    """Store a submission with its credit and stats in one statement and commit once.
+
+    On a get_autocommit_db session the statement commits as it finishes and
+    the COMMIT is a no-op.
+    """
+    result = await db.execute(SUBMISSION, submission_params(tenant, item))
+    row = result.mappings().one()
+    await db.commit()
+    return row
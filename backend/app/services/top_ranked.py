@@ -0,0 +1,177 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from app.models.feedback import FeedbackItem
+from app.models.credits import UserCredits, CreditTransaction
+from app.metrics import metrics
+from app.services.rollups import record_activity, CREDITS_AWARDED
+from app.config import get_settings
+
+settings = get_settings()
+
+ITEM_TYPES = ("wishlist", "bug")
+
+
+class TopRankedTracker:
+    """Keeps the current top-N set per (tenant, item_type) and reports items that enter it.
+
+    The set for a type is loaded lazily with one indexed LIMIT query and then
+    maintained from score changes, so a vote costs an index probe at most.
+    Awards are made exactly once by a partial unique index on
+    credit_transactions(item_id) WHERE transaction_type = 'top_ranked'.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._top: Dict[Tuple[str, str], Dict[UUID, float]] = {}
+
+    def invalidate(self, tenant: str = None, item_type: str = None):
+        """Forget the cached set for one board/type (or all) so it is reloaded."""
+        if tenant and item_type:
+            self._top.pop((tenant, item_type), None)
+        elif tenant:
+            for key in [key for key in self._top if key[0] == tenant]:
+                del self._top[key]
+        else:
+            self._top.clear()
+
+    async def _load(self, db: AsyncSession, tenant: str, item_type: str) -> Dict[UUID, float]:
+        result = await db.execute(
+            select(FeedbackItem.id, FeedbackItem.rank_score)
+            .where(FeedbackItem.tenant == tenant, FeedbackItem.item_type == item_type)
+            .order_by(FeedbackItem.rank_score.desc(), FeedbackItem.id)
+            .limit(self.size)
+        )
+        return {row.id: row.rank_score or 0 for row in result}
+
+    @staticmethod
+    def _lowest(top: Dict[UUID, float]) -> Tuple[UUID, float]:
+        return min(top.items(), key=lambda kv: (kv[1], kv[0]))
+
+    async def observe(self, db: AsyncSession, item: FeedbackItem) -> List[UUID]:
+        """Apply one item's new rank_score and return ids that entered the top set."""
+        key = (item.tenant, item.item_type)
+        top = self._top.get(key)
+        metrics.record_cache("top_ranked", top is not None)
+        if top is None:
+            # First sight of this type in this process: the whole loaded set is
+            # reported, and the unique index turns already-awarded items into no-ops
+            top = await self._load(db, *key)
+            self._top[key] = top
+            return list(top)
+        score = item.rank_score or 0
+
+        if item.id in top:
+            top[item.id] = score
+            lowest_id, lowest_score = self._lowest(top)
+            if lowest_id != item.id or len(top) < self.size:
+                return []
+            # The item is now the weakest member; the best outsider may overtake it
+            result = await db.execute(
+                select(FeedbackItem.id, FeedbackItem.rank_score)
+                .where(
+                    FeedbackItem.tenant == item.tenant,
+                    FeedbackItem.item_type == item.item_type,
+                    FeedbackItem.id.notin_(list(top)),
+                )
+                .order_by(FeedbackItem.rank_score.desc(), FeedbackItem.id)
+                .limit(1)
+            )
+            challenger = result.first()
+            if challenger and (challenger.rank_score or 0) > lowest_score:
+                del top[item.id]
+                top[challenger.id] = challenger.rank_score or 0
+                return [challenger.id]
+            return []
+
+        if len(top) < self.size:
+            top[item.id] = score
+            return [item.id]
+
+        lowest_id, lowest_score = self._lowest(top)
+        if score > lowest_score:
+            del top[lowest_id]
+            top[item.id] = score
+            return [item.id]
+        return []
+
+    async def refresh(self, db: AsyncSession, tenant: str) -> List[UUID]:
+        """Reload every type of a board after a full re-rank and return ids that entered."""
+        entered = []
+        for item_type in ITEM_TYPES:
+            previous = self._top.get((tenant, item_type), {})
+            current = await self._load(db, tenant, item_type)
+            self._top[(tenant, item_type)] = current
+            entered.extend(item_id for item_id in current if item_id not in previous)
+        return entered
+
+
+top_ranked_tracker = TopRankedTracker(size=settings.top_ranked_size)
+
+
+async def award_top_ranked(db: AsyncSession, item_ids: List[UUID]) -> int:
+    """Award the top-ranked bonus for items that have not received it yet."""
+    if not item_ids:
+        return 0
+
+    amount = settings.credits_top_ranked
+    result = await db.execute(
+        select(FeedbackItem.id, FeedbackItem.tenant, FeedbackItem.user_id, FeedbackItem.title)
+        .where(FeedbackItem.id.in_(item_ids))
+    )
+    items = result.all()
+    if not items:
+        return 0
+
+    insert_result = await db.execute(
+        pg_insert(CreditTransaction)
+        .values([
+            {
+                "tenant": row.tenant,
+                "user_id": row.user_id,
+                "item_id": row.id,
+                "amount": amount,
+                "transaction_type": "top_ranked",
+                "description": f"Reached top {top_ranked_tracker.size}: {row.title[:50]}",
+            }
+            for row in items
+        ])
+        .on_conflict_do_nothing(
+            index_elements=[CreditTransaction.item_id],
+            index_where=CreditTransaction.transaction_type == "top_ranked",
+        )
+        .returning(CreditTransaction.tenant, CreditTransaction.user_id, CreditTransaction.item_id)
+    )
+    awarded = insert_result.all()
+
+    if awarded:
+        # One upsert for every owner; a user can own several newly ranked items
+        per_user: Dict[Tuple[str, str], int] = {}
+        for row in awarded:
+            per_user[(row.tenant, row.user_id)] = per_user.get((row.tenant, row.user_id), 0) + amount
+        for tenant in {row.tenant for row in awarded}:
+            record_activity(db, tenant, CREDITS_AWARDED, "top_ranked",
+                            amount * sum(1 for row in awarded if row.tenant == tenant))
+        upsert = pg_insert(UserCredits).values([
+            {"tenant": tenant, "user_id": user_id, "credits_balance": total, "credits_earned_total": total}
+            for (tenant, user_id), total in per_user.items()
+        ])
+        await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[UserCredits.tenant, UserCredits.user_id],
+                set_={
+                    "credits_balance": UserCredits.credits_balance + upsert.excluded.credits_balance,
+                    "credits_earned_total": UserCredits.credits_earned_total + upsert.excluded.credits_earned_total,
+                },
+            )
+        )
+        await db.execute(
+            update(FeedbackItem)
+            .where(FeedbackItem.id.in_([row.item_id for row in awarded]))
+            .values(credits_awarded=FeedbackItem.credits_awarded + amount)
+            .execution_options(synchronize_session=False)
+        )
+    return len(awarded)
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import event, select, delete, func, case, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.feedback import FeedbackVote
+from app.models.trending import VoteVelocityBucket
+
+# (window hours, weight); each window contributes its net votes per hour
+TRENDING_WINDOWS = ((1, 0.5), (24, 0.3), (168, 0.2))
+RETENTION_HOURS = max(hours for hours, _ in TRENDING_WINDOWS)
+PENDING_KEY = "pending_vote_buckets"
+
+
+def hour_bucket(at: Optional[datetime] = None) -> datetime:
+    """Start of the UTC hour containing at (now by default)."""
+    at = at or datetime.now(timezone.utc)
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return at.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def record_vote_velocity(db: AsyncSession, tenant: str, item_id: UUID, delta: int,
+                         cast_at: Optional[datetime] = None):
+    """Queue a net-vote change for the hour the vote was cast; it is written on commit.
+
+    Removing or flipping a vote adjusts the bucket of the original vote, so the
+    buckets always match feedback_votes grouped by created_at hour.
+    """
+    bucket = hour_bucket(cast_at)
+    if not delta or bucket <= hour_bucket() - timedelta(hours=RETENTION_HOURS):
+        return
+    pending: Dict[tuple, int] = db.sync_session.info.setdefault(PENDING_KEY, {})
+    key = (tenant, item_id, bucket)
+    pending[key] = pending.get(key, 0) + delta
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_vote_buckets(session: Session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    upsert = pg_insert(VoteVelocityBucket).values([
+        {"tenant": tenant, "item_id": item_id, "bucket_start": bucket, "net": delta}
+        for (tenant, item_id, bucket), delta in pending.items()
+    ])
+    session.execute(upsert.on_conflict_do_update(
+        index_elements=[VoteVelocityBucket.item_id, VoteVelocityBucket.bucket_start],
+        set_={"net": VoteVelocityBucket.net + upsert.excluded.net},
+    ))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_vote_buckets(session: Session):
+    session.info.pop(PENDING_KEY, None)
+
+
+def trending_scores(tenant: str, now: Optional[datetime] = None):
+    """Subquery of (item_id, trending_score) for a board, read from the retained buckets.
+
+    Windows are hour-aligned: the 1h window is the current hour's bucket, 24h the
+    last 24 buckets, and so on.
+    """
+    current = hour_bucket(now)
+    score = None
+    for hours, weight in TRENDING_WINDOWS:
+        in_window = func.sum(case(
+            (VoteVelocityBucket.bucket_start > current - timedelta(hours=hours), VoteVelocityBucket.net),
+            else_=0,
+        )) * (weight / hours)
+        score = in_window if score is None else score + in_window
+    return (
+        select(VoteVelocityBucket.item_id, score.label("trending_score"))
+        .where(
+            VoteVelocityBucket.tenant == tenant,
+            VoteVelocityBucket.bucket_start > current - timedelta(hours=RETENTION_HOURS),
+        )
+        .group_by(VoteVelocityBucket.item_id)
+        .subquery("trending")
+    )
+
+
+async def prune_vote_buckets(db: AsyncSession, now: Optional[datetime] = None) -> int:
+    """Delete buckets that have left every trending window."""
+    result = await db.execute(
+        delete(VoteVelocityBucket).where(
+            VoteVelocityBucket.bucket_start <= hour_bucket(now) - timedelta(hours=RETENTION_HOURS)
+        )
+    )
+    return result.rowcount
+
+
+def backfill_vote_buckets(now: Optional[datetime] = None):
+    """INSERT ... SELECT rebuilding the retained buckets from feedback_votes (run on an empty table)."""
+    bucket = func.date_trunc("hour", FeedbackVote.created_at)
+    return insert(VoteVelocityBucket).from_select(
+        ["item_id", "bucket_start", "tenant", "net"],
+        select(
+            FeedbackVote.item_id,
+            bucket,
+            FeedbackVote.tenant,
+            func.sum(case((FeedbackVote.vote_type == "down", -1), else_=1)),
+        )
+        .where(FeedbackVote.created_at >= hour_bucket(now) - timedelta(hours=RETENTION_HOURS - 1))
+        .group_by(FeedbackVote.item_id, bucket, FeedbackVote.tenant),
+    )
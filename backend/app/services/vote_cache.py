@@ -0,0 +1,121 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, func, literal, case, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.feedback import FeedbackVote
+from app.metrics import metrics
+from app.config import get_settings
+from app.database import async_session
+
+settings = get_settings()
+
+# Marks users with too many votes to cache; they keep using per-page IN queries
+TOO_LARGE = None
+VOTE_TYPES = {"up": "up", "down": "down"}
+UUID_SIZE = sys.getsizeof(UUID(int=0)) + sys.getsizeof(2 ** 127)
+
+
+class UserVoteCache:
+    """LRU map of (tenant, user_id) -> {item_id: vote_type} for recently active users.
+
+    Each entry is a user's complete vote set, so user_voted for any item can be
+    answered without a query. Entries are always loaded from the primary, as a
+    lagging replica could pin votes the user just cast as missing for a whole
+    TTL. Writes in this process update entries in place; the TTL bounds
+    staleness from writes handled by other workers.
+    """
+
+    def __init__(self, max_users: int, max_votes_per_user: int, ttl: float):
+        self.max_users = max_users
+        self.max_votes_per_user = max_votes_per_user
+        self.ttl = ttl
+        self._users: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self.entries = 0
+
+    async def get(self, db: AsyncSession, tenant: str, user_id: str) -> Optional[Dict[UUID, str]]:
+        """Return the user's complete vote map on a board, or None if it is too large to cache."""
+        now = time.monotonic()
+        key = (tenant, user_id)
+        cached = self._users.get(key)
+        if cached is not None and now - cached[0] < self.ttl:
+            self._users.move_to_end(key)
+            metrics.record_cache("user_votes", True)
+            return cached[1]
+        metrics.record_cache("user_votes", False)
+
+        if db.info.get("replica"):
+            async with async_session() as primary:
+                rows = (await primary.execute(self._load_query(tenant, user_id))).all()
+        else:
+            rows = (await db.execute(self._load_query(tenant, user_id))).all()
+        votes = TOO_LARGE
+        if rows[0].votes <= self.max_votes_per_user:
+            votes = {row.item_id: VOTE_TYPES.get(row.vote_type, row.vote_type) for row in rows if row.item_id}
+        self._store(key, votes, now)
+        return votes
+
+    def _load_query(self, tenant: str, user_id: str):
+        """The user's vote count (capped past the limit), joined to their votes only if within it.
+
+        Always one row or more; users over the limit cost an index-only count
+        instead of shipping max_votes_per_user + 1 rows that are thrown away.
+        """
+        owned = (FeedbackVote.tenant == tenant, FeedbackVote.user_id == user_id)
+        capped = select(literal(1)).where(*owned).limit(self.max_votes_per_user + 1).subquery()
+        count = select(func.count()).select_from(capped).scalar_subquery()
+        # A LIMIT of 0 ends the scan before it reads a row; the limit also keeps Postgres from flattening it
+        votes = (
+            select(FeedbackVote.item_id, FeedbackVote.vote_type)
+            .where(*owned)
+            .limit(case((count <= self.max_votes_per_user, self.max_votes_per_user), else_=0))
+            .subquery()
+        )
+        total = select(count.label("votes")).subquery()
+        return select(total.c.votes, votes.c.item_id, votes.c.vote_type).select_from(total.outerjoin(votes, true()))
+
+    def _store(self, key: Tuple[str, str], votes: Optional[Dict[UUID, str]], now: float):
+        self._evict(key)
+        while len(self._users) >= self.max_users:
+            _, (_, evicted) = self._users.popitem(last=False)
+            self.entries -= len(evicted or ())
+        self._users[key] = (now, votes)
+        self.entries += len(votes or ())
+
+    def _evict(self, key: Tuple[str, str]):
+        cached = self._users.pop(key, None)
+        if cached is not None:
+            self.entries -= len(cached[1] or ())
+
+    def record_vote(self, tenant: str, user_id: str, item_id: UUID, vote_type: Optional[str]):
+        """Apply a committed vote change (None = vote removed) to a cached user."""
+        cached = self._users.get((tenant, user_id))
+        if cached is None or cached[1] is TOO_LARGE:
+            return
+        votes = cached[1]
+        if vote_type is None:
+            if votes.pop(item_id, None) is not None:
+                self.entries -= 1
+        else:
+            if item_id not in votes:
+                self.entries += 1
+            votes[item_id] = VOTE_TYPES[vote_type]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by cached vote maps."""
+        maps = sum(sys.getsizeof(votes) for _, votes in self._users.values() if votes)
+        return sys.getsizeof(self._users) + maps + self.entries * UUID_SIZE
+
+
+vote_cache = UserVoteCache(
+    max_users=settings.vote_cache_max_users,
+    max_votes_per_user=settings.vote_cache_max_votes_per_user,
+    ttl=settings.vote_cache_ttl_seconds,
+)
+metrics.register_gauge("appfeedback_vote_cache_users", "Users held in the vote cache.", lambda: len(vote_cache._users))
+metrics.register_gauge("appfeedback_vote_cache_entries", "Votes held in the vote cache.", lambda: vote_cache.entries)
+metrics.register_gauge("appfeedback_vote_cache_bytes", "Approximate vote cache memory.", vote_cache.memory_bytes)
@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update, func, case, and_, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.feedback import FeedbackItem, FeedbackVote
+
+VOTE_REPAIR_CHUNK_SIZE = 1_000
+
+
+@dataclass
+class VoteDrift:
+    """An item whose vote_count disagrees with its feedback_votes rows."""
+
+    tenant: str
+    item_id: str
+    vote_count: int
+    expected_vote_count: int
+
+    @property
+    def delta(self) -> int:
+        return self.expected_vote_count - self.vote_count
+
+
+@dataclass
+class VoteChunkResult:
+    checked: int
+    last_id: Optional[UUID]
+    drifts: List[VoteDrift] = field(default_factory=list)
+    repaired: int = 0
+
+
+async def repair_vote_chunk(db: AsyncSession, after: Optional[UUID] = None,
+                            chunk_size: int = VOTE_REPAIR_CHUNK_SIZE, repair: bool = False,
+                            lock_timeout_ms: Optional[int] = None) -> VoteChunkResult:
+    """Compare the next id keyset chunk of items with up-minus-down vote counts in one grouped query.
+
+    Repairs shift rank_score by the same delta as vote_count (votes weigh 1.0 in
+    the ranking formula) and are guarded by the count that was read, so an item
+    voted on concurrently is skipped rather than overwritten. The caller commits
+    after each chunk; lock_timeout_ms bounds how long the repair waits on a row.
+    """
+    items = select(FeedbackItem.id, FeedbackItem.tenant, FeedbackItem.vote_count).order_by(FeedbackItem.id).limit(chunk_size)
+    if after is not None:
+        items = items.where(FeedbackItem.id > after)
+    items = items.subquery()
+
+    result = await db.execute(
+        select(
+            items.c.id,
+            items.c.tenant,
+            items.c.vote_count,
+            func.coalesce(func.sum(case(
+                (FeedbackVote.vote_type == "up", 1),
+                (FeedbackVote.vote_type == "down", -1),
+                else_=0,
+            )), 0).label("expected_vote_count"),
+        )
+        .select_from(items)
+        .outerjoin(FeedbackVote, FeedbackVote.item_id == items.c.id)
+        .group_by(items.c.id, items.c.tenant, items.c.vote_count)
+        .order_by(items.c.id)
+    )
+    rows = result.all()
+
+    chunk = VoteChunkResult(checked=len(rows), last_id=rows[-1].id if rows else None)
+    for row in rows:
+        count = row.vote_count or 0
+        if count != row.expected_vote_count:
+            chunk.drifts.append(VoteDrift(
+                tenant=row.tenant,
+                item_id=str(row.id),
+                vote_count=count,
+                expected_vote_count=int(row.expected_vote_count),
+            ))
+
+    if repair and chunk.drifts:
+        if lock_timeout_ms and db.bind.dialect.name == "postgresql":
+            await db.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        table = FeedbackItem.__table__
+        statement = (
+            update(table)
+            .where(and_(
+                table.c.id == bindparam("b_id"),
+                func.coalesce(table.c.vote_count, 0) == bindparam("b_vote_count"),
+            ))
+            .values(
+                vote_count=bindparam("b_expected"),
+                rank_score=func.coalesce(table.c.rank_score, 0) + bindparam("b_delta"),
+            )
+        )
+        # Rows are locked in id order, the same order every chunk walks
+        repair_result = await db.execute(statement, [
+            {
+                "b_id": UUID(drift.item_id),
+                "b_vote_count": drift.vote_count,
+                "b_expected": drift.expected_vote_count,
+                "b_delta": float(drift.delta),
+            }
+            for drift in chunk.drifts
+        ])
+        chunk.repaired = repair_result.rowcount if repair_result.rowcount >= 0 else len(chunk.drifts)
+
+    return chunk
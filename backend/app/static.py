@@ -0,0 +1,168 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response, FileResponse
+
+# Vite emits content-hashed names like assets/index-4f1a2b3c.js
+HASHED_ASSET_PATTERN = re.compile(r"^assets/.+[-.][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/xml")
+MIN_COMPRESS_SIZE = 1024
+MAX_CACHED_FILE_SIZE = 2 * 1024 * 1024
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+ENCODING_PREFERENCE = ("br", "gzip")
+# Prefixes that must 404 instead of falling back to the SPA shell
+NO_FALLBACK_PREFIXES = ("api/", "assets/")
+
+
+class InvalidStaticPath(ValueError):
+    pass
+
+
+@dataclass
+class StaticAsset:
+    """One servable file with its encoded variants held in memory."""
+
+    path: str
+    content_type: str
+    etag: str
+    cache_control: str
+    # encoding ("identity", "br", "gzip") -> bytes; None means stream from disk
+    variants: Dict[str, Optional[bytes]] = field(default_factory=dict)
+
+
+def normalize_path(path: str) -> str:
+    """Validate a request path relative to the static root; raise on traversal attempts."""
+    if "\x00" in path or "\\" in path:
+        raise InvalidStaticPath(path)
+    parts = [part for part in path.split("/") if part not in ("", ".")]
+    if any(part == ".." for part in parts):
+        raise InvalidStaticPath(path)
+    return "/".join(parts)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each accepted content coding to its q-value."""
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def _brotli_compress(data: bytes) -> Optional[bytes]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11)
+
+
+class StaticIndex:
+    """Index of a built dashboard, scanned once so requests never touch the filesystem.
+
+    Precompressed `.br`/`.gz` siblings from the build are used when present;
+    otherwise compressible files are compressed here once at startup
+    (brotli only if the optional `brotli` package is installed).
+    """
+
+    def __init__(self, root: str, fallback: str = "index.html"):
+        self.root = os.path.realpath(root)
+        self.fallback = fallback
+        self.assets: Dict[str, StaticAsset] = {}
+        self._scan()
+
+    def _scan(self):
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                full_path = os.path.join(directory, filename)
+                base, extension = os.path.splitext(full_path)
+                if extension in ENCODING_SUFFIXES.values() and os.path.isfile(base):
+                    continue  # a precompressed sibling, attached to its source in _load
+                relative = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                self.assets[relative] = self._load(relative, full_path)
+
+    def _load(self, relative: str, full_path: str) -> StaticAsset:
+        content_type = mimetypes.guess_type(relative)[0] or "application/octet-stream"
+        if content_type == "application/javascript":
+            content_type += "; charset=utf-8"  # starlette only adds a charset to text/*
+        cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_ASSET_PATTERN.match(relative) else REVALIDATE_CACHE_CONTROL
+
+        size = os.path.getsize(full_path)
+        if size > MAX_CACHED_FILE_SIZE:
+            digest = hashlib.sha256(f"{relative}:{size}:{os.path.getmtime(full_path)}".encode()).hexdigest()
+            return StaticAsset(relative, content_type, digest[:20], cache_control, {"identity": None})
+
+        with open(full_path, "rb") as f:
+            data = f.read()
+        asset = StaticAsset(relative, content_type, hashlib.sha256(data).hexdigest()[:20], cache_control,
+                            {"identity": data})
+
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if os.path.isfile(full_path + suffix):
+                with open(full_path + suffix, "rb") as f:
+                    asset.variants[encoding] = f.read()
+
+        if len(data) >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            if "br" not in asset.variants:
+                compressed = _brotli_compress(data)
+                if compressed is not None:
+                    asset.variants["br"] = compressed
+            if "gzip" not in asset.variants:
+                asset.variants["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+        # Keep only variants that actually save bytes
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in asset.variants and len(asset.variants[encoding]) >= len(data):
+                del asset.variants[encoding]
+        return asset
+
+    def lookup(self, path: str) -> Optional[StaticAsset]:
+        """Return the asset for a request path, the SPA shell for client routes, or None."""
+        relative = normalize_path(path)
+        asset = self.assets.get(relative)
+        if asset is not None:
+            return asset
+        if relative.startswith(NO_FALLBACK_PREFIXES):
+            return None
+        return self.assets.get(self.fallback)
+
+    def response(self, request: Request, asset: StaticAsset) -> Response:
+        encoding = self._choose_encoding(request, asset)
+        # Strong ETags must differ per representation
+        etag = f'"{asset.etag}"' if encoding == "identity" else f'"{asset.etag}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control, "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+
+        body = asset.variants[encoding]
+        if body is None:
+            return FileResponse(os.path.join(self.root, asset.path), media_type=asset.content_type, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type=asset.content_type, headers=headers)
+
+    @staticmethod
+    def _choose_encoding(request: Request, asset: StaticAsset) -> str:
+        accepted = parse_accept_encoding(request.headers.get("accept-encoding", ""))
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in asset.variants and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return "identity"
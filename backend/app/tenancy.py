@@ -0,0 +1,25 @@
+from typing import Optional
+
+from fastapi import Header, HTTPException, Query
+
+from app.config import get_settings
+
+settings = get_settings()
+
+TENANTS = frozenset(name.strip() for name in settings.tenants.split(",") if name.strip()) | {settings.default_tenant}
+
+
+def resolve_tenant(value: Optional[str]) -> str:
+    """Map a requested board name to a known tenant key."""
+    tenant = (value or settings.default_tenant).strip().lower()
+    if tenant not in TENANTS:
+        raise HTTPException(status_code=400, detail=f"Unknown board {tenant!r}")
+    return tenant
+
+
+def get_tenant(
+    variant: Optional[str] = Query(None, description="Board to scope the request to, e.g. bumblebee"),
+    x_variant: Optional[str] = Header(None),
+) -> str:
+    """Dependency resolving the board a request is scoped to."""
+    return resolve_tenant(variant or x_variant)
@@ -0,0 +1,11 @@
+-- Top-ranked credit awards
+-- Each item earns the top_ranked bonus at most once, enforced by the database
+-- so awards stay idempotent across restarts and multiple workers.
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_credit_transactions_top_ranked_item
+    ON credit_transactions(item_id)
+    WHERE transaction_type = 'top_ranked';
+
+-- Top-N per type and the best item outside it are read straight off this index
+CREATE INDEX IF NOT EXISTS idx_feedback_items_type_rank
+    ON feedback_items(item_type, rank_score DESC, id);
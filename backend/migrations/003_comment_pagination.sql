@@ -0,0 +1,13 @@
+-- Keyset pagination for comment threads
+-- Pages are read in (created_at, id) order straight off the composite index,
+-- and product-owner comments are pinned from a small partial index.
+
+CREATE INDEX IF NOT EXISTS idx_feedback_comments_item_created
+    ON feedback_comments(item_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_feedback_comments_item_po
+    ON feedback_comments(item_id, created_at DESC)
+    WHERE is_product_owner;
+
+-- Superseded by idx_feedback_comments_item_created
+DROP INDEX IF EXISTS idx_feedback_comments_item;
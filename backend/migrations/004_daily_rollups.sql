@@ -0,0 +1,11 @@
+-- Daily activity rollups
+-- One row per (day, metric, dimension), bumped by the write paths at commit
+-- time so trend queries read one small row per bucket instead of scanning history.
+
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day DATE NOT NULL,
+    metric VARCHAR(40) NOT NULL,
+    dimension VARCHAR(40) NOT NULL DEFAULT '',
+    value BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, metric, dimension)
+);
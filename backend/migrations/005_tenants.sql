@@ -0,0 +1,38 @@
+-- Per-board tenancy
+-- Every board (the generic one and ?variant=bumblebee) shares these tables;
+-- each row carries its board and every hot index leads with it, so a query
+-- for one board only touches that board's index ranges.
+
+ALTER TABLE feedback_items ADD COLUMN IF NOT EXISTS tenant VARCHAR(40) NOT NULL DEFAULT 'default';
+ALTER TABLE feedback_votes ADD COLUMN IF NOT EXISTS tenant VARCHAR(40) NOT NULL DEFAULT 'default';
+ALTER TABLE feedback_comments ADD COLUMN IF NOT EXISTS tenant VARCHAR(40) NOT NULL DEFAULT 'default';
+ALTER TABLE user_credits ADD COLUMN IF NOT EXISTS tenant VARCHAR(40) NOT NULL DEFAULT 'default';
+ALTER TABLE credit_transactions ADD COLUMN IF NOT EXISTS tenant VARCHAR(40) NOT NULL DEFAULT 'default';
+
+CREATE INDEX IF NOT EXISTS idx_feedback_items_tenant_type_rank
+    ON feedback_items(tenant, item_type, rank_score DESC, id);
+CREATE INDEX IF NOT EXISTS idx_feedback_items_tenant_rank
+    ON feedback_items(tenant, rank_score DESC);
+CREATE INDEX IF NOT EXISTS idx_feedback_items_tenant_created
+    ON feedback_items(tenant, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_feedback_votes_tenant_user
+    ON feedback_votes(tenant, user_id, item_id);
+CREATE INDEX IF NOT EXISTS idx_credit_transactions_tenant_user
+    ON credit_transactions(tenant, user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_user_credits_tenant_earned
+    ON user_credits(tenant, credits_earned_total DESC);
+
+-- Balances are per board: (tenant, user_id) replaces the global user_id key
+CREATE UNIQUE INDEX IF NOT EXISTS uq_user_credits_tenant_user ON user_credits(tenant, user_id);
+ALTER TABLE user_credits DROP CONSTRAINT IF EXISTS user_credits_user_id_key;
+
+-- Superseded by the tenant-leading indexes above
+DROP INDEX IF EXISTS idx_feedback_items_type_rank;
+DROP INDEX IF EXISTS idx_feedback_items_rank;
+DROP INDEX IF EXISTS idx_feedback_items_created;
+DROP INDEX IF EXISTS idx_credit_transactions_user;
+
+-- Rollups are kept per board too
+ALTER TABLE daily_rollups ADD COLUMN IF NOT EXISTS tenant VARCHAR(40) NOT NULL DEFAULT 'default';
+ALTER TABLE daily_rollups DROP CONSTRAINT IF EXISTS daily_rollups_pkey;
+ALTER TABLE daily_rollups ADD PRIMARY KEY (tenant, day, metric, dimension);
@@ -0,0 +1,24 @@
+-- Hourly vote velocity buckets for sort_by=trending
+-- Net votes per (item, hour the vote was cast), bumped by the vote path at
+-- commit time and pruned after 7 days, so trending reads at most 168 small
+-- rows per active item instead of scanning feedback_votes.
+
+CREATE TABLE IF NOT EXISTS vote_velocity_buckets (
+    item_id UUID NOT NULL REFERENCES feedback_items(id) ON DELETE CASCADE,
+    bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    tenant VARCHAR(40) NOT NULL DEFAULT 'default',
+    net INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (item_id, bucket_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_vote_velocity_tenant_bucket
+    ON vote_velocity_buckets(tenant, bucket_start, item_id, net);
+
+-- Backfill the retained window from existing votes
+INSERT INTO vote_velocity_buckets (item_id, bucket_start, tenant, net)
+SELECT item_id, date_trunc('hour', created_at), tenant,
+       SUM(CASE WHEN vote_type = 'down' THEN -1 ELSE 1 END)
+FROM feedback_votes
+WHERE created_at >= date_trunc('hour', NOW()) - INTERVAL '167 hours'
+GROUP BY item_id, date_trunc('hour', created_at), tenant
+ON CONFLICT (item_id, bucket_start) DO UPDATE SET net = EXCLUDED.net;
@@ -0,0 +1,21 @@
+-- Indexes for the remaining hot filters and sorts
+-- Every list sort (rank, votes, recent) and the status filter can now be read
+-- in order off a tenant-leading index, with no Sort node. backend/tests/test_query_plans.py
+-- checks each hot query still uses its index. Built CONCURRENTLY so a live board keeps
+-- taking votes; psql -f runs each statement in its own transaction, as that requires.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_feedback_items_tenant_type_votes
+    ON feedback_items(tenant, item_type, vote_count DESC, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_feedback_items_tenant_votes
+    ON feedback_items(tenant, vote_count DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_feedback_items_tenant_type_created
+    ON feedback_items(tenant, item_type, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_feedback_items_tenant_status_rank
+    ON feedback_items(tenant, status, rank_score DESC);
+
+-- UNIQUE (item_id, user_id) on feedback_votes already leads with item_id
+DROP INDEX CONCURRENTLY IF EXISTS idx_feedback_votes_item;
+
+-- Superseded by the tenant-leading indexes above
+DROP INDEX CONCURRENTLY IF EXISTS idx_feedback_items_type;
+DROP INDEX CONCURRENTLY IF EXISTS idx_feedback_items_status;
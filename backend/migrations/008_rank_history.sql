@@ -0,0 +1,26 @@
+-- Rank position history for rank movement charts
+-- Each re-rank adds one rank_snapshots row and a rank_changes row only for
+-- items whose position on their item_type board moved; an item's current
+-- position is kept on feedback_items.rank_position so the previous snapshot
+-- never has to be read back. A position holds until the item's next change.
+
+ALTER TABLE feedback_items ADD COLUMN IF NOT EXISTS rank_position INTEGER;
+
+CREATE TABLE IF NOT EXISTS rank_snapshots (
+    id SERIAL PRIMARY KEY,
+    tenant VARCHAR(40) NOT NULL DEFAULT 'default',
+    taken_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    items INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_rank_snapshots_tenant_taken ON rank_snapshots(tenant, taken_at);
+
+CREATE TABLE IF NOT EXISTS rank_changes (
+    item_id UUID NOT NULL REFERENCES feedback_items(id) ON DELETE CASCADE,
+    snapshot_id INTEGER NOT NULL REFERENCES rank_snapshots(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (item_id, snapshot_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rank_changes_snapshot ON rank_changes(snapshot_id, item_id, position);
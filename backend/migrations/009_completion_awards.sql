@@ -0,0 +1,8 @@
+-- Completion credit awards
+-- Bulk status transitions credit an item's owner once when it is completed
+-- (developed for wishlist items, bug_verified for bugs). The database
+-- enforces the once, so replayed or overlapping requests award nothing twice.
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_credit_transactions_completed_item
+    ON credit_transactions(item_id)
+    WHERE transaction_type IN ('developed', 'bug_verified');
@@ -0,0 +1,82 @@
+-- Optional: LIST-partition the high-volume child tables by board.
+-- Not applied by the migrations loop (it only reads migrations/*.sql).
+-- Run once, in a maintenance window, after the numbered migrations:
+--
+--     psql $DATABASE_URL -f backend/migrations/optional/partition_by_tenant.sql
+--
+-- Each board then gets its own heap and indexes, so vacuum, cache residency
+-- and index depth on one board are independent of another board's volume.
+-- feedback_items keeps a single heap because votes, comments and credit
+-- transactions reference feedback_items(id), and a partitioned table cannot
+-- expose a unique key that excludes the partition column. credit_transactions
+-- stays unpartitioned because the top-ranked ON CONFLICT target is the
+-- (item_id) partial unique index. Add a partition per board listed in TENANTS.
+--
+-- Indexes match the migrations through 007_hot_path_indexes.sql. A unique key
+-- on a partitioned table must include tenant, so the vote key becomes
+-- (item_id, user_id, tenant) under the model's name,
+-- feedback_votes_item_id_user_id_key; an item lives on one board, so it still
+-- allows one vote per user per item. It still leads with item_id, so it
+-- serves per-item lookups and the delete cascade, and idx_feedback_votes_item
+-- stays dropped. An ON CONFLICT on votes should name the constraint
+-- (ON CONFLICT ON CONSTRAINT feedback_votes_item_id_user_id_key), which
+-- resolves on both layouts.
+
+BEGIN;
+
+-- Votes
+ALTER TABLE feedback_votes RENAME TO feedback_votes_unpartitioned;
+
+CREATE TABLE feedback_votes (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    tenant VARCHAR(40) NOT NULL DEFAULT 'default',
+    item_id UUID NOT NULL REFERENCES feedback_items(id) ON DELETE CASCADE,
+    user_id VARCHAR(100) NOT NULL,
+    vote_type VARCHAR(10) DEFAULT 'up' CHECK (vote_type IN ('up', 'down')),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (tenant, id)
+) PARTITION BY LIST (tenant);
+
+CREATE TABLE feedback_votes_default PARTITION OF feedback_votes FOR VALUES IN ('default');
+CREATE TABLE feedback_votes_bumblebee PARTITION OF feedback_votes FOR VALUES IN ('bumblebee');
+CREATE TABLE feedback_votes_other PARTITION OF feedback_votes DEFAULT;
+
+INSERT INTO feedback_votes (id, tenant, item_id, user_id, vote_type, created_at)
+SELECT id, tenant, item_id, user_id, vote_type, created_at FROM feedback_votes_unpartitioned;
+DROP TABLE feedback_votes_unpartitioned;
+
+-- Added once the old table, which holds the name, is gone
+ALTER TABLE feedback_votes ADD CONSTRAINT feedback_votes_item_id_user_id_key UNIQUE (item_id, user_id, tenant);
+CREATE INDEX idx_feedback_votes_tenant_user ON feedback_votes(tenant, user_id, item_id);
+
+-- Comments
+ALTER TABLE feedback_comments RENAME TO feedback_comments_unpartitioned;
+
+CREATE TABLE feedback_comments (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    tenant VARCHAR(40) NOT NULL DEFAULT 'default',
+    item_id UUID NOT NULL REFERENCES feedback_items(id) ON DELETE CASCADE,
+    user_id VARCHAR(100) NOT NULL,
+    x_handle VARCHAR(50),
+    content TEXT NOT NULL,
+    is_product_owner BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (tenant, id)
+) PARTITION BY LIST (tenant);
+
+CREATE TABLE feedback_comments_default PARTITION OF feedback_comments FOR VALUES IN ('default');
+CREATE TABLE feedback_comments_bumblebee PARTITION OF feedback_comments FOR VALUES IN ('bumblebee');
+CREATE TABLE feedback_comments_other PARTITION OF feedback_comments DEFAULT;
+
+INSERT INTO feedback_comments (id, tenant, item_id, user_id, x_handle, content, is_product_owner, created_at)
+SELECT id, tenant, item_id, user_id, x_handle, content, is_product_owner, created_at
+FROM feedback_comments_unpartitioned;
+DROP TABLE feedback_comments_unpartitioned;
+
+CREATE INDEX idx_feedback_comments_item_created ON feedback_comments(item_id, created_at, id);
+CREATE INDEX idx_feedback_comments_item_po ON feedback_comments(item_id, created_at DESC) WHERE is_product_owner;
+
+COMMIT;
+
+ANALYZE feedback_votes;
+ANALYZE feedback_comments;
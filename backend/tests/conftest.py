@@ -0,0 +1,105 @@
+"""
+Fixtures for the backend tests.
+
+    cd backend && DATABASE_URL=postgresql://localhost/appfeedback_test python -m pytest tests
+
+Tests that need Postgres run against DATABASE_URL (all migrations applied) and
+are skipped when it is unset. They only write to the "pytest" board, which is
+deleted before and after the session, so other boards are left alone.
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TENANT = "pytest"
+ADMIN_TOKEN = "pytest-admin"
+
+# Settings are read at import: count statements per response, add the test board, don't throttle
+os.environ["DEBUG_QUERIES"] = "true"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["ADMIN_TOKEN"] = ADMIN_TOKEN
+os.environ["TENANTS"] = os.environ.get("TENANTS", "default,bumblebee") + f",{TENANT}"
+
+# Tables holding the test board's rows; votes, comments and rank changes cascade from items
+TENANT_TABLES = ("credit_transactions", "feedback_items", "user_credits", "daily_rollups",
+                 "vote_velocity_buckets", "rank_snapshots")
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole session, so the engine's pooled connections stay usable
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.main import app
+    return app
+
+
+@pytest.fixture(scope="session")
+async def database():
+    """The DATABASE_URL engine with the test board cleared before and after the session."""
+    if not os.environ.get("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+    from app.database import engine
+
+    await clear_board(engine)
+    yield engine
+    await clear_board(engine)
+    await engine.dispose()
+
+
+async def clear_board(engine):
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        for table in TENANT_TABLES:
+            await conn.execute(text(f"DELETE FROM {table} WHERE tenant = :tenant"), {"tenant": TENANT})
+
+
+@pytest.fixture(scope="session")
+async def client(app, database):
+    """HTTP client scoped to the test board, sending the admin token."""
+    import httpx
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test",
+        headers={"X-Variant": TENANT, "Authorization": f"Bearer {ADMIN_TOKEN}"},
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+async def board(client):
+    """A small board built through the API: items from a few owners, votes, comments and one re-rank."""
+    started = datetime.now(timezone.utc) - timedelta(seconds=1)
+    owners = [f"pytest-owner-{n}" for n in range(3)]
+    voters = [f"pytest-voter-{n}" for n in range(5)]
+    items = []
+    for n in range(12):
+        response = await client.post("/api/feedback", json={
+            "item_type": "bug" if n % 3 == 0 else "wishlist",
+            "title": f"Test item {n}",
+            "description": f"A description long enough for test item {n}.",
+            "user_id": owners[n % len(owners)],
+        })
+        response.raise_for_status()
+        items.append(response.json())
+    for n, item in enumerate(items):
+        for voter in voters[: n % len(voters) + 1]:
+            response = await client.post(f"/api/feedback/{item['id']}/vote", json={"user_id": voter})
+            response.raise_for_status()
+        for m in range(3):
+            response = await client.post(f"/api/feedback/{item['id']}/comments", json={
+                "user_id": voters[m], "content": f"Comment {m}", "is_product_owner": m == 2,
+            })
+            response.raise_for_status()
+    (await client.post("/api/ranking/run")).raise_for_status()
+    return SimpleNamespace(items=items, owners=owners, voters=voters, started=started)
@@ -0,0 +1,20 @@
+"""
+require_admin answers 401 for every wrong Authorization header, including
+ones that are not ASCII (Starlette decodes header bytes as latin-1).
+"""
+import pytest
+from fastapi import HTTPException
+
+from app.admin import require_admin
+from conftest import ADMIN_TOKEN
+
+
+def test_admin_token_is_accepted():
+    assert require_admin(f"Bearer {ADMIN_TOKEN}") is None
+
+
+@pytest.mark.parametrize("authorization", [None, "", "Bearer wrong", f"Bearer {ADMIN_TOKEN}é", "Bearer ©"])
+def test_wrong_admin_token_is_refused(authorization):
+    with pytest.raises(HTTPException) as refused:
+        require_admin(authorization)
+    assert refused.value.status_code == 401
@@ -0,0 +1,50 @@
+"""
+Completing items through POST /api/feedback/bulk/status pays each owner once
+(services/completions.py): the developed bonus for wishlist items, the
+verified-bug bonus for bugs. Only developed items count towards items_developed.
+"""
+import pytest
+from sqlalchemy import text
+
+from app.config import get_settings
+from conftest import TENANT
+
+pytestmark = pytest.mark.anyio
+
+OWNERS = {"wishlist": "pytest-completer-wishlist", "bug": "pytest-completer-bug"}
+
+
+async def test_completion_awards_and_counters(client, database):
+    settings = get_settings()
+    item_ids = []
+    for item_type, user_id in OWNERS.items():
+        response = await client.post("/api/feedback", json={
+            "item_type": item_type,
+            "title": f"Completed {item_type}",
+            "description": "Submitted by the completion test.",
+            "user_id": user_id,
+        })
+        assert response.status_code == 200, response.text
+        item_ids.append(response.json()["id"])
+
+    body = {"item_ids": item_ids, "status": "completed"}
+    response = await client.post("/api/feedback/bulk/status", json=body)
+    assert response.status_code == 200, response.text
+    assert response.json()["awards"] == {
+        "developed": {"items": 1, "credits": settings.credits_developed},
+        "bug_verified": {"items": 1, "credits": settings.credits_bug_verified},
+    }
+    replay = await client.post("/api/feedback/bulk/status", json=body)
+    assert replay.json()["awards"] == {}
+
+    async with database.connect() as conn:
+        rows = await conn.execute(text(
+            "SELECT user_id, credits_balance, items_developed FROM user_credits"
+            " WHERE tenant = :tenant AND user_id = ANY(:users)"
+        ), {"tenant": TENANT, "users": list(OWNERS.values())})
+        credits = {user_id: (balance, developed) for user_id, balance, developed in rows}
+    submission = settings.credits_submission
+    assert credits == {
+        OWNERS["wishlist"]: (submission + settings.credits_developed, 1),
+        OWNERS["bug"]: (submission + settings.credits_bug_verified, 0),
+    }
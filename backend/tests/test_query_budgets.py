@@ -0,0 +1,130 @@
+"""
+Every route pins the most SQL statements it may issue per request.
+
+The pinned numbers live here and on the routes (openapi_extra={"x-query-budget": N});
+raising a budget means changing both, so it shows up in review.
+"""
+import pytest
+from fastapi.routing import APIRoute
+
+from app.metrics import assert_query_budget
+
+pytestmark = pytest.mark.anyio
+
+BUDGETS = {
+    ("GET", "/api/health"): 0,
+    ("GET", "/api/metrics"): 0,
+    ("GET", "/api/stats"): 6,
+    ("GET", "/api/stats/timeseries"): 1,
+    ("POST", "/api/feedback"): 1,
+    ("GET", "/api/feedback"): 4,
+    ("GET", "/api/feedback/batch"): 4,
+    ("GET", "/api/feedback/{item_id}"): 4,
+    ("PUT", "/api/feedback/{item_id}"): 4,
+    ("POST", "/api/feedback/bulk/status"): 3,
+    ("DELETE", "/api/feedback/{item_id}"): 2,
+    ("POST", "/api/feedback/{item_id}/vote"): 11,
+    ("GET", "/api/feedback/{item_id}/comments"): 1,
+    ("POST", "/api/feedback/{item_id}/comments"): 4,
+    ("GET", "/api/credits/balance"): 1,
+    ("GET", "/api/credits/history"): 1,
+    ("GET", "/api/credits/leaderboard"): 1,
+    ("GET", "/api/ranking/results"): 1,
+    ("POST", "/api/ranking/run"): 13,
+    ("GET", "/api/ranking/history/{item_id}"): 1,
+    ("GET", "/api/ranking/movers"): 1,
+    ("GET", "/api/ranking/snapshots"): 1,
+    ("GET", "/api/ranking/algorithm"): 1,
+    ("GET", "/api/ranking/algorithm/history"): 1,
+    ("GET", "/api/ranking/shadow"): 4,
+}
+
+# (method, route, path, body) in run order; {item}, {other}, {owner}, {voter} and {since} come from the board.
+# The delete runs last because it removes {other}.
+REQUESTS = [
+    ("GET", "/api/health", "/api/health", None),
+    ("GET", "/api/feedback", "/api/feedback?sort_by=rank&user_id={voter}", None),
+    ("GET", "/api/feedback", "/api/feedback?sort_by=votes&item_type=bug&user_id={voter}", None),
+    ("GET", "/api/feedback", "/api/feedback?sort_by=recent&status=new", None),
+    ("GET", "/api/feedback", "/api/feedback?sort_by=trending&user_id={voter}", None),
+    ("GET", "/api/feedback", "/api/feedback?view=summary&user_id={voter}", None),
+    ("GET", "/api/feedback/batch", "/api/feedback/batch?ids={item},{other}&user_id={voter}", None),
+    ("GET", "/api/feedback/{item_id}", "/api/feedback/{item}?user_id={voter}", None),
+    ("GET", "/api/feedback/{item_id}", "/api/feedback/{item}?user_id=pytest-nobody", None),
+    ("PUT", "/api/feedback/{item_id}", "/api/feedback/{item}?user_id={owner}", {"status": "planned"}),
+    ("POST", "/api/feedback/{item_id}/vote", "/api/feedback/{other}/vote", {"user_id": "pytest-budget", "vote_type": "up"}),
+    ("POST", "/api/feedback/{item_id}/vote", "/api/feedback/{other}/vote", {"user_id": "pytest-budget", "vote_type": "down"}),
+    ("POST", "/api/feedback/{item_id}/vote", "/api/feedback/{other}/vote", {"user_id": "pytest-budget", "vote_type": "down"}),
+    ("GET", "/api/feedback/{item_id}/comments", "/api/feedback/{item}/comments", None),
+    ("GET", "/api/feedback/{item_id}/comments", "/api/feedback/{item}/comments?view=summary", None),
+    ("POST", "/api/feedback/{item_id}/comments", "/api/feedback/{item}/comments", {"user_id": "{voter}", "content": "Budget"}),
+    ("POST", "/api/feedback", "/api/feedback", {"item_type": "wishlist", "title": "Budget check",
+                                                 "description": "Submitted by the query budget test.", "user_id": "{owner}"}),
+    ("POST", "/api/feedback/bulk/status", "/api/feedback/bulk/status", {"item_ids": ["{item}"], "status": "completed"}),
+    ("GET", "/api/credits/balance", "/api/credits/balance?user_id={owner}", None),
+    ("GET", "/api/credits/history", "/api/credits/history?user_id={owner}", None),
+    ("GET", "/api/credits/leaderboard", "/api/credits/leaderboard", None),
+    ("GET", "/api/stats", "/api/stats", None),
+    ("GET", "/api/stats/timeseries", "/api/stats/timeseries?start={today}", None),
+    ("GET", "/api/ranking/results", "/api/ranking/results?item_type=wishlist", None),
+    ("POST", "/api/ranking/run", "/api/ranking/run", None),
+    ("GET", "/api/ranking/history/{item_id}", "/api/ranking/history/{item}?since={since}", None),
+    ("GET", "/api/ranking/movers", "/api/ranking/movers?since={since}", None),
+    ("GET", "/api/ranking/snapshots", "/api/ranking/snapshots", None),
+    ("GET", "/api/ranking/algorithm", "/api/ranking/algorithm", None),
+    ("GET", "/api/ranking/algorithm/history", "/api/ranking/algorithm/history", None),
+    ("GET", "/api/ranking/shadow", "/api/ranking/shadow?weight_votes=2.0", None),
+    ("DELETE", "/api/feedback/{item_id}", "/api/feedback/{other}?user_id={other_owner}", None),
+    ("GET", "/api/metrics", "/api/metrics", None),
+]
+
+
+def _declared_budgets(app) -> dict:
+    return {
+        (method, route.path): (route.openapi_extra or {}).get("x-query-budget")
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+
+def test_every_route_declares_its_pinned_budget(app):
+    declared = _declared_budgets(app)
+    missing = sorted(key for key, budget in declared.items() if budget is None)
+    assert not missing, f"routes without openapi_extra x-query-budget: {missing}"
+    # The dashboard routes only exist when dashboard/dist is built; they issue no queries
+    changed = {key: budget for key, budget in declared.items() if BUDGETS.get(key, 0) != budget}
+    assert not changed, f"budgets differ from the pinned ones: {changed}"
+    assert set(BUDGETS) <= set(declared), f"pinned routes that no longer exist: {set(BUDGETS) - set(declared)}"
+
+
+def test_every_budgeted_route_is_exercised():
+    exercised = {(method, route) for method, route, _, _ in REQUESTS}
+    assert set(BUDGETS) - exercised == set()
+
+
+def _fill(value, values: dict):
+    if isinstance(value, str):
+        return value.format(**values)
+    if isinstance(value, list):
+        return [_fill(element, values) for element in value]
+    if isinstance(value, dict):
+        return {key: _fill(element, values) for key, element in value.items()}
+    return value
+
+
+@pytest.mark.parametrize("method, route, path, body", REQUESTS, ids=[f"{m} {p}" for m, _, p, _ in REQUESTS])
+async def test_route_stays_within_budget(client, board, method, route, path, body):
+    item, other = board.items[0], board.items[1]
+    values = {
+        "item": item["id"],
+        "other": other["id"],
+        "owner": item["user_id"],
+        "other_owner": other["user_id"],
+        "voter": board.voters[0],
+        "since": board.started.isoformat().replace("+00:00", "Z"),
+        "today": board.started.date().isoformat(),
+    }
+    response = await client.request(method, _fill(path, values), json=_fill(body, values))
+    assert response.status_code < 400, response.text
+    assert_query_budget(response, BUDGETS[(method, route)])
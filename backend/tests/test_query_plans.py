@@ -0,0 +1,98 @@
+"""
+The hot read queries are served by the index built for them.
+
+Each request below is sent against the test board; every SELECT it issues is
+EXPLAINed with the same parameters, and the named index must appear as an
+Index Scan or Index Only Scan in one of the plans. The test board is tiny, so
+sequential and bitmap scans are turned off while explaining: the planner then
+picks the index it would use on a full-size board, and fails the test only
+if no suitable index exists or the query can no longer use it.
+"""
+import json
+
+import pytest
+from sqlalchemy import event, text
+
+pytestmark = pytest.mark.anyio
+
+# Never read as elsewhere, so its vote set is not cached yet and the vote-cache load runs
+PLAN_VOTER = "pytest-plan-voter"
+
+# (method, path, body, index its hot query must scan); {item}, {owner}, {since} and {today} come from the board
+HOT_QUERIES = [
+    ("GET", "/api/feedback?sort_by=rank", None, "idx_feedback_items_tenant_rank"),
+    ("GET", "/api/feedback?sort_by=rank&item_type=bug", None, "idx_feedback_items_tenant_type_rank"),
+    ("GET", "/api/feedback?sort_by=votes", None, "idx_feedback_items_tenant_votes"),
+    ("GET", "/api/feedback?sort_by=votes&item_type=bug", None, "idx_feedback_items_tenant_type_votes"),
+    ("GET", "/api/feedback?sort_by=recent", None, "idx_feedback_items_tenant_created"),
+    ("GET", "/api/feedback?sort_by=recent&item_type=bug", None, "idx_feedback_items_tenant_type_created"),
+    ("GET", "/api/feedback?status=planned", None, "idx_feedback_items_tenant_status_rank"),
+    ("GET", "/api/feedback?sort_by=trending", None, "idx_vote_velocity_tenant_bucket"),
+    ("GET", f"/api/feedback?user_id={PLAN_VOTER}", None, "idx_feedback_votes_tenant_user"),
+    ("GET", "/api/feedback/{item}", None, "feedback_items_pkey"),
+    # A voter has far fewer votes than a popular item, so the existing-vote lookup goes by voter
+    ("POST", "/api/feedback/{item}/vote", {"user_id": PLAN_VOTER, "vote_type": "up"}, "idx_feedback_votes_tenant_user"),
+    ("GET", "/api/feedback/{item}/comments", None, "idx_feedback_comments_item_created"),
+    ("GET", "/api/feedback/{item}/comments", None, "idx_feedback_comments_item_po"),
+    ("GET", "/api/credits/balance?user_id={owner}", None, "uq_user_credits_tenant_user"),
+    ("GET", "/api/credits/history?user_id={owner}", None, "idx_credit_transactions_tenant_user"),
+    ("GET", "/api/credits/leaderboard", None, "idx_user_credits_tenant_earned"),
+    ("GET", "/api/ranking/history/{item}?since={since}", None, "rank_changes_pkey"),
+    ("GET", "/api/ranking/movers?since={since}", None, "idx_rank_snapshots_tenant_taken"),
+    ("GET", "/api/ranking/snapshots", None, "idx_rank_snapshots_tenant_taken"),
+    ("GET", "/api/stats/timeseries?start={today}", None, "daily_rollups_pkey"),
+]
+
+
+def scanned_indexes(plan: dict) -> set:
+    """Indexes read by Index Scan and Index Only Scan nodes anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    found = {plan["Index Name"]} if plan["Node Type"] in ("Index Scan", "Index Only Scan") else set()
+    for child in plan.get("Plans", []):
+        found |= scanned_indexes(child)
+    return found
+
+
+@pytest.fixture(scope="module")
+async def planner_statistics(board, database):
+    """Fresh statistics, so plans reflect the board rather than an empty table's defaults."""
+    async with database.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+
+@pytest.fixture
+def captured(database):
+    """SELECTs the app issues while the test runs, with their parameters."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(database.sync_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(database.sync_engine, "before_cursor_execute", capture)
+
+
+@pytest.mark.parametrize("method, path, body, index", HOT_QUERIES,
+                         ids=[f"{method} {path} {index}" for method, path, _, index in HOT_QUERIES])
+async def test_hot_query_uses_its_index(client, board, database, planner_statistics, captured, method, path, body, index):
+    item = board.items[0]
+    path = path.format(
+        item=item["id"],
+        owner=item["user_id"],
+        since=board.started.isoformat().replace("+00:00", "Z"),
+        today=board.started.date().isoformat(),
+    )
+    response = await client.request(method, path, json=body)
+    assert response.status_code == 200, response.text
+    assert captured, f"{path} issued no SELECT"
+
+    scans = set()
+    async with database.connect() as conn:
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        await conn.exec_driver_sql("SET LOCAL enable_bitmapscan = off")
+        for statement, parameters in captured:
+            plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+            scans |= scanned_indexes((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+        await conn.rollback()
+    assert index in scans, f"{path} scanned {sorted(scans) or 'no index'}, not {index}"
@@ -0,0 +1,139 @@
+"""
+Admission control (app/ratelimit.py) without a database: token bucket refill
+and LRU eviction, which X-Forwarded-For hop the IP bucket trusts, and the cap
+on how much of a request body is read to find its user_id.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import ratelimit
+from app.ratelimit import AdmissionControlMiddleware, MAX_INSPECTED_BODY, TokenBucketLimiter, _client_ip, _peek_body
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A manual clock for the limiter; advance it with clock.now += seconds."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(ratelimit, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+async def test_bucket_refills_at_its_rate_up_to_the_burst(clock):
+    limiter = TokenBucketLimiter(max_keys=10)
+    assert [await limiter.acquire("k", 1.0, 2) for _ in range(2)] == [0.0, 0.0]
+    assert await limiter.acquire("k", 1.0, 2) == pytest.approx(1.0)
+
+    clock.now += 0.5
+    assert await limiter.acquire("k", 1.0, 2) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert await limiter.acquire("k", 1.0, 2) == 0.0
+
+    # A long pause refills to the burst, not beyond it
+    clock.now += 3600
+    assert [await limiter.acquire("k", 1.0, 2) for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+
+
+async def test_least_recently_used_bucket_is_evicted(clock):
+    limiter = TokenBucketLimiter(max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        await limiter.acquire(key, 1.0, 1)
+
+    assert len(limiter) == 2
+    # "a" was used after "b", so it kept its empty bucket; "b" was evicted and comes back full
+    assert await limiter.acquire("a", 1.0, 1) == pytest.approx(1.0)
+    assert await limiter.acquire("b", 1.0, 1) == 0.0
+    assert len(limiter) == 2
+
+
+def _scope(*forwarded: bytes, peer: str = "10.0.0.9") -> dict:
+    return {"client": (peer, 50000), "headers": [(b"x-forwarded-for", value) for value in forwarded]}
+
+
+@pytest.mark.parametrize("hops, forwarded, expected", [
+    (0, [b"6.6.6.6, 1.2.3.4"], "10.0.0.9"),
+    (1, [b"6.6.6.6, 1.2.3.4"], "1.2.3.4"),
+    (2, [b"6.6.6.6, 1.2.3.4"], "6.6.6.6"),
+    (2, [b"6.6.6.6", b"5.5.5.5, 1.2.3.4"], "5.5.5.5"),
+    (3, [b"1.2.3.4"], "10.0.0.9"),
+    (1, [], "10.0.0.9"),
+])
+def test_ip_bucket_trusts_only_the_configured_hops(monkeypatch, hops, forwarded, expected):
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_trusted_proxies", hops)
+    assert _client_ip(_scope(*forwarded)) == expected
+
+
+def _receiver(chunks):
+    messages = [{"type": "http.request", "body": chunk, "more_body": n < len(chunks) - 1}
+                for n, chunk in enumerate(chunks)]
+    read = []
+
+    async def receive():
+        message = messages.pop(0)
+        read.append(message)
+        return message
+
+    return receive, read
+
+
+async def _drain(receive) -> bytes:
+    body, more_body = b"", True
+    while more_body:
+        message = await receive()
+        body += message["body"]
+        more_body = message["more_body"]
+    return body
+
+
+async def test_small_body_is_peeked_and_replayed():
+    chunks = [b'{"user_id": ', b'"alice"}']
+    receive, _ = _receiver(chunks)
+    body, replay = await _peek_body(receive)
+    assert body == b"".join(chunks)
+    assert await _drain(replay) == body
+
+
+async def test_body_past_the_cap_is_not_buffered():
+    chunk = b"x" * (16 * 1024)
+    chunks = [chunk] * (MAX_INSPECTED_BODY // len(chunk) + 4)
+    receive, read = _receiver(chunks)
+    body, replay = await _peek_body(receive)
+
+    assert body is None
+    # Reading stopped just past the cap instead of draining the stream
+    assert len(read) == MAX_INSPECTED_BODY // len(chunk) + 1
+    assert await _drain(replay) == b"".join(chunks)
+
+
+async def test_user_bucket_rejects_with_retry_after(monkeypatch, clock):
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_trusted_proxies", 0)
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_submit_burst", 1)
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_submit_per_minute", 5)  # a token every 12 s
+    passed = []
+
+    async def app(scope, receive, send):
+        passed.append(await _drain(receive))
+
+    middleware = AdmissionControlMiddleware(app, limiter=TokenBucketLimiter(100), max_in_flight=4)
+
+    async def submit(user_id):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        receive, _ = _receiver([json.dumps({"user_id": user_id}).encode()])
+        scope = {"type": "http", "method": "POST", "path": "/api/feedback", **_scope()}
+        await middleware(scope, receive, send)
+        return sent
+
+    assert await submit("alice") == []
+    [start, _] = await submit("alice")
+    assert start["status"] == 429
+    assert (b"retry-after", b"12") in start["headers"]
+    assert await submit("bob") == []
+    assert passed == [b'{"user_id": "alice"}', b'{"user_id": "bob"}']
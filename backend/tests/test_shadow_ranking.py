@@ -0,0 +1,57 @@
+"""
+The shadow-ranking maths (services/shadow_ranking.py) checked against
+brute-force definitions: inversion counts, Kendall tau and rank positions.
+"""
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from app.services.shadow_ranking import DEFAULT_WEIGHTS, Corpus, count_inversions, evaluate, kendall_tau, rank_positions
+
+
+def _brute_force_inversions(sequence) -> int:
+    return sum(1 for i, j in combinations(range(len(sequence)), 2) if sequence[i] > sequence[j])
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 5, 8, 13, 64, 100, 257])
+def test_count_inversions_matches_brute_force(n):
+    rng = np.random.default_rng(n)
+    for _ in range(5):
+        permutation = rng.permutation(n)
+        assert count_inversions(permutation) == _brute_force_inversions(permutation)
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 1000])
+def test_count_inversions_extremes(n):
+    assert count_inversions(np.arange(n)) == 0
+    assert count_inversions(np.arange(n)[::-1]) == n * (n - 1) // 2
+
+
+def test_kendall_tau_bounds():
+    positions = np.random.default_rng(1).permutation(50)
+    assert kendall_tau(positions, positions) == 1.0
+    assert kendall_tau(positions, 49 - positions) == -1.0
+    assert kendall_tau(np.arange(1), np.arange(1)) == 1.0
+
+
+def test_rank_positions_break_ties_by_corpus_order():
+    assert rank_positions(np.array([1.0, 3.0, 3.0, 2.0])).tolist() == [3, 0, 1, 2]
+
+
+def _corpus(votes) -> Corpus:
+    n = len(votes)
+    return Corpus(np.array([f"item-{i}" for i in range(n)], dtype=object), np.array(votes, dtype=np.float64),
+                  np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n))
+
+
+def test_evaluate_reports_reordering():
+    corpus = _corpus([5, 4, 3, 2, 1])
+    same = evaluate(corpus, DEFAULT_WEIGHTS, DEFAULT_WEIGHTS)
+    assert same["kendall_tau"] == 1.0
+    assert same["movers"] == []
+    assert same["top_k_overlap"]["10"] == 1.0
+
+    flipped = evaluate(corpus, DEFAULT_WEIGHTS, {**DEFAULT_WEIGHTS, "weight_votes": -1.0})
+    assert flipped["kendall_tau"] == -1.0
+    assert flipped["movers"][0] == {"item_id": "item-0", "active_position": 1, "candidate_position": 5, "change": -4}
@@ -0,0 +1,73 @@
+"""
+The dashboard's in-memory static index (app/static.py): hashed assets are
+cached forever, everything else revalidates, client routes fall back to the
+SPA shell, and compressed variants carry their own ETag.
+"""
+import pytest
+from starlette.requests import Request
+
+from app import static
+from app.static import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, InvalidStaticPath, StaticIndex
+
+HASHED_SCRIPT = "assets/index-4f1a2b3c.js"
+
+
+@pytest.fixture
+def dashboard(tmp_path, monkeypatch):
+    # Without the optional brotli package only gzip variants exist; pin that either way
+    monkeypatch.setattr(static, "_brotli_compress", lambda data: None)
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<!doctype html><div id=root></div>")
+    (tmp_path / HASHED_SCRIPT).write_text("console.log('dashboard');\n" * 200)
+    (tmp_path / "assets" / "logo.svg").write_text("<svg/>")
+    (tmp_path / "robots.txt").write_text("User-agent: *\n")
+    return StaticIndex(str(tmp_path))
+
+
+def _request(**headers) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/",
+                    "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]})
+
+
+@pytest.mark.parametrize("path, cache_control", [
+    (HASHED_SCRIPT, IMMUTABLE_CACHE_CONTROL),
+    ("assets/logo.svg", REVALIDATE_CACHE_CONTROL),
+    ("index.html", REVALIDATE_CACHE_CONTROL),
+    ("robots.txt", REVALIDATE_CACHE_CONTROL),
+])
+def test_only_hashed_assets_are_immutable(dashboard, path, cache_control):
+    response = dashboard.response(_request(), dashboard.lookup(path))
+    assert response.headers["cache-control"] == cache_control
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_client_routes_fall_back_to_the_shell(dashboard):
+    assert dashboard.lookup("/board/items/42").path == "index.html"
+    assert dashboard.lookup("assets/missing-12345678.js") is None
+    assert dashboard.lookup("api/unknown") is None
+    with pytest.raises(InvalidStaticPath):
+        dashboard.lookup("assets/../../etc/passwd")
+
+
+def test_compressed_variant_has_its_own_etag(dashboard):
+    asset = dashboard.lookup(HASHED_SCRIPT)
+    plain = dashboard.response(_request(), asset)
+    gzipped = dashboard.response(_request(accept_encoding="gzip, br;q=0"), asset)
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert len(gzipped.body) < len(plain.body)
+    assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    # Small files are not worth compressing
+    assert dashboard.lookup("index.html").variants.keys() == {"identity"}
+
+
+def test_matching_etag_is_not_modified(dashboard):
+    asset = dashboard.lookup(HASHED_SCRIPT)
+    etag = dashboard.response(_request(accept_encoding="gzip"), asset).headers["etag"]
+
+    response = dashboard.response(_request(accept_encoding="gzip", if_none_match=etag), asset)
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    # The identity representation has a different ETag, so it is sent in full
+    assert dashboard.response(_request(if_none_match=etag), asset).status_code == 200
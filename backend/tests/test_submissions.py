@@ -0,0 +1,75 @@
+"""
+POST /api/feedback stores the item, the submission credit, the submitter's
+balance and the daily rollups in one statement (services/submissions.py).
+
+Concurrent submissions from the same users race on the same user_credits and
+daily_rollups rows; the ON CONFLICT upserts must add every one of them up.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.config import get_settings
+from conftest import TENANT
+
+pytestmark = pytest.mark.anyio
+
+SUBMITTERS = [f"pytest-submitter-{n}" for n in range(4)]
+PER_SUBMITTER = 10
+
+
+async def _rollups(engine) -> dict:
+    async with engine.connect() as conn:
+        rows = await conn.execute(text(
+            "SELECT metric, dimension, SUM(value) FROM daily_rollups WHERE tenant = :tenant GROUP BY metric, dimension"
+        ), {"tenant": TENANT})
+        return {(metric, dimension): total for metric, dimension, total in rows}
+
+
+async def test_concurrent_submissions_add_up(client, database):
+    amount = get_settings().credits_submission
+    before = await _rollups(database)
+
+    responses = await asyncio.gather(*(
+        client.post("/api/feedback", json={
+            "item_type": "bug" if n % 2 else "wishlist",
+            "title": f"Concurrent submission {n}",
+            "description": f"Submitted concurrently by {user_id}.",
+            "user_id": user_id,
+            "x_handle": "pytest" if n == PER_SUBMITTER - 1 else None,
+        })
+        for n in range(PER_SUBMITTER)
+        for user_id in SUBMITTERS
+    ))
+    assert [response.status_code for response in responses] == [200] * len(responses)
+    item_ids = {response.json()["id"] for response in responses}
+    assert len(item_ids) == len(SUBMITTERS) * PER_SUBMITTER
+
+    async with database.connect() as conn:
+        balances = (await conn.execute(text(
+            "SELECT user_id, credits_balance, credits_earned_total, items_submitted, x_handle"
+            " FROM user_credits WHERE tenant = :tenant AND user_id = ANY(:users)"
+        ), {"tenant": TENANT, "users": SUBMITTERS})).all()
+        ledger = (await conn.execute(text(
+            "SELECT user_id, COUNT(*), SUM(amount), COUNT(DISTINCT item_id) FROM credit_transactions"
+            " WHERE tenant = :tenant AND user_id = ANY(:users) AND transaction_type = 'submission' GROUP BY user_id"
+        ), {"tenant": TENANT, "users": SUBMITTERS})).all()
+        items = (await conn.execute(text(
+            "SELECT COUNT(*) FROM feedback_items WHERE tenant = :tenant AND user_id = ANY(:users)"
+        ), {"tenant": TENANT, "users": SUBMITTERS})).scalar_one()
+
+    assert sorted(balances) == [
+        (user_id, amount * PER_SUBMITTER, amount * PER_SUBMITTER, PER_SUBMITTER, "pytest") for user_id in SUBMITTERS
+    ]
+    assert sorted(ledger) == [(user_id, PER_SUBMITTER, amount * PER_SUBMITTER, PER_SUBMITTER) for user_id in SUBMITTERS]
+    assert items == len(SUBMITTERS) * PER_SUBMITTER
+
+    after = await _rollups(database)
+    added = {key: total - before.get(key, 0) for key, total in after.items() if total != before.get(key, 0)}
+    half = len(SUBMITTERS) * PER_SUBMITTER // 2
+    assert added == {
+        ("submissions", "bug"): half,
+        ("submissions", "wishlist"): half,
+        ("credits_awarded", "submission"): amount * len(SUBMITTERS) * PER_SUBMITTER,
+    }
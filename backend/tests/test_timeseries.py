@@ -0,0 +1,29 @@
+"""
+GET /api/stats/timeseries reports every metric's dimensions in every bucket,
+with zeros for days that have no daily_rollups rows.
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.rollups import DIMENSIONS
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_quiet_days_are_zero_filled(client, database):
+    response = await client.get("/api/stats/timeseries?start=2001-01-01&end=2001-01-03")
+    assert response.status_code == 200, response.text
+    zeros = {metric: dict.fromkeys(dimensions, 0) for metric, dimensions in DIMENSIONS.items()}
+    assert response.json()["series"] == [
+        {"period": f"2001-01-0{day}", **zeros} for day in (1, 2, 3)
+    ]
+
+
+async def test_activity_lands_in_its_dimension(client, board, database):
+    start, end = board.started.date(), datetime.now(timezone.utc).date()
+    response = await client.get(f"/api/stats/timeseries?start={start}&end={end}&metrics=submissions")
+    assert response.status_code == 200, response.text
+    buckets = response.json()["series"]
+    assert all(set(bucket["submissions"]) == set(DIMENSIONS["submissions"]) for bucket in buckets)
+    assert sum(sum(bucket["submissions"].values()) for bucket in buckets) >= len(board.items)
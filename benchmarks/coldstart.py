@@ -0,0 +1,97 @@
+"""
+Measure time-to-first-fast-request for the FastAPI backend after a cold start.
+
+    python -m benchmarks.coldstart
+    python -m benchmarks.coldstart --runs 5 --no-warmup
+
+Starts uvicorn as a subprocess against DATABASE_URL, then fires bursts of
+concurrent GET /api/stats requests until one burst completes with every request
+under --fast-ms. Reports per-run seconds from process launch to the first
+response and to the first fast burst, as JSON.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.targets import ROOT
+
+PATH = "/api/stats"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def timed_get(port: int) -> tuple:
+    started = time.perf_counter()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", PATH)
+        response = conn.getresponse()
+        response.read()
+    finally:
+        conn.close()
+    return response.status, time.perf_counter() - started
+
+
+def measure(args) -> dict:
+    port = free_port()
+    env = {**os.environ, "WARMUP_ENABLED": "false" if args.no_warmup else "true", "RATE_LIMIT_ENABLED": "false"}
+    launched = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.join(ROOT, "backend"), env=env,
+    )
+    first_response = None
+    try:
+        with ThreadPoolExecutor(max_workers=args.burst) as pool:
+            while time.perf_counter() - launched < args.timeout:
+                try:
+                    results = list(pool.map(lambda _: timed_get(port), range(args.burst)))
+                except OSError:
+                    time.sleep(0.05)
+                    continue
+                if first_response is None:
+                    first_response = time.perf_counter() - launched
+                if all(status == 200 and duration * 1000 < args.fast_ms for status, duration in results):
+                    return {
+                        "first_response_s": round(first_response, 3),
+                        "first_fast_burst_s": round(time.perf_counter() - launched, 3),
+                    }
+        raise RuntimeError(f"No fast burst within {args.timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AppFeedback cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--burst", type=int, default=16, help="Concurrent requests per burst")
+    parser.add_argument("--fast-ms", type=float, default=100.0, help="Latency every request in a burst must beat")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--no-warmup", action="store_true", help="Start with WARMUP_ENABLED=false for comparison")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args) for _ in range(args.runs)]
+    print(json.dumps({
+        "warmup": not args.no_warmup,
+        "burst": args.burst,
+        "fast_ms": args.fast_ms,
+        "runs": runs,
+        "median_first_fast_burst_s": statistics.median(run["first_fast_burst_s"] for run in runs),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Memory held by the api/index.py item and vote stores, per item and per vote.
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --items 100000 1000000 --votes-per-item 3
+
+For each layout and item count a fresh interpreter builds the store the way
+the create and vote handlers do: item fields parsed from a JSON body, then
+--votes-per-item votes per item from a pool of users. tracemalloc reports the
+bytes still held after the items and again after the votes, so request
+parsing and other transient allocations are not counted. Layouts:
+
+    records  FeedbackRecord objects, user codes and int-packed votes (api/index.py)
+    dicts    the previous layout: a 22-key dict per item, "item:user" vote keys
+             mapped to "up"/"down" and a second dict of cast hours per vote key
+
+Both layouts hold the same strings, so the difference is structure alone.
+Prints JSON.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from benchmarks.targets import ROOT
+
+LAYOUTS = ("dicts", "records")
+WORDS = ("lorem", "ipsum", "dolor", "sit", "amet")
+HOUR = 490_000  # An epoch hour in 2025, so packed votes are full-size ints
+
+
+def payloads(items: int, seed: int):
+    """Create-feedback bodies as the handler sees them, with an id and timestamp."""
+    rng = random.Random(seed)
+    started = datetime(2025, 1, 1)
+    for n in range(items):
+        body = json.loads(json.dumps({
+            "item_type": "bug" if rng.random() < 0.35 else "wishlist",
+            "title": f"Benchmark item {n}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60))),
+            "user_id": f"bench-user-{rng.randrange(max(items // 20, 1))}",
+            "platform": rng.choice(("ios", "android", "web")),
+            "app_version": rng.choice(("2.3.0", "2.3.1", "2.4.0")),
+        }))
+        body["id"] = str(UUID(int=rng.getrandbits(128), version=4))
+        body["created_at"] = (started + timedelta(seconds=n)).isoformat()
+        yield body
+
+
+def voters(items: int, votes_per_item: int, seed: int):
+    """(item index, user_id, vote_type) with distinct users per item, as parsed from vote bodies."""
+    rng = random.Random(seed + 1)
+    users = max(items // 20, votes_per_item)
+    for n in range(items):
+        for user in rng.sample(range(users), votes_per_item):
+            body = json.loads(json.dumps({"user_id": f"bench-user-{user}", "vote_type": rng.choice(("up", "up", "down"))}))
+            yield n, body["user_id"], body["vote_type"]
+
+
+def build_dicts(args):
+    items, votes, vote_cast_hours = [], {}, {}
+
+    def add_items():
+        for data in payloads(args.items, args.seed):
+            items.append({
+                "id": data["id"],
+                "item_type": data["item_type"],
+                "title": data["title"],
+                "description": data["description"],
+                "user_id": data["user_id"],
+                "x_handle": data.get("x_handle"),
+                "status": "new",
+                "vote_count": 0,
+                "rank_score": 0.5,
+                "ai_feasibility_score": None,
+                "ai_impact_score": None,
+                "ai_clarity_score": None,
+                "po_notes": None,
+                "credits_awarded": 0,
+                "created_at": data["created_at"],
+                "updated_at": data["created_at"],
+                "comment_count": 0,
+                "user_voted": None,
+                "platform": data.get("platform", "unknown"),
+                "app_version": data.get("app_version", "unknown"),
+                "steps_to_reproduce": data.get("steps_to_reproduce", ""),
+                "github_issue_url": None,
+            })
+
+    def add_votes():
+        for n, user_id, vote_type in voters(args.items, args.votes_per_item, args.seed):
+            vote_key = f"{items[n]['id']}:{user_id}"
+            vote_cast_hours[vote_key] = HOUR
+            votes[vote_key] = vote_type
+
+    return (items, votes, vote_cast_hours), add_items, add_votes
+
+
+def build_records(args):
+    sys.path.insert(0, os.path.join(ROOT, "api"))
+    import index
+
+    def add_items():
+        for data in payloads(args.items, args.seed):
+            index.store_item(index.FeedbackRecord(
+                id=data["id"],
+                item_type=data["item_type"],
+                title=data["title"],
+                description=data["description"],
+                user_id=data["user_id"],
+                x_handle=data.get("x_handle"),
+                created_at=data["created_at"],
+                platform=data.get("platform", "unknown"),
+                app_version=data.get("app_version", "unknown"),
+                steps_to_reproduce=data.get("steps_to_reproduce", ""),
+            ))
+
+    def add_votes():
+        for n, user_id, vote_type in voters(args.items, args.votes_per_item, args.seed):
+            index.set_vote(index.feedback_items[n], user_id, vote_type, HOUR)
+
+    return index, add_items, add_votes
+
+
+def measure(args) -> dict:
+    """Runs in the child: bytes held after building items, then after adding votes."""
+    store, add_items, add_votes = (build_records if args.layout == "records" else build_dicts)(args)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    add_items()
+    gc.collect()
+    after_items = tracemalloc.get_traced_memory()[0]
+    add_votes()
+    gc.collect()
+    after_votes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    votes = args.items * args.votes_per_item
+    return {
+        "layout": args.layout,
+        "items": args.items,
+        "votes": votes,
+        "item_bytes": after_items - baseline,
+        "vote_bytes": after_votes - after_items,
+        "bytes_per_item": round((after_items - baseline) / args.items, 1),
+        "bytes_per_vote": round((after_votes - after_items) / max(votes, 1), 1),
+    }
+
+
+def run_child(layout: str, items: int, args) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.memory", "--child", layout, "--items", str(items),
+         "--votes-per-item", str(args.votes_per_item), "--seed", str(args.seed)],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AppFeedback in-memory store size benchmark")
+    parser.add_argument("--items", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--votes-per-item", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", choices=LAYOUTS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        args.layout, args.items = args.child, args.items[0]
+        print(json.dumps(measure(args)))
+        return 0
+
+    report = []
+    for items in args.items:
+        runs = {layout: run_child(layout, items, args) for layout in LAYOUTS}
+        before, after = runs["dicts"], runs["records"]
+        report.append({
+            "items": items,
+            "votes": after["votes"],
+            "layouts": runs,
+            "item_bytes_saved": before["item_bytes"] - after["item_bytes"],
+            "vote_bytes_saved": before["vote_bytes"] - after["vote_bytes"],
+            "total_reduction": round(
+                1 - (after["item_bytes"] + after["vote_bytes"]) / (before["item_bytes"] + before["vote_bytes"]), 3
+            ),
+        })
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Rank history storage: bytes each re-rank snapshot adds, and the cost of reading it.
+
+    DATABASE_URL=postgresql://localhost/appfeedback_bench python -m benchmarks.rank_history
+    python -m benchmarks.rank_history --scale large --snapshots 20 --votes-per-snapshot 2000
+
+Seeds the benchmark dataset (same throwaway database rules as the fastapi
+target), then repeats: cast a batch of random votes through the API and
+POST /api/ranking/run. After each snapshot it records the rank_changes rows
+written and the growth of rank_changes plus rank_snapshots on disk, next to
+what a full per-item snapshot would have cost at the same bytes per row.
+Finally it times the position-series and top-movers reads. Prints JSON.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.targets import FastAPITarget
+from benchmarks.workload import SCALES, generate_dataset
+
+SIZE_QUERY = (
+    "SELECT pg_total_relation_size('rank_changes') + pg_total_relation_size('rank_snapshots'), "
+    "(SELECT count(*) FROM rank_changes)"
+)
+
+
+async def run(args) -> dict:
+    from sqlalchemy import text
+    from app.database import engine
+
+    target = FastAPITarget()
+    dataset = generate_dataset(SCALES[args.scale], seed=args.seed)
+    await target.seed(dataset)
+    rng = random.Random(args.seed)
+    item_ids = [str(item["id"]) for item in dataset["items"]]
+
+    async def storage() -> tuple:
+        async with engine.connect() as conn:
+            return tuple((await conn.execute(text(SIZE_QUERY))).one())
+
+    target.start()
+    snapshots = []
+    first_snapshot_at = None
+    bytes_before, _ = await storage()
+    for n in range(args.snapshots):
+        if n:
+            for _ in range(args.votes_per_snapshot):
+                await target.request("POST", f"/api/feedback/{rng.choice(item_ids)}/vote", {
+                    "user_id": rng.choice(dataset["users"]), "vote_type": rng.choice(("up", "up", "down")),
+                })
+        response = await target.client.post("/api/ranking/run")
+        response.raise_for_status()
+        first_snapshot_at = first_snapshot_at or datetime.now(timezone.utc)
+        size, rows = await storage()
+        snapshots.append({"positions_written": response.json()["positions_changed"], "bytes_added": size - bytes_before})
+        bytes_before = size
+
+    bytes_per_row = size / max(rows, 1)
+    timings = {}
+    since = {"since": first_snapshot_at.isoformat()}
+    for name, requests in (
+        ("history_ms", [(f"/api/ranking/history/{rng.choice(item_ids)}", None) for _ in range(args.reads)]),
+        ("movers_ms", [("/api/ranking/movers", since)] * args.reads),
+    ):
+        durations = []
+        for path, params in requests:
+            started = time.perf_counter()
+            response = await target.client.get(path, params=params)
+            response.raise_for_status()
+            durations.append((time.perf_counter() - started) * 1000)
+        timings[name] = round(statistics.median(durations), 2)
+    await target.stop()
+    await engine.dispose()
+
+    later = snapshots[1:] or snapshots
+    return {
+        "scale": args.scale,
+        "items": len(item_ids),
+        "votes_per_snapshot": args.votes_per_snapshot,
+        "snapshots": snapshots,
+        "median_positions_written": statistics.median(s["positions_written"] for s in later),
+        "median_bytes_per_snapshot": statistics.median(s["bytes_added"] for s in later),
+        "full_snapshot_bytes_estimate": round(bytes_per_row * len(item_ids)),
+        **timings,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AppFeedback rank history storage benchmark")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--snapshots", type=int, default=10)
+    parser.add_argument("--votes-per-snapshot", type=int, default=500,
+                        help="Votes cast between re-ranks; more churn moves more positions")
+    parser.add_argument("--reads", type=int, default=50, help="Requests per timed read")
+    print(json.dumps(asyncio.run(run(parser.parse_args(argv))), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Replay a production-like request mix against a backend and report latency
+percentiles, throughput and peak RSS as JSON.
+
+    python -m benchmarks.run --target index --scale small
+    python -m benchmarks.run --target fastapi --scale medium --concurrency 32
+    python -m benchmarks.run --target index --scale small --save-baseline
+    python -m benchmarks.run --target fastapi --scale small --mix submit
+
+Results are compared against benchmarks/baselines/<target>-<scale>.json (with a
+-<mix> suffix for non-default mixes) when it exists; the exit code is 1 if any tracked metric regressed past --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.workload import MIXES, SCALES, generate_dataset, generate_requests
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples: list) -> dict:
+    values = sorted(samples)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def run_index(requests: list, dataset: dict, concurrency: int):
+    from benchmarks.targets import IndexTarget
+
+    target = IndexTarget()
+    target.seed(dataset)
+    target.start()
+
+    def timed(request):
+        op, method, path, body = request
+        started = time.perf_counter()
+        try:
+            status = target.request(method, path, body)
+        except OSError:
+            status = 599
+        return op, status, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, requests))
+    elapsed = time.perf_counter() - started
+    target.stop()
+    return results, elapsed
+
+
+def run_fastapi(requests: list, dataset: dict, concurrency: int):
+    from benchmarks.targets import FastAPITarget
+
+    async def main():
+        target = FastAPITarget()
+        await target.seed(dataset)
+        target.start()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(request):
+            op, method, path, body = request
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    status = await target.request(method, path, body)
+                except Exception:
+                    status = 599
+                return op, status, time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(timed(request) for request in requests))
+        elapsed = time.perf_counter() - started
+        await target.stop()
+        return results, elapsed
+
+    return asyncio.run(main())
+
+
+def build_report(args, results: list, elapsed: float) -> dict:
+    by_op = {}
+    for op, _, duration in results:
+        by_op.setdefault(op, []).append(duration)
+    errors = sum(1 for _, status, _ in results if status >= 500)
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        "target": args.target,
+        "scale": args.scale,
+        "mix": args.mix,
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "commit": commit,
+        "python": platform.python_version(),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "errors": errors,
+        "latency": {"overall": summarize([duration for _, _, duration in results])},
+        "latency_by_op": {op: summarize(samples) for op, samples in sorted(by_op.items())},
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions of report against baseline."""
+    regressions = []
+
+    def check(label, current, previous, higher_is_worse=True):
+        if not previous:
+            return
+        change = (current - previous) / previous
+        if (change if higher_is_worse else -change) > tolerance:
+            regressions.append(f"{label}: {previous} -> {current} ({change:+.0%})")
+
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        check(f"overall {key}", report["latency"]["overall"][key], baseline["latency"]["overall"][key])
+    for op, stats in report["latency_by_op"].items():
+        previous = baseline["latency_by_op"].get(op)
+        if previous:
+            check(f"{op} p95_ms", stats["p95_ms"], previous["p95_ms"])
+    check("throughput_rps", report["throughput_rps"], baseline["throughput_rps"], higher_is_worse=False)
+    check("peak_rss_mb", report["peak_rss_mb"], baseline["peak_rss_mb"])
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AppFeedback load benchmark")
+    parser.add_argument("--target", choices=("index", "fastapi"), default="index")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default", help="Request mix to replay")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here as well as stdout")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    dataset = generate_dataset(SCALES[args.scale], seed=args.seed)
+    requests = generate_requests(dataset, args.requests, seed=args.seed + 1, mix=MIXES[args.mix])
+    runner = run_index if args.target == "index" else run_fastapi
+    results, elapsed = runner(requests, dataset, args.concurrency)
+    report = build_report(args, results, elapsed)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    baseline_name = f"{args.target}-{args.scale}" if args.mix == "default" else f"{args.target}-{args.scale}-{args.mix}"
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{baseline_name}.json")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        return 0
+
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
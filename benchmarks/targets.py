@@ -0,0 +1,152 @@
+"""
+Benchmark targets: the FastAPI backend against Postgres, and the in-memory
+api/index.py handler served from a local threaded HTTP server.
+"""
+import http.client
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The replayed mix reuses a few hundred users from one IP; measure the handlers, not the limiter
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+CHUNK_SIZE = 5_000
+EPOCH = datetime(1970, 1, 1)
+
+
+class BenchmarkHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 turns bursts into 1s SYN retries
+    request_queue_size = 256
+
+
+class IndexTarget:
+    """Drives api/index.py through a real HTTP server on a random local port."""
+
+    name = "index"
+
+    def __init__(self):
+        sys.path.insert(0, os.path.join(ROOT, "api"))
+        import index
+        self.module = index
+        # Keep model scoring and GitHub issue creation off the network so runs are reproducible
+        os.environ.pop("ANTHROPIC_API_KEY", None)
+        index.GITHUB_TOKEN = None
+        index.handler.log_message = lambda *args: None
+        self.server = None
+
+    def seed(self, dataset: dict):
+        index = self.module
+        index.feedback_items.clear()
+        index.user_codes.clear()
+        index.user_vote_totals.clear()
+        index.free_user_codes.clear()
+        index.votes.clear()
+        index.vote_buckets.clear()
+        index.trending_cache.clear()
+        index.rank_snapshots.clear()
+        index.completion_awarded.clear()
+        index.comments.clear()
+        index.pinned_comments.clear()
+        index.user_credits.clear()
+
+        records = {}
+        for item in dataset["items"]:
+            records[item["id"]] = index.store_item(index.FeedbackRecord(
+                **{**item, "id": str(item["id"]), "created_at": item["created_at"].isoformat()}
+            ))
+        for (item_id, user_id), vote_type in dataset["votes"].items():
+            hour = int((dataset["vote_times"][(item_id, user_id)] - EPOCH).total_seconds() // 3600)
+            index.set_vote(records[item_id], user_id, vote_type, hour)
+            index.record_vote_velocity(str(item_id), 1 if vote_type == "up" else -1, hour)
+        for comment in dataset["comments"]:
+            record = {**comment, "id": str(comment["id"]), "item_id": str(comment["item_id"]),
+                      "x_handle": None, "created_at": comment["created_at"].isoformat()}
+            index.comments.setdefault(record["item_id"], []).append(record)
+            if record["is_product_owner"]:
+                index.pinned_comments.setdefault(record["item_id"], []).append(record)
+
+    def start(self):
+        self.server = BenchmarkHTTPServer(("127.0.0.1", 0), self.module.handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+
+    def request(self, method: str, path: str, body=None) -> int:
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        conn.request(method, path, body=payload, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        conn.close()
+        return response.status
+
+
+class FastAPITarget:
+    """Drives backend/app in-process over ASGI against the DATABASE_URL Postgres."""
+
+    name = "fastapi"
+
+    def __init__(self):
+        sys.path.insert(0, os.path.join(ROOT, "backend"))
+        from app.main import app
+        self.app = app
+        self.client = None
+
+    async def seed(self, dataset: dict):
+        from sqlalchemy import text, insert
+        from app.database import engine
+        from app.models import FeedbackItem, FeedbackVote, FeedbackComment, UserCredits
+        from app.services.trending import backfill_vote_buckets
+
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "TRUNCATE feedback_items, feedback_votes, feedback_comments, "
+                "user_credits, credit_transactions, rank_snapshots CASCADE"
+            ))
+            rows = [
+                {key: item[key] for key in (
+                    "id", "item_type", "title", "description", "user_id", "status", "vote_count",
+                    "rank_score", "ai_feasibility_score", "ai_impact_score", "ai_clarity_score", "created_at",
+                )}
+                for item in dataset["items"]
+            ]
+            await _insert_chunks(conn, insert(FeedbackItem.__table__), rows)
+            await _insert_chunks(conn, insert(FeedbackVote.__table__), [
+                {"item_id": item_id, "user_id": user_id, "vote_type": vote_type,
+                 "created_at": dataset["vote_times"][(item_id, user_id)]}
+                for (item_id, user_id), vote_type in dataset["votes"].items()
+            ])
+            # The TRUNCATE cascades to vote_velocity_buckets; rebuild them as migration 006 does
+            await conn.execute(backfill_vote_buckets())
+            await _insert_chunks(conn, insert(FeedbackComment.__table__), [
+                {key: comment[key] for key in ("id", "item_id", "user_id", "content", "is_product_owner", "created_at")}
+                for comment in dataset["comments"]
+            ])
+            await _insert_chunks(conn, insert(UserCredits.__table__), [
+                {"user_id": user_id, "credits_balance": 10, "credits_earned_total": 10, "items_submitted": 1}
+                for user_id in dataset["users"]
+            ])
+            await conn.execute(text("ANALYZE"))
+
+    def start(self):
+        import httpx
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url="http://bench")
+
+    async def stop(self):
+        await self.client.aclose()
+
+    async def request(self, method: str, path: str, body=None) -> int:
+        response = await self.client.request(method, path, json=body)
+        return response.status_code
+
+
+async def _insert_chunks(conn, statement, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        await conn.execute(statement, rows[start:start + CHUNK_SIZE])
@@ -0,0 +1,156 @@
+"""
+Seeded data and traffic mix shared by both benchmark targets.
+
+Everything is derived from a single random seed so two runs against the same
+scale replay exactly the same dataset and request sequence.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class Scale:
+    items: int
+    users: int
+    votes: int
+    comments: int
+
+
+SCALES = {
+    "small": Scale(items=1_000, users=500, votes=10_000, comments=3_000),
+    "medium": Scale(items=10_000, users=5_000, votes=100_000, comments=30_000),
+    "large": Scale(items=100_000, users=50_000, votes=1_000_000, comments=300_000),
+    # Millions of votes, for the trending sort's bucket maintenance and reads
+    "xlarge": Scale(items=100_000, users=200_000, votes=3_000_000, comments=300_000),
+}
+
+# Production-like request mix: (operation, weight)
+TRAFFIC_MIX = (
+    ("list", 40),
+    ("detail", 18),
+    ("vote", 14),
+    ("comments", 8),
+    ("comment", 3),
+    ("create", 3),
+    ("leaderboard", 7),
+    ("stats", 7),
+)
+
+# Named mixes selectable with --mix; "submit" isolates the submission write path,
+# "trending" the sort_by=trending list
+MIXES = {
+    "default": TRAFFIC_MIX,
+    "submit": (("create", 1),),
+    "trending": (("trending", 1),),
+}
+
+STATUSES = ("new", "new", "new", "under_review", "planned", "in_progress", "completed", "wont_do")
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_dataset(scale: Scale, seed: int = 42) -> dict:
+    """Build items, votes, comments and users as plain dicts."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    users = [f"bench-user-{n}" for n in range(scale.users)]
+
+    items = []
+    for n in range(scale.items):
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 180))
+        items.append({
+            "id": _uuid(rng),
+            "item_type": "bug" if rng.random() < 0.35 else "wishlist",
+            "title": f"Benchmark item {n}",
+            "description": " ".join(rng.choice(("lorem", "ipsum", "dolor", "sit", "amet")) for _ in range(rng.randint(20, 400))),
+            "user_id": rng.choice(users),
+            "status": rng.choice(STATUSES),
+            "vote_count": 0,
+            "rank_score": 0.0,
+            "ai_feasibility_score": round(rng.random(), 2),
+            "ai_impact_score": round(rng.random(), 2),
+            "ai_clarity_score": round(rng.random(), 2),
+            "created_at": created,
+        })
+
+    # Votes follow a skewed popularity curve, one vote per (item, user)
+    votes = {}
+    while len(votes) < scale.votes:
+        item = items[int(len(items) * rng.random() ** 3)]
+        user_id = rng.choice(users)
+        if (item["id"], user_id) in votes:
+            continue
+        vote_type = "up" if rng.random() < 0.85 else "down"
+        votes[(item["id"], user_id)] = vote_type
+        item["vote_count"] += 1 if vote_type == "up" else -1
+
+    # Cast times on their own stream so the rest of the dataset is unchanged; about a
+    # third fall inside the trending week, most of those in the last few hours
+    time_rng = random.Random(seed + 1)
+    created_by_id = {item["id"]: item["created_at"] for item in items}
+    vote_times = {
+        key: max(created_by_id[key[0]], now - timedelta(minutes=int(60 * 24 * 180 * time_rng.random() ** 3)))
+        for key in votes
+    }
+
+    for item in items:
+        item["rank_score"] = item["vote_count"] + item["ai_feasibility_score"] * 0.3 + item["ai_impact_score"] * 0.4
+
+    comments = []
+    for n in range(scale.comments):
+        item = items[int(len(items) * rng.random() ** 2)]
+        comments.append({
+            "id": _uuid(rng),
+            "item_id": item["id"],
+            "user_id": rng.choice(users),
+            "content": f"Benchmark comment {n}",
+            "is_product_owner": rng.random() < 0.02,
+            "created_at": item["created_at"] + timedelta(minutes=rng.randint(1, 60 * 24 * 30)),
+        })
+    comments.sort(key=lambda c: (c["created_at"], c["id"]))
+
+    return {"items": items, "votes": votes, "vote_times": vote_times, "comments": comments, "users": users}
+
+
+def generate_requests(dataset: dict, count: int, seed: int = 7, mix: tuple = TRAFFIC_MIX) -> list:
+    """Build the replayed request sequence as (operation, method, path, body)."""
+    rng = random.Random(seed)
+    operations = [op for op, _ in mix]
+    weights = [weight for _, weight in mix]
+    items, users = dataset["items"], dataset["users"]
+
+    requests = []
+    for op in rng.choices(operations, weights, k=count):
+        item_id = items[int(len(items) * rng.random() ** 2)]["id"]
+        user_id = rng.choice(users)
+        if op == "list":
+            item_type = rng.choice(("wishlist", "bug"))
+            sort_by = rng.choice(("rank", "rank", "votes", "recent"))
+            requests.append((op, "GET", f"/api/feedback?item_type={item_type}&sort_by={sort_by}&user_id={user_id}", None))
+        elif op == "trending":
+            item_type = rng.choice(("wishlist", "bug"))
+            requests.append((op, "GET", f"/api/feedback?item_type={item_type}&sort_by=trending&user_id={user_id}", None))
+        elif op == "detail":
+            requests.append((op, "GET", f"/api/feedback/{item_id}?user_id={user_id}", None))
+        elif op == "vote":
+            requests.append((op, "POST", f"/api/feedback/{item_id}/vote", {"user_id": user_id, "vote_type": "up"}))
+        elif op == "comments":
+            requests.append((op, "GET", f"/api/feedback/{item_id}/comments", None))
+        elif op == "comment":
+            requests.append((op, "POST", f"/api/feedback/{item_id}/comments", {"user_id": user_id, "content": "Benchmark reply"}))
+        elif op == "create":
+            requests.append((op, "POST", "/api/feedback", {
+                "item_type": rng.choice(("wishlist", "bug")),
+                "title": "Benchmark submission",
+                "description": "A benchmark submission with a long enough description.",
+                "user_id": user_id,
+            }))
+        elif op == "leaderboard":
+            requests.append((op, "GET", "/api/credits/leaderboard?limit=5", None))
+        else:
+            requests.append((op, "GET", "/api/stats", None))
+    return requests